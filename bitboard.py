@@ -0,0 +1,273 @@
+"""
+    Ce fichier regroupe les structures et les services associés aux masques
+    de bits du plateau: chaque ensemble de dalles est représenté par un entier
+    de 64 bits dont le bit k vaut 1 si la dalle de numéro k appartient à
+    l'ensemble. Les dalles de départ et d'arrivée valides s'obtiennent alors
+    par quelques opérations logiques.
+"""
+# Modules externes
+import numpy as np
+
+# Modules internes
+import carte
+import dalle
+import etat
+import grenouille
+import joueur
+
+# Nombre de dalles du plateau, nombre maximal de joueurs et nombre de niveaux
+# de priorité d'une grenouille (cf grenouille.renvoie_priorite())
+NOMBRE_DALLES = dalle.NOMBRE_DALLES
+NOMBRE_JOUEURS_MAX = joueur.NOMBRE_JOUEURS_MAX
+NOMBRE_PRIORITES = grenouille.NOMBRE_PRIORITES
+
+# Les masques d'un plateau sont regroupés dans une liste d'entiers. Les trois
+# premiers sont communs à tous les joueurs:
+#   * OCCUPEES: les dalles portant au moins une grenouille
+#   * DEUX_GRENOUILLES: les dalles portant au moins deux grenouilles
+#   * RONDINS_VISIBLES: les dalles dont la carte est un rondin face visible
+# Les suivants sont regroupés par joueur, le masque du joueur d'identifiant i
+# étant à l'indice PREMIERES + i, SECONDES + i...:
+#   * PREMIERES, SECONDES: les dalles dont la première (resp. seconde)
+#     grenouille appartient au joueur
+#   * REINES: les dalles portant la reine du joueur
+#   * DERNIERS: les dalles dont le joueur est le dernier occupant
+#   * PRIORITES: les dalles portant une grenouille du joueur de priorité p, à
+#     l'indice PRIORITES + NOMBRE_PRIORITES * i + p
+OCCUPEES         = 0
+DEUX_GRENOUILLES = 1
+RONDINS_VISIBLES = 2
+PREMIERES        = 3
+SECONDES         = PREMIERES + NOMBRE_JOUEURS_MAX
+REINES           = SECONDES + NOMBRE_JOUEURS_MAX
+DERNIERS         = REINES + NOMBRE_JOUEURS_MAX
+PRIORITES        = DERNIERS + NOMBRE_JOUEURS_MAX
+NOMBRE_MASQUES   = PRIORITES + NOMBRE_PRIORITES * NOMBRE_JOUEURS_MAX
+
+def cree_table_voisins():
+    """
+       Construit la table des voisinages des dalles du plateau.
+       Sorties:
+         * voisins: liste
+           Une liste de NOMBRE_DALLES entiers, celui d'indice k étant le
+           masque des (au plus huit) dalles voisines de la dalle de numéro k
+           (cf plateau.convertis_numero_dalle_vers_indices())
+    """
+    voisins = []
+    for numero in range(NOMBRE_DALLES):
+        ligne, colonne = divmod(numero, 8)
+        masque = 0
+        for i in range(max(ligne - 1, 0), min(ligne + 2, 8)):
+            for j in range(max(colonne - 1, 0), min(colonne + 2, 8)):
+                if i != ligne or j != colonne:
+                    masque |= 1 << (8 * i + j)
+        voisins.append(masque)
+    return(voisins)
+
+# Table des voisinages, calculée une fois pour toutes au chargement du module
+VOISINS = cree_table_voisins()
+
+def cree():
+    """
+       Crée la liste des masques d'un plateau vide.
+       Sorties:
+         * masques: liste
+           La liste des NOMBRE_MASQUES masques (cf OCCUPEES...PRIORITES), tous
+           nuls
+    """
+    return([0] * NOMBRE_MASQUES)
+
+def renvoie_indices_masques(d):
+    """
+       Renvoie les indices des masques auxquels appartient une dalle.
+       Entrées:
+         * d: liste
+           La dalle à décrire (cf dalle.cree())
+       Sorties:
+         * indices: liste
+           Les indices, sans répétition, des masques (cf cree()) dont le bit de
+           la dalle vaut 1
+
+       Notes:
+         C'est la description de la dalle conservée par l'index du plateau,
+         qui met à jour les masques dalle par dalle (cf
+         plateau.actualise_index()).
+    """
+    indices = []
+    c = dalle.renvoie_carte(d)
+    if carte.renvoie_face(c) == carte.RONDIN and carte.renvoie_face_visible(c):
+        indices.append(RONDINS_VISIBLES)
+    dernier_occupant = dalle.renvoie_dernier_occupant(d)
+    if dernier_occupant >= 0:
+        indices.append(DERNIERS + dernier_occupant)
+    grenouilles = dalle.renvoie_liste_grenouilles(d)
+    if len(grenouilles) == 0:
+        return(indices)
+    indices.append(OCCUPEES)
+    indices.append(PREMIERES + grenouille.renvoie_identifiant(grenouilles[0]))
+    if len(grenouilles) >= 2:
+        indices.append(DEUX_GRENOUILLES)
+        indices.append(SECONDES + grenouille.renvoie_identifiant(grenouilles[1]))
+    for g in grenouilles:
+        identifiant = grenouille.renvoie_identifiant(g)
+        indice = PRIORITES + NOMBRE_PRIORITES * identifiant + grenouille.renvoie_priorite(g)
+        if indice not in indices:
+            indices.append(indice)
+        if grenouille.est_reine(g):
+            indices.append(REINES + identifiant)
+    return(indices)
+
+def convertis_tableau_vers_masques(drapeaux):
+    """
+       Renvoie les masques des lignes d'un tableau de drapeaux indexé par les
+       numéros de dalles.
+       Entrées:
+         * drapeaux: ndarray
+           Un tableau de booléens de dimensions (n, NOMBRE_DALLES)
+       Sorties:
+         * masques: liste
+           Les n masques, le bit k du masque d'indice i valant drapeaux[i, k]
+    """
+    octets = np.packbits(drapeaux, axis=1, bitorder='little')
+    return(octets.view('<u8')[:, 0].tolist())
+
+def cree_depuis_etat(etat_croa):
+    """
+       Construit les masques d'un état compact.
+       Entrées:
+         * etat_croa: ndarray
+           L'état compact à décrire (cf etat.cree())
+       Sorties:
+         * masques: liste
+           La liste des masques de l'état (cf cree())
+
+       Notes:
+         Les masques sont calculés sur l'ensemble des dalles à la fois, sans
+         boucle sur les numéros de dalles: les drapeaux de toutes les dalles
+         sont regroupés dans un seul tableau converti en une fois.
+    """
+    dalles = etat.renvoie_dalles(etat_croa)
+    premiere = dalles[:, etat.GRENOUILLE_1]
+    seconde = dalles[:, etat.GRENOUILLE_2]
+    troisieme = dalles[:, etat.GRENOUILLE_3]
+    identifiants = np.arange(NOMBRE_JOUEURS_MAX).reshape(-1, 1)
+    priorites = np.arange(NOMBRE_PRIORITES).reshape(-1, 1, 1)
+    # Drapeaux des grenouilles de chaque joueur (cf etat.encode_grenouille())
+    sur_premiere = (premiere & etat.MASQUE_PROPRIETAIRE) == identifiants + 1
+    sur_seconde = (seconde & etat.MASQUE_PROPRIETAIRE) == identifiants + 1
+    sur_troisieme = (troisieme & etat.MASQUE_PROPRIETAIRE) == identifiants + 1
+    reines = (sur_premiere & ((premiere & etat.BIT_REINE) != 0)) | \
+             (sur_seconde & ((seconde & etat.BIT_REINE) != 0)) | \
+             (sur_troisieme & ((troisieme & etat.BIT_REINE) != 0))
+    de_priorite = (sur_premiere & ((premiere >> etat.DECALAGE_PRIORITE) == priorites)) | \
+                  (sur_seconde & ((seconde >> etat.DECALAGE_PRIORITE) == priorites)) | \
+                  (sur_troisieme & ((troisieme >> etat.DECALAGE_PRIORITE) == priorites))
+    communs = np.stack([premiere != 0, seconde != 0,
+                        (dalles[:, etat.FACE] == carte.RONDIN) &
+                        (dalles[:, etat.FACE_VISIBLE] != 0)])
+    drapeaux = np.concatenate([communs, sur_premiere, sur_seconde, reines,
+                               dalles[:, etat.DERNIER_OCCUPANT] == identifiants,
+                               de_priorite.transpose(1, 0, 2).reshape(-1, NOMBRE_DALLES)])
+    # L'ordre des drapeaux est celui des masques (cf OCCUPEES...PRIORITES)
+    return(convertis_tableau_vers_masques(drapeaux))
+
+def renvoie_departs(masques, identifiant, priorite_maximale):
+    """
+       Renvoie le masque des dalles de départ valides d'un joueur.
+       Entrées:
+         * masques: liste
+           Les masques du plateau (cf cree())
+         * identifiant: entier
+           L'identifiant du joueur actif
+         * priorite_maximale: entier
+           La priorité maximale des grenouilles du joueur actif
+       Sorties:
+         * departs: entier
+           Le masque des dalles portant une grenouille du joueur actif de
+           priorité maximale (cf dalle.est_valide_depart())
+    """
+    return(masques[PRIORITES + NOMBRE_PRIORITES * identifiant + priorite_maximale])
+
+def renvoie_arrivees_valides(masques, identifiant, choix_reine):
+    """
+       Renvoie le masque des dalles du plateau sur lesquelles la grenouille
+       jouée peut arriver, sans tenir compte de la dalle de départ.
+       Entrées:
+         * masques: liste
+           Les masques du plateau (cf cree())
+         * identifiant: entier
+           L'identifiant du joueur actif
+         * choix_reine: booléen
+           Vaut True si le joueur joue sa reine, False s'il joue une servante
+       Sorties:
+         * arrivees: entier
+           Le masque des dalles valides selon dalle.est_valide_arrivee()
+
+       Notes:
+         Hors des rondins face visible, une dalle occupée n'est valide que si
+         sa première grenouille n'appartient pas au joueur actif. Sur un rondin
+         face visible, la reine ne peut rejoindre aucune grenouille du joueur
+         actif, une servante ne peut rejoindre ni la reine du joueur actif ni
+         deux de ses servantes.
+    """
+    occupees = masques[OCCUPEES]
+    rondins = masques[RONDINS_VISIBLES]
+    premieres = masques[PREMIERES + identifiant]
+    secondes = masques[SECONDES + identifiant]
+    if choix_reine:
+        interdites_rondins = premieres | secondes
+    else:
+        # Sur un rondin, une reine est toujours seule sur sa dalle
+        reines_seules = masques[REINES + identifiant] & ~masques[DEUX_GRENOUILLES]
+        interdites_rondins = (premieres & secondes) | reines_seules
+    interdites = (premieres & ~rondins) | (interdites_rondins & rondins)
+    return(~(occupees & interdites) & ((1 << NOMBRE_DALLES) - 1))
+
+def renvoie_arrivees(masques, identifiant, numero_dalle_depart, choix_reine):
+    """
+       Renvoie le masque des dalles d'arrivée valides d'un joueur.
+       Entrées:
+         * masques: liste
+           Les masques du plateau (cf cree())
+         * identifiant: entier
+           L'identifiant du joueur actif
+         * numero_dalle_depart: entier
+           Le numéro de la dalle de départ du tour de jeu
+         * choix_reine: booléen
+           Vaut True si le joueur joue sa reine, False s'il joue une servante
+       Sorties:
+         * arrivees: entier
+           Le masque des dalles d'arrivée valides
+
+       Notes:
+         Les dalles candidates sont les voisines valides de la dalle de départ.
+         Les dalles dont le joueur actif est le dernier occupant ne sont
+         retenues qu'en l'absence de toute autre candidate; la dalle de plus
+         grand numéro est alors la seule dalle valide, comme dans
+         interaction.selectionne_dalle_arrivee().
+    """
+    candidates = VOISINS[numero_dalle_depart] & \
+                 renvoie_arrivees_valides(masques, identifiant, choix_reine)
+    derniers = masques[DERNIERS + identifiant]
+    arrivees = candidates & ~derniers
+    if arrivees == 0 and candidates != 0:
+        # On ne conserve que le bit de poids le plus fort
+        arrivees = 1 << ((candidates & derniers).bit_length() - 1)
+    return(arrivees)
+
+def convertis_masque_vers_numeros(masque):
+    """
+       Renvoie la liste des numéros des dalles d'un masque.
+       Entrées:
+         * masque: entier
+           Le masque à convertir
+       Sorties:
+         * numeros: liste
+           Les numéros des dalles du masque, dans l'ordre croissant
+    """
+    numeros = []
+    while masque:
+        bit = masque & -masque
+        numeros.append(bit.bit_length() - 1)
+        masque ^= bit
+    return(numeros)
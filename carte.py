@@ -4,6 +4,7 @@
 """
 # Modules internes
 import graphique
+import journal
 
 # Identifiants des faces de cartes
 NENUPHAR    = 0
@@ -29,6 +30,11 @@ DEUX             = 5
 TROIS            = 6
 QUATRE           = 7
 
+# Nombres d'identifiants de faces et de dos de cartes, qui dimensionnent les
+# tables indexées par face ou par dos (cf plateau.py, zobrist.py)
+NOMBRE_FACES = RONDIN + 1
+NOMBRE_DOS   = QUATRE + 1
+
 def cree(face, dos):
     """
        Crée la structure de données associée à une carte dans son
@@ -77,6 +83,8 @@ def modifie_face_visible(carte, drapeau):
        Notes:
          La carte est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(carte, 0)
     carte[0] = drapeau
 
 def renvoie_face(carte):
@@ -136,11 +144,35 @@ def dessine(carte, transparent, i_base, j_base, image_plateau):
     hauteur_carte_dos = image_dos.shape[1]
     if transparent:
         if carte[0]:
-            image_plateau[i_base: i_base + largeur_carte_face , j_base : j_base + hauteur_carte_face] = 0.5 * (image_plateau[i_base: i_base + largeur_carte_face , j_base : j_base + hauteur_carte_face] + image_face)
+            graphique.melange(image_plateau[i_base: i_base + largeur_carte_face , j_base : j_base + hauteur_carte_face], image_face)
         else:
-            image_plateau[i_base: i_base + largeur_carte_dos , j_base : j_base + hauteur_carte_dos] = 0.5 * (image_plateau[i_base: i_base + largeur_carte_dos , j_base : j_base + hauteur_carte_dos] + image_dos)
+            graphique.melange(image_plateau[i_base: i_base + largeur_carte_dos , j_base : j_base + hauteur_carte_dos], image_dos)
     else:
         if carte[0]:
             image_plateau[i_base: i_base + largeur_carte_face , j_base : j_base + hauteur_carte_face]=image_face
         else:
             image_plateau[i_base: i_base + largeur_carte_dos , j_base : j_base + hauteur_carte_dos]=image_dos
+
+def renvoie_zone(carte, i_base, j_base):
+    """
+       Renvoie la zone de l'image du plateau occupée par la carte dessinée à
+       la position donnée
+       Entrées:
+         * carte: liste
+           La carte dessinée
+         * i_base: entier
+           Le numéro de ligne du coin supérieur gauche de l'image de la carte
+           dans le tableau numpy représentant le plateau de jeu
+         * j_base: entier
+           Le numéro de colonne du coin supérieur gauche de l'image de la carte
+           dans le tableau numpy représentant le plateau de jeu
+       Sorties:
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] couvert par l'image de la
+           carte dessinée par dessine()
+    """
+    if carte[0]:
+        image = graphique.IMAGES_FACES[carte[1]]
+    else:
+        image = graphique.IMAGES_DOS[carte[2]]
+    return([i_base, i_base + image.shape[0], j_base, j_base + image.shape[1]])
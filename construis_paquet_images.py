@@ -0,0 +1,15 @@
+"""
+   Ce fichier construit le paquet des images décodées du jeu Croâ
+
+   Il doit être relancé après toute modification des images PNG du répertoire
+   Images. Le paquet est ensuite projeté en mémoire au lancement du jeu au lieu
+   de décoder les images PNG (cf graphique.lis_images()).
+
+   Le paquet construit est celui de la configuration donnée par les variables
+   d'environnement CROA_REDUCTION et CROA_OCTETS, par exemple:
+       CROA_REDUCTION=2 CROA_OCTETS=1 python construis_paquet_images.py
+"""
+# Modules internes
+import graphique
+
+graphique.ecris_paquet_images()
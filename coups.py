@@ -0,0 +1,179 @@
+"""
+    Ce fichier regroupe les fonctions calculant les coups autorisés d'un
+    joueur, sans interaction graphique et sans modifier le plateau de jeu.
+    Un coup est une liste [numero_dalle_depart, choix_reine, numero_dalle_arrivee]
+"""
+# Modules internes
+import bitboard
+import dalle
+import grenouille
+import joueur
+import plateau
+
+def cree(numero_dalle_depart, choix_reine, numero_dalle_arrivee):
+    """
+       Crée la structure de données associée à un coup.
+       Entrées:
+         * numero_dalle_depart: entier
+           Le numéro (0..63) de la dalle de départ
+         * choix_reine: booléen
+           Vaut True si la grenouille jouée est une reine, False sinon
+         * numero_dalle_arrivee: entier
+           Le numéro (0..63) de la dalle d'arrivée
+       Sorties:
+         * coup: liste
+           Une liste [numero_dalle_depart, choix_reine, numero_dalle_arrivee]
+    """
+    return([numero_dalle_depart, choix_reine, numero_dalle_arrivee])
+
+def renvoie_numero_dalle_depart(coup):
+    """
+       Renvoie le numéro de la dalle de départ d'un coup
+       Entrées:
+         * coup: liste
+           Le coup à consulter
+       Sorties:
+         * numero_dalle_depart: entier
+           Le numéro de la dalle de départ
+    """
+    return(coup[0])
+
+def renvoie_choix_reine(coup):
+    """
+       Indique si le coup joue une reine
+       Entrées:
+         * coup: liste
+           Le coup à consulter
+       Sorties:
+         * choix_reine: booléen
+           Vaut True si la grenouille jouée est une reine, False sinon
+    """
+    return(coup[1])
+
+def renvoie_numero_dalle_arrivee(coup):
+    """
+       Renvoie le numéro de la dalle d'arrivée d'un coup
+       Entrées:
+         * coup: liste
+           Le coup à consulter
+       Sorties:
+         * numero_dalle_arrivee: entier
+           Le numéro de la dalle d'arrivée
+    """
+    return(coup[2])
+
+def renvoie_numeros_dalles_depart(plateau_croa, joueur_actif, masques=None):
+    """
+       Renvoie les numéros des dalles de départ valides du joueur actif.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur actif
+         * masques: liste
+           Les masques du plateau (cf bitboard.cree()), ceux de l'index du
+           plateau s'ils ne sont pas fournis (cf plateau.renvoie_masques())
+       Sorties:
+         * numeros: liste
+           Les numéros des dalles de départ valides, dans l'ordre croissant
+           (cf dalle.est_valide_depart())
+    """
+    if masques is None:
+        masques = plateau.renvoie_masques(plateau_croa)
+    departs = bitboard.renvoie_departs(masques,
+                                       joueur.renvoie_identifiant(joueur_actif),
+                                       joueur.renvoie_priorite_maximale(joueur_actif))
+    return(bitboard.convertis_masque_vers_numeros(departs))
+
+def renvoie_choix_grenouilles(dalle_depart, joueur_actif):
+    """
+       Renvoie les statuts des grenouilles que le joueur actif peut jouer
+       depuis une dalle de départ valide.
+       Entrées:
+         * dalle_depart: liste
+           La dalle de départ, valide pour le joueur actif
+         * joueur_actif: liste
+           Le joueur actif
+       Sorties:
+         * choix: liste
+           La liste des valeurs possibles de choix_reine: [True], [False] ou
+           [True, False] si le joueur a le choix entre sa reine et une servante
+
+       Notes:
+         Reprend les cas de plateau.retire_grenouille_jouee(): le joueur
+         n'a le choix que si la dalle porte sa reine et l'une de ses servantes.
+         Deux grenouilles de joueurs différents sont obligatoirement des
+         servantes.
+    """
+    grenouilles = dalle.renvoie_liste_grenouilles(dalle_depart)
+    if len(grenouilles) == 1:
+        return([grenouille.est_reine(grenouilles[0])])
+    identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
+    if grenouille.renvoie_identifiant(grenouilles[0]) != identifiant_joueur_actif or \
+       grenouille.renvoie_identifiant(grenouilles[1]) != identifiant_joueur_actif:
+        return([False])
+    if grenouille.est_servante(grenouilles[0]) and grenouille.est_servante(grenouilles[1]):
+        return([False])
+    return([True, False])
+
+def renvoie_numeros_dalles_arrivee(plateau_croa, joueur_actif, numero_dalle_depart,
+                                   choix_reine, masques=None):
+    """
+       Renvoie les numéros des dalles d'arrivée valides du joueur actif.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur actif
+         * numero_dalle_depart: entier
+           Le numéro de la dalle de départ
+         * choix_reine: booléen
+           Vaut True si le joueur joue sa reine, False s'il joue une servante
+         * masques: liste
+           Les masques du plateau (cf bitboard.cree()), ceux de l'index du
+           plateau s'ils ne sont pas fournis (cf plateau.renvoie_masques())
+       Sorties:
+         * numeros: liste
+           Les numéros des dalles d'arrivée valides, dans l'ordre croissant
+
+       Notes:
+         Le contenu de la dalle de départ n'intervient pas: elle ne fait pas
+         partie de ses propres voisines. Les dalles d'arrivée sont donc les
+         mêmes avant et après le retrait de la grenouille jouée.
+    """
+    if masques is None:
+        masques = plateau.renvoie_masques(plateau_croa)
+    arrivees = bitboard.renvoie_arrivees(masques,
+                                         joueur.renvoie_identifiant(joueur_actif),
+                                         numero_dalle_depart, choix_reine)
+    return(bitboard.convertis_masque_vers_numeros(arrivees))
+
+def renvoie_coups(plateau_croa, joueur_actif):
+    """
+       Renvoie la liste de tous les coups autorisés du joueur actif.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur actif
+       Sorties:
+         * coups: liste
+           La liste des coups (cf cree()), triée par dalle de départ, puis
+           reine avant servante, puis par dalle d'arrivée
+
+       Notes:
+         Le plateau et le joueur ne sont pas modifiés. La liste est vide si le
+         joueur ne peut pas jouer (priorité maximale nulle).
+    """
+    coups = []
+    if joueur.renvoie_priorite_maximale(joueur_actif) == 0:
+        return(coups)
+    masques = plateau.renvoie_masques(plateau_croa)
+    for numero_dalle_depart in renvoie_numeros_dalles_depart(plateau_croa, joueur_actif, masques):
+        dalle_depart = plateau.renvoie_dalle(plateau_croa, numero_dalle_depart)
+        for choix_reine in renvoie_choix_grenouilles(dalle_depart, joueur_actif):
+            for numero_dalle_arrivee in renvoie_numeros_dalles_arrivee(plateau_croa, joueur_actif,
+                                                                       numero_dalle_depart,
+                                                                       choix_reine, masques):
+                coups.append(cree(numero_dalle_depart, choix_reine, numero_dalle_arrivee))
+    return(coups)
@@ -0,0 +1,108 @@
+"""
+    Ce fichier regroupe les services associés aux croyances sur les cartes
+    face cachée: les cartes sont mélangées au hasard et ne bougent plus, donc
+    sachant son dos et les cartes déjà retournées, la face d'une carte face
+    cachée suit exactement la loi des faces encore cachées de ce dos.
+
+    Les nombres de cartes face cachée de chaque dos et de chaque face sont
+    tenus à jour par l'index du plateau (cf plateau.actualise_index()) à
+    chaque carte retournée, et suivent donc les copies (cf plateau.copie())
+    et les annulations (cf journal.annule()) du plateau. Chaque
+    probabilité se lit sans parcourir les dalles.
+"""
+# Modules internes
+import carte
+import coups
+import dalle
+import joueur
+import plateau
+
+def renvoie_probabilite_face(plateau_croa, numero_dalle, face):
+    """
+       Renvoie la probabilité que la carte d'une dalle ait une face donnée
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * face: entier
+           L'identifiant de la face (cf carte.py)
+       Sorties:
+         * probabilite: flottant
+           La probabilité, sachant le dos de la carte et les cartes déjà
+           retournées. Elle vaut 0 ou 1 si la carte est face visible.
+    """
+    c = dalle.renvoie_carte(plateau.renvoie_dalle(plateau_croa, numero_dalle))
+    if carte.renvoie_face_visible(c):
+        return(float(carte.renvoie_face(c) == face))
+    nombres_cartes = plateau.renvoie_nombres_cartes_cachees(plateau_croa, carte.renvoie_dos(c))
+    return(nombres_cartes[face] / sum(nombres_cartes))
+
+def renvoie_distribution(plateau_croa, numero_dalle):
+    """
+       Renvoie la loi de la face de la carte d'une dalle
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * probabilites: liste
+           La liste, indexée par face, des probabilités de chaque face (cf
+           renvoie_probabilite_face())
+    """
+    c = dalle.renvoie_carte(plateau.renvoie_dalle(plateau_croa, numero_dalle))
+    if carte.renvoie_face_visible(c):
+        probabilites = [0.0] * plateau.NOMBRE_FACES
+        probabilites[carte.renvoie_face(c)] = 1.0
+        return(probabilites)
+    nombres_cartes = plateau.renvoie_nombres_cartes_cachees(plateau_croa, carte.renvoie_dos(c))
+    nombre_total = sum(nombres_cartes)
+    return([nombre / nombre_total for nombre in nombres_cartes])
+
+def renvoie_risque_coup(plateau_croa, joueur_actif, coup, face=carte.BROCHET):
+    """
+       Renvoie la probabilité qu'un coup déclenche la règle d'une face donnée
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+         * coup: liste
+           Le coup envisagé (cf coups.cree())
+         * face: entier
+           L'identifiant de la face redoutée, le brochet par défaut
+       Sorties:
+         * probabilite: flottant
+           La probabilité que la carte de la dalle d'arrivée ait cette face
+           et que sa règle s'applique
+
+       Notes:
+         Un coup capturant une reine adverse ne déclenche pas la règle de la
+         carte d'arrivée (cf regles.applique()): son risque est nul.
+    """
+    numero_dalle_arrivee = coups.renvoie_numero_dalle_arrivee(coup)
+    dalle_arrivee = plateau.renvoie_dalle(plateau_croa, numero_dalle_arrivee)
+    identifiant = joueur.renvoie_identifiant(joueur_actif)
+    if dalle.renvoie_identifiant_autre_reine(dalle_arrivee, identifiant) != identifiant:
+        return(0.0)
+    return(renvoie_probabilite_face(plateau_croa, numero_dalle_arrivee, face))
+
+def renvoie_risques_coups(plateau_croa, joueur_actif, liste_coups, face=carte.BROCHET):
+    """
+       Renvoie les risques d'une liste de coups (cf renvoie_risque_coup())
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+         * liste_coups: liste
+           Les coups envisagés, par exemple les coups autorisés (cf
+           coups.renvoie_coups())
+         * face: entier
+           L'identifiant de la face redoutée, le brochet par défaut
+       Sorties:
+         * probabilites: liste
+           La liste des risques des coups, dans l'ordre de liste_coups
+    """
+    return([renvoie_risque_coup(plateau_croa, joueur_actif, coup, face) for coup in liste_coups])
@@ -2,14 +2,29 @@
     Ce fichier regroupe les structures et les services associés
     à la création et à l'évolution d'une dalle
 """
+# Modules externes
+import numpy as np
+
 # Modules internes
 import carte
 import graphique
 import grenouille
 import joueur
+import journal
+
+# Nombre de dalles du plateau (8 lignes de 8 dalles), une par carte du paquet
+NOMBRE_DALLES = 64
+# Nombre maximal de grenouilles d'une dalle: la servante née à côté de la
+# reine lors de la capture d'une reine adverse (cf regles.applique()) peut
+# rejoindre une dalle portant déjà la reine et une autre grenouille
+NOMBRE_GRENOUILLES_MAX = 3
 
-# Epaisseur des bords de cadres
-EPAISSEUR = 6
+# Epaisseur des bords de cadres, d'au moins un pixel quelle que soit la
+# réduction
+EPAISSEUR = max(1, 6 // graphique.REDUCTION)
+# Pochoir des cadres des dalles, calculé au premier besoin (cf
+# renvoie_pochoir_cadre())
+POCHOIR_CADRE = None
 
 def cree(carte, liste_grenouilles, dernier_occupant):
     """
@@ -54,6 +69,8 @@ def modifie_carte(dalle, carte):
        Notes:
          La dalle est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(dalle, 0)
     dalle[0] = carte
 
 def renvoie_liste_grenouilles(dalle):
@@ -80,6 +97,8 @@ def modifie_liste_grenouilles(dalle, liste_grenouilles):
        Notes:
          La dalle est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(dalle, 1)
     dalle[1] = liste_grenouilles
 
 def renvoie_identifiant_autre_reine(dalle, identifiant_joueur_actif):
@@ -132,6 +151,8 @@ def modifie_dernier_occupant(dalle, dernier_occupant):
        Notes:
          La dalle est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(dalle, 2)
     dalle[2] = dernier_occupant
 
 def est_valide_depart(dalle, joueur_actif):
@@ -279,9 +300,31 @@ def dessine(dalle, transparent, i_base, j_base, image_plateau):
     """
     # Dessine la carte
     carte.dessine(dalle[0], transparent, i_base, j_base, image_plateau)
+    # Puis les grenouilles
+    dessine_grenouilles(dalle, i_base, j_base, image_plateau)
+
+def dessine_grenouilles(dalle, i_base, j_base, image_plateau):
+    """
+       Modifie l'image du plateau pour y dessiner les grenouilles de la dalle
+       à la position donnée, par dessus l'image de sa carte.
+       Entrées:
+         * dalle: liste
+           La dalle dont les grenouilles sont à dessiner
+         * i_base: entier
+           Le numéro de ligne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+         * j_base: entier
+           Le numéro de colonne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+         * image_plateau: ndarray
+           Le tableau numpy dans lequel ajouter les grenouilles
+
+       Notes:
+         Cf la documentation de dessine() pour la position des grenouilles.
+         Le paramètre image_plateau est modifié à la sortie de la fonction.
+    """
     est_vase_visible = carte.renvoie_face(dalle[0]) == carte.VASE and \
                        carte.renvoie_face_visible(dalle[0])
-    # Puis les grenouilles
     nombre_grenouilles = len(dalle[1])
     if nombre_grenouilles == 1:
         grenouille.dessine(dalle[1][0], 2, est_vase_visible, i_base, j_base, image_plateau)
@@ -289,6 +332,32 @@ def dessine(dalle, transparent, i_base, j_base, image_plateau):
         grenouille.dessine(dalle[1][0], 1, est_vase_visible, i_base, j_base, image_plateau)
         grenouille.dessine(dalle[1][1], 3, est_vase_visible, i_base, j_base, image_plateau)
 
+def renvoie_zones_grenouilles(dalle, i_base, j_base):
+    """
+       Renvoie les zones de l'image du plateau occupées par les grenouilles de
+       la dalle dessinée à la position donnée
+       Entrées:
+         * dalle: liste
+           La dalle dessinée
+         * i_base: entier
+           Le numéro de ligne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+         * j_base: entier
+           Le numéro de colonne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+       Sorties:
+         * zones: liste
+           La liste des rectangles [i_min, i_max, j_min, j_max] couverts par
+           les grenouilles dessinées par dessine_grenouilles()
+    """
+    nombre_grenouilles = len(dalle[1])
+    if nombre_grenouilles == 1:
+        return([grenouille.renvoie_zone(dalle[1][0], 2, i_base, j_base)])
+    if nombre_grenouilles == 2:
+        return([grenouille.renvoie_zone(dalle[1][0], 1, i_base, j_base), \
+                grenouille.renvoie_zone(dalle[1][1], 3, i_base, j_base)])
+    return([])
+
 def encadre(dalle, joueur_actif, i_base, j_base, image_plateau):
     """
        Modifie l'image du plateau pour y dessiner un cadre autour de la dalle
@@ -311,11 +380,114 @@ def encadre(dalle, joueur_actif, i_base, j_base, image_plateau):
          La longueur du côté d'une dalle est carte.COTE+2.
          Le paramètre image_plateau est modifié à la sortie de la fonction.        
     """
-    couleur = joueur.COULEURS_JOUEURS[joueur.renvoie_identifiant(joueur_actif)]
+    couleur = graphique.convertis_couleur(joueur.COULEURS_JOUEURS[joueur.renvoie_identifiant(joueur_actif)])
+    decalages_i, decalages_j, cadres_joueurs = renvoie_pochoir_cadre()
+    image_plateau[i_base + decalages_i, j_base + decalages_j] = couleur
+
+def renvoie_pochoir_cadre():
+    """
+       Renvoie le pochoir du cadre dessiné autour d'une dalle par encadre()
+       Sorties:
+         * pochoir: liste
+           Une liste [decalages_i, decalages_j, cadres_joueurs]. Les pixels du
+           cadre d'une dalle sont les pixels (i_base + decalages_i[k],
+           j_base + decalages_j[k]) où (i_base, j_base) est le coin supérieur
+           gauche de l'image de la carte de la dalle. cadres_joueurs[i] est le
+           tableau à une dimension des composantes de ces pixels, à la suite,
+           pour le cadre du joueur d'identifiant i.
+
+       Notes:
+         Le cadre est formé de EPAISSEUR bords emboîtés. Le pochoir est calculé
+         une fois pour toutes et conservé dans la variable globale
+         POCHOIR_CADRE: le cadre est ensuite dessiné en une seule affectation.
+    """
+    global POCHOIR_CADRE
+    if POCHOIR_CADRE is None:
+        largeur = graphique.IMAGES_FACES[0].shape[0] + 2
+        hauteur = graphique.IMAGES_FACES[0].shape[1] + 2
+        masque = np.zeros((largeur + 2 * EPAISSEUR, hauteur + 2 * EPAISSEUR), bool)
+        i_base = EPAISSEUR
+        j_base = EPAISSEUR
+        for k in range(EPAISSEUR):
+            masque[i_base-k:i_base+largeur+k, j_base-k        ] = True
+            masque[i_base-k:i_base+largeur+k, j_base+hauteur+k] = True
+            masque[i_base-k        , j_base-k:j_base+hauteur+k] = True
+            masque[i_base+largeur+k, j_base-k:j_base+hauteur+k] = True
+        decalages_i, decalages_j = np.nonzero(masque)
+        cadres_joueurs = []
+        for couleur in joueur.COULEURS_JOUEURS:
+            couleur_pixel = np.array(graphique.convertis_couleur(couleur), graphique.IMAGE_FOND.dtype)
+            cadres_joueurs.append(np.tile(couleur_pixel, len(decalages_i)))
+        POCHOIR_CADRE = [decalages_i - EPAISSEUR, decalages_j - EPAISSEUR, cadres_joueurs]
+    return(POCHOIR_CADRE)
+
+def encadre_dalles(positions, joueur_actif, image_plateau):
+    """
+       Modifie l'image du plateau pour y dessiner en une seule opération les
+       cadres de plusieurs dalles, après avoir sauvegardé les pixels recouverts.
+       Entrées:
+         * positions: liste
+           La liste des coordonnées [i_base, j_base] des coins supérieurs
+           gauches des images des cartes des dalles à encadrer
+         * joueur_actif: liste
+           Le joueur actif, permettant de choisir la couleur des cadres.
+         * image_plateau: ndarray
+           Le tableau numpy dans lequel dessiner les cadres
+       Sorties:
+         * zone: liste
+           Le plus petit rectangle [i_min, i_max, j_min, j_max] contenant les
+           cadres, vide s'il n'y a aucune dalle
+
+       Notes:
+         Le paramètre image_plateau est modifié à la sortie de la fonction.
+         Seuls les pixels des cadres sont sauvegardés (cf
+         graphique.sauvegarde_pixels()): graphique.restaure_zones() efface les
+         cadres en ne restaurant que ces pixels.
+         Les composantes des pixels des cadres sont désignées par leurs indices
+         dans l'image vue comme un tableau à une dimension, ce qui suppose une
+         image contiguë en mémoire, comme celle renvoyée par plateau.dessine().
+         Sinon chaque cadre est dessiné séparément par encadre().
+    """
+    zone = []
+    for i_base, j_base in positions:
+        zone = graphique.reunis_zones(zone, renvoie_zone_cadre(i_base, j_base))
+    if len(positions) == 0:
+        return(zone)
+    if not image_plateau.flags.c_contiguous:
+        graphique.sauvegarde_zone(image_plateau, zone)
+        for i_base, j_base in positions:
+            encadre(None, joueur_actif, i_base, j_base, image_plateau)
+        return(zone)
+    decalages_i, decalages_j, cadres_joueurs = renvoie_pochoir_cadre()
+    largeur_image = image_plateau.shape[1]
+    composantes = image_plateau.shape[2]
+    # Indices des composantes des pixels du cadre relatifs au coin de la carte,
+    # puis indices pour chacune des dalles
+    decalages = (decalages_i * largeur_image + decalages_j) * composantes
+    decalages = (decalages[:, np.newaxis] + np.arange(composantes)).ravel()
+    bases = np.array([i_base * largeur_image + j_base for i_base, j_base in positions]) * composantes
+    indices = bases[:, np.newaxis] + decalages
+    image_plate = image_plateau.reshape(-1)
+    graphique.sauvegarde_pixels(image_plate, indices, zone)
+    image_plate[indices] = cadres_joueurs[joueur.renvoie_identifiant(joueur_actif)]
+    return(zone)
+
+def renvoie_zone_cadre(i_base, j_base):
+    """
+       Renvoie la zone de l'image du plateau occupée par la dalle et son cadre
+       Entrées:
+         * i_base: entier
+           Le numéro de ligne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+         * j_base: entier
+           Le numéro de colonne du coin supérieur gauche de l'image de la carte
+           de la dalle dans le tableau numpy représentant le plateau de jeu
+       Sorties:
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] couvrant la dalle et le
+           cadre dessiné par encadre()
+    """
     largeur = graphique.IMAGES_FACES[0].shape[0] + 2
     hauteur = graphique.IMAGES_FACES[0].shape[1] + 2
-    for k in range(EPAISSEUR):
-        image_plateau[i_base-k:i_base+largeur+k, j_base-k        ] = couleur
-        image_plateau[i_base-k:i_base+largeur+k, j_base+hauteur+k] = couleur
-        image_plateau[i_base-k        , j_base-k:j_base+hauteur+k] = couleur
-        image_plateau[i_base+largeur+k, j_base-k:j_base+hauteur+k] = couleur
+    return([i_base - EPAISSEUR, i_base + largeur + EPAISSEUR, \
+            j_base - EPAISSEUR, j_base + hauteur + EPAISSEUR])
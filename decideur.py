@@ -0,0 +1,132 @@
+"""
+    Ce fichier regroupe les structures et les services associés aux décideurs:
+    un décideur fournit au moteur de règles (cf regles.applique()) les choix
+    des joueurs et reçoit les messages qui leur sont destinés. Le décideur
+    graphique s'appuie sur la souris et la fenêtre du jeu, les autres
+    permettent de jouer sans interface graphique.
+"""
+# Modules externes
+import numpy as np
+
+# Modules internes
+import interaction
+import joueur
+
+# Textes des questions posées par les règles du jeu, qui permettent à un
+# décideur de savoir à quel choix il doit répondre
+QUESTION_MOUSTIQUE = "Voulez-vous jouer une autre grenouille?"
+QUESTION_RONDIN    = "Quelle grenouille supprimer?"
+
+def cree(choisis, affiche_message):
+    """
+       Crée la structure de données associée à un décideur.
+       Entrées:
+         * choisis: fonction
+           La fonction effectuant un choix binaire, de même signature et de même
+           sortie que interaction.choisis()
+         * affiche_message: fonction
+           La fonction transmettant un message à un joueur, de même signature
+           que interaction.affiche_message()
+       Sorties:
+         * decideur_croa: liste
+           Une liste [choisis, affiche_message]
+    """
+    decideur_croa = []
+    decideur_croa.append(choisis)
+    decideur_croa.append(affiche_message)
+    return(decideur_croa)
+
+def choisis(decideur_croa, plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent):
+    """
+       Fait effectuer un choix binaire par un décideur.
+       Entrées:
+         * decideur_croa: liste
+           Le décideur consulté, GRAPHIQUE s'il vaut None
+         * les autres entrées sont celles de interaction.choisis()
+       Sorties:
+         * choix: booléen
+           Vaut True si le terme de gauche de l'alternative est choisi, False
+           sinon (cf interaction.choisis())
+    """
+    if decideur_croa is None:
+        decideur_croa = GRAPHIQUE
+    return(decideur_croa[0](plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent))
+
+def affiche_message(decideur_croa, plateau_croa, joueur_actif, texte):
+    """
+       Transmet un message à un joueur par l'intermédiaire d'un décideur.
+       Entrées:
+         * decideur_croa: liste
+           Le décideur destinataire, GRAPHIQUE s'il vaut None
+         * les autres entrées sont celles de interaction.affiche_message()
+    """
+    if decideur_croa is None:
+        decideur_croa = GRAPHIQUE
+    decideur_croa[1](plateau_croa, joueur_actif, texte)
+
+def choisis_graphique(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent):
+    """
+       Effectue le choix à la souris, cf interaction.choisis()
+    """
+    return(interaction.choisis(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent))
+
+def affiche_message_graphique(plateau_croa, joueur_actif, texte):
+    """
+       Affiche le message dans la fenêtre du jeu, cf interaction.affiche_message()
+    """
+    interaction.affiche_message(plateau_croa, joueur_actif, texte)
+
+def ignore_message(plateau_croa, joueur_actif, texte):
+    """
+       Ignore le message, pour les décideurs sans interface graphique.
+    """
+    pass
+
+def cree_aleatoire(graine=None):
+    """
+       Crée un décideur effectuant ses choix au hasard et ignorant les
+       messages.
+       Entrées:
+         * graine: entier
+           La graine du générateur pseudo-aléatoire propre au décideur, tirée
+           au hasard si elle n'est pas fournie
+       Sorties:
+         * decideur_croa: liste
+           Le décideur (cf cree())
+    """
+    generateur = np.random.RandomState(graine)
+
+    def choisis_aleatoire(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent):
+        return(generateur.randint(2) == 0)
+
+    return(cree(choisis_aleatoire, ignore_message))
+
+def cree_scripte(reponses, messages=None):
+    """
+       Crée un décideur rejouant une liste de réponses fixée à l'avance.
+       Entrées:
+         * reponses: liste
+           Les réponses (booléens) aux choix successifs, dans l'ordre
+         * messages: liste
+           Si elle est fournie, la liste à laquelle sont ajoutés les messages
+           reçus, sous la forme [identifiant du joueur, texte]
+       Sorties:
+         * decideur_croa: liste
+           Le décideur (cf cree())
+
+       Notes:
+         La liste des réponses est consommée au fur et à mesure des choix. Une
+         erreur IndexError est levée si un choix est demandé alors que la liste
+         est vide.
+    """
+    def choisis_scripte(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent):
+        return(reponses.pop(0))
+
+    def memorise_message(plateau_croa, joueur_actif, texte):
+        if messages is not None:
+            messages.append([joueur.renvoie_identifiant(joueur_actif), texte])
+
+    return(cree(choisis_scripte, memorise_message))
+
+# Le décideur graphique, utilisé par défaut par le moteur de règles
+GRAPHIQUE = cree(choisis_graphique, affiche_message_graphique)
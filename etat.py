@@ -0,0 +1,553 @@
+"""
+    Ce fichier regroupe les structures et les services associés à l'état
+    compact du jeu: une représentation du plateau sous la forme d'un unique
+    tableau numpy d'entiers, de taille fixe
+"""
+# Modules externes
+import numpy as np
+
+# Modules internes
+import carte
+import dalle
+import grenouille
+import joueur
+import plateau
+
+# Nombre de dalles du plateau et nombre maximal de joueurs
+NOMBRE_DALLES = dalle.NOMBRE_DALLES
+NOMBRE_JOUEURS_MAX = joueur.NOMBRE_JOUEURS_MAX
+
+# L'état compact est un tableau numpy d'entiers int8 de TAILLE cases. Les
+# CHAMPS_DALLE premières cases de chaque groupe décrivent une dalle, dans
+# l'ordre des numéros de dalles:
+#   * FACE, DOS: les identifiants de la face et du dos de la carte
+#   * FACE_VISIBLE: 1 si la face de la carte est visible, 0 sinon
+#   * DERNIER_OCCUPANT: l'identifiant du dernier occupant de la dalle, ou -1
+#   * GRENOUILLE_1, GRENOUILLE_2, GRENOUILLE_3: les codes des grenouilles de
+#     la dalle dans l'ordre de leur liste (cf encode_grenouille()), 0 s'il
+#     n'y a pas de grenouille. Les champs occupés sont toujours les premiers.
+FACE             = 0
+DOS              = 1
+FACE_VISIBLE     = 2
+DERNIER_OCCUPANT = 3
+GRENOUILLE_1     = 4
+GRENOUILLE_2     = 5
+GRENOUILLE_3     = 6
+CHAMPS_DALLE     = 7
+# Nombre de champs de grenouilles d'une dalle
+NOMBRE_GRENOUILLES_MAX = dalle.NOMBRE_GRENOUILLES_MAX
+# Le code d'une grenouille (cf encode_grenouille()) regroupe:
+#   * dans les bits de MASQUE_PROPRIETAIRE, l'identifiant du joueur plus 1
+#   * BIT_REINE, à 1 pour une reine
+#   * à partir du bit DECALAGE_PRIORITE, la priorité
+# MASQUE_SANS_PRIORITE sélectionne le propriétaire et le statut.
+MASQUE_PROPRIETAIRE  = 7
+BIT_REINE            = 8
+DECALAGE_PRIORITE    = 4
+MASQUE_SANS_PRIORITE = (1 << DECALAGE_PRIORITE) - 1
+# Viennent ensuite CHAMPS_JOUEUR cases par joueur, dans l'ordre des
+# identifiants de joueurs:
+#   * RESERVE: le nombre de grenouilles en réserve du joueur
+#   * JETONS: les jetons mâles du joueur, le bit k valant 1 si le joueur
+#     possède le jeton joueur.JETONS_MALES[k]
+#   * PRIORITE_MAXIMALE: la priorité maximale des grenouilles du joueur
+#   * EN_JEU: 1 si le joueur est encore en jeu, 0 sinon
+RESERVE           = 0
+JETONS            = 1
+PRIORITE_MAXIMALE = 2
+EN_JEU            = 3
+CHAMPS_JOUEUR     = 4
+DEBUT_JOUEURS = NOMBRE_DALLES * CHAMPS_DALLE
+TAILLE = DEBUT_JOUEURS + NOMBRE_JOUEURS_MAX * CHAMPS_JOUEUR
+
+def cree():
+    """
+       Crée un état compact vide: aucune carte visible, aucune grenouille et
+       aucun joueur en jeu.
+       Sorties:
+         * etat: ndarray
+           Un tableau numpy d'entiers int8 de TAILLE cases
+    """
+    etat = np.zeros(TAILLE, np.int8)
+    renvoie_dalles(etat)[:, DERNIER_OCCUPANT] = -1
+    return(etat)
+
+def copie(etat):
+    """
+       Renvoie une copie indépendante de l'état compact.
+       Entrées:
+         * etat: ndarray
+           L'état à copier
+       Sorties:
+         * copie_etat: ndarray
+           La copie de l'état
+
+       Notes:
+         L'état étant un unique tableau contigu, sa copie est une simple
+         recopie de TAILLE octets.
+    """
+    return(np.copy(etat))
+
+def renvoie_dalles(etat):
+    """
+       Renvoie la vue de l'état compact décrivant les dalles.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+       Sorties:
+         * dalles: ndarray
+           Un tableau de dimensions (NOMBRE_DALLES, CHAMPS_DALLE) partageant
+           les données de l'état: dalles[numero_dalle, FACE] est par exemple
+           la face de la carte de la dalle numero_dalle
+    """
+    return(etat[:DEBUT_JOUEURS].reshape(NOMBRE_DALLES, CHAMPS_DALLE))
+
+def renvoie_joueurs(etat):
+    """
+       Renvoie la vue de l'état compact décrivant les joueurs.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+       Sorties:
+         * joueurs: ndarray
+           Un tableau de dimensions (NOMBRE_JOUEURS_MAX, CHAMPS_JOUEUR)
+           partageant les données de l'état: joueurs[identifiant, RESERVE] est
+           par exemple le nombre de grenouilles en réserve du joueur
+           d'identifiant donné
+    """
+    return(etat[DEBUT_JOUEURS:].reshape(NOMBRE_JOUEURS_MAX, CHAMPS_JOUEUR))
+
+def encode_grenouille(g):
+    """
+       Renvoie le code d'une grenouille dans l'état compact.
+       Entrées:
+         * g: liste
+           La grenouille à coder (cf grenouille.cree())
+       Sorties:
+         * code: entier
+           Le code de la grenouille: les bits 0 à 2 valent l'identifiant du
+           joueur plus 1, le bit 3 vaut 1 pour une reine et les bits 4 et 5
+           valent la priorité (cf MASQUE_PROPRIETAIRE, BIT_REINE,
+           DECALAGE_PRIORITE). Le code d'une grenouille n'est jamais nul.
+    """
+    code = grenouille.renvoie_identifiant(g) + 1
+    if grenouille.est_reine(g):
+        code += BIT_REINE
+    return(code + (grenouille.renvoie_priorite(g) << DECALAGE_PRIORITE))
+
+def decode_grenouille(code):
+    """
+       Renvoie la grenouille correspondant à un code de l'état compact.
+       Entrées:
+         * code: entier
+           Le code non nul de la grenouille (cf encode_grenouille())
+       Sorties:
+         * g: liste
+           La grenouille (cf grenouille.cree())
+    """
+    code = int(code)
+    return(grenouille.cree((code & MASQUE_PROPRIETAIRE) - 1, (code & BIT_REINE) != 0,
+                           code >> DECALAGE_PRIORITE))
+
+def encode_jetons(liste_jetons):
+    """
+       Renvoie le masque de bits des jetons mâles donnés.
+       Entrées:
+         * liste_jetons: liste
+           Une liste de jetons mâles, dans l'ordre de joueur.JETONS_MALES
+       Sorties:
+         * masque: entier
+           Le masque de bits des jetons (cf JETONS)
+    """
+    masque = 0
+    for k in range(len(joueur.JETONS_MALES)):
+        if joueur.JETONS_MALES[k] in liste_jetons:
+            masque += 1 << k
+    return(masque)
+
+def decode_jetons(masque):
+    """
+       Renvoie la liste des jetons mâles d'un masque de bits.
+       Entrées:
+         * masque: entier
+           Le masque de bits des jetons (cf JETONS)
+       Sorties:
+         * liste_jetons: liste
+           La liste des jetons mâles, dans l'ordre de joueur.JETONS_MALES
+    """
+    liste_jetons = []
+    for k in range(len(joueur.JETONS_MALES)):
+        if (int(masque) >> k) & 1:
+            liste_jetons.append(joueur.JETONS_MALES[k])
+    return(liste_jetons)
+
+def cree_depuis_plateau(plateau_croa):
+    """
+       Crée l'état compact représentant un plateau donné.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau à représenter (cf plateau.cree())
+       Sorties:
+         * etat: ndarray
+           L'état compact du plateau
+
+       Notes:
+         Les noms et positions des camps des joueurs ne font pas partie de
+         l'état compact (cf convertis_vers_plateau()). Une erreur ValueError
+         est levée si une dalle porte plus de NOMBRE_GRENOUILLES_MAX
+         grenouilles (cf modifie_liste_grenouilles()).
+    """
+    etat = cree()
+    for numero_dalle in range(NOMBRE_DALLES):
+        d = plateau.renvoie_dalle(plateau_croa, numero_dalle)
+        modifie_carte(etat, numero_dalle, dalle.renvoie_carte(d))
+        modifie_liste_grenouilles(etat, numero_dalle, dalle.renvoie_liste_grenouilles(d))
+        modifie_dernier_occupant(etat, numero_dalle, dalle.renvoie_dernier_occupant(d))
+    for j in plateau.renvoie_liste_joueurs(plateau_croa):
+        identifiant = joueur.renvoie_identifiant(j)
+        joueurs = renvoie_joueurs(etat)
+        joueurs[identifiant, EN_JEU] = 1
+        joueurs[identifiant, RESERVE] = joueur.renvoie_nombre_grenouilles_reserve(j)
+        joueurs[identifiant, JETONS] = encode_jetons(joueur.renvoie_liste_jetons(j))
+        joueurs[identifiant, PRIORITE_MAXIMALE] = joueur.renvoie_priorite_maximale(j)
+    return(etat)
+
+def convertis_vers_plateau(etat, liste_joueurs):
+    """
+       Crée le plateau représenté par un état compact.
+       Entrées:
+         * etat: ndarray
+           L'état compact à convertir
+         * liste_joueurs: liste
+           Des joueurs donnant les noms et positions des camps des joueurs de
+           l'état, par exemple la liste initiale des joueurs de la partie
+       Sorties:
+         * plateau_croa: liste
+           Un nouveau plateau (cf plateau.cree()) dont les joueurs sont ceux de
+           liste_joueurs encore en jeu dans l'état, dans le même ordre
+    """
+    joueurs = renvoie_joueurs(etat)
+    nouveaux_joueurs = []
+    for j in liste_joueurs:
+        identifiant = joueur.renvoie_identifiant(j)
+        if joueurs[identifiant, EN_JEU]:
+            nouveau_joueur = joueur.cree(joueur.renvoie_nom(j), identifiant, joueur.renvoie_position_camp(j))
+            joueur.modifie_nombre_grenouilles_reserve(nouveau_joueur, int(joueurs[identifiant, RESERVE]))
+            joueur.modifie_liste_jetons(nouveau_joueur, decode_jetons(joueurs[identifiant, JETONS]))
+            joueur.modifie_priorite_maximale(nouveau_joueur, int(joueurs[identifiant, PRIORITE_MAXIMALE]))
+            nouveaux_joueurs.append(nouveau_joueur)
+    liste_dalles = []
+    for numero_dalle in range(NOMBRE_DALLES):
+        liste_dalles.append(dalle.cree(renvoie_carte(etat, numero_dalle), \
+                                       renvoie_liste_grenouilles(etat, numero_dalle), \
+                                       renvoie_dernier_occupant(etat, numero_dalle)))
+    return(plateau.assemble(nouveaux_joueurs, liste_dalles))
+
+def renvoie_carte(etat, numero_dalle):
+    """
+       Renvoie la carte de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * carte: liste
+           Une nouvelle carte (cf carte.cree()) identique à celle de la dalle
+    """
+    champs = renvoie_dalles(etat)[numero_dalle]
+    c = carte.cree(int(champs[FACE]), int(champs[DOS]))
+    carte.modifie_face_visible(c, bool(champs[FACE_VISIBLE]))
+    return(c)
+
+def modifie_carte(etat, numero_dalle, c):
+    """
+       Modifie la carte de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * c: liste
+           La nouvelle carte de la dalle (cf carte.cree())
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    champs = renvoie_dalles(etat)[numero_dalle]
+    champs[FACE] = carte.renvoie_face(c)
+    champs[DOS] = carte.renvoie_dos(c)
+    champs[FACE_VISIBLE] = carte.renvoie_face_visible(c)
+
+def renvoie_face(etat, numero_dalle):
+    """
+       Renvoie la face de la carte de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * face: entier
+           L'identifiant de la face de la carte
+    """
+    return(int(etat[numero_dalle * CHAMPS_DALLE + FACE]))
+
+def renvoie_face_visible(etat, numero_dalle):
+    """
+       Indique si la face de la carte de la dalle de numéro donné est visible.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * face_visible: booléen
+           True si la face de la carte est visible
+    """
+    return(etat[numero_dalle * CHAMPS_DALLE + FACE_VISIBLE] != 0)
+
+def modifie_face_visible(etat, numero_dalle, drapeau):
+    """
+       Modifie la visibilité de la face de la carte de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * drapeau: booléen
+           True pour rendre la face visible, False pour la cacher
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    etat[numero_dalle * CHAMPS_DALLE + FACE_VISIBLE] = drapeau
+
+def renvoie_dernier_occupant(etat, numero_dalle):
+    """
+       Renvoie le dernier occupant de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * dernier_occupant: entier
+           L'identifiant du joueur présent sur la dalle au tour précédent, -1
+           s'il n'y en avait pas
+    """
+    return(int(etat[numero_dalle * CHAMPS_DALLE + DERNIER_OCCUPANT]))
+
+def modifie_dernier_occupant(etat, numero_dalle, dernier_occupant):
+    """
+       Modifie le dernier occupant de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * dernier_occupant: entier
+           L'identifiant du joueur présent sur la dalle, -1 s'il n'y en a pas
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    etat[numero_dalle * CHAMPS_DALLE + DERNIER_OCCUPANT] = dernier_occupant
+
+def renvoie_nombre_grenouilles(etat, numero_dalle):
+    """
+       Renvoie le nombre de grenouilles de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * nombre_grenouilles: entier
+           Le nombre de grenouilles de la dalle, entre 0 et
+           NOMBRE_GRENOUILLES_MAX
+    """
+    debut = numero_dalle * CHAMPS_DALLE
+    return(int(np.count_nonzero(etat[debut + GRENOUILLE_1:debut + GRENOUILLE_3 + 1])))
+
+def renvoie_liste_grenouilles(etat, numero_dalle):
+    """
+       Renvoie la liste des grenouilles de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * numero_dalle: entier
+           Le numéro de la dalle
+       Sorties:
+         * liste_grenouilles: liste
+           Une nouvelle liste de nouvelles grenouilles identiques à celles de
+           la dalle, dans le même ordre
+
+       Notes:
+         Modifier les grenouilles renvoyées ne modifie pas l'état: il faut
+         utiliser modifie_liste_grenouilles().
+    """
+    debut = numero_dalle * CHAMPS_DALLE
+    liste_grenouilles = []
+    for code in etat[debut + GRENOUILLE_1:debut + GRENOUILLE_3 + 1]:
+        if code != 0:
+            liste_grenouilles.append(decode_grenouille(code))
+    return(liste_grenouilles)
+
+def modifie_liste_grenouilles(etat, numero_dalle, liste_grenouilles):
+    """
+       Modifie la liste des grenouilles de la dalle de numéro donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * liste_grenouilles: liste
+           La nouvelle liste des grenouilles de la dalle, d'au plus
+           NOMBRE_GRENOUILLES_MAX grenouilles
+
+       Notes:
+         Une erreur ValueError est levée si la liste compte plus de
+         NOMBRE_GRENOUILLES_MAX grenouilles, le nombre de champs de
+         grenouilles d'une dalle. L'état est modifié à la sortie de la
+         fonction.
+    """
+    if len(liste_grenouilles) > NOMBRE_GRENOUILLES_MAX:
+        raise ValueError("etat: trop de grenouilles sur la dalle " + str(numero_dalle))
+    debut = numero_dalle * CHAMPS_DALLE
+    etat[debut + GRENOUILLE_1:debut + GRENOUILLE_3 + 1] = 0
+    for k in range(len(liste_grenouilles)):
+        etat[debut + GRENOUILLE_1 + k] = encode_grenouille(liste_grenouilles[k])
+
+def est_en_jeu(etat, identifiant):
+    """
+       Indique si le joueur d'identifiant donné est encore en jeu.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+       Sorties:
+         * en_jeu: booléen
+           True si le joueur est encore en jeu
+    """
+    return(etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + EN_JEU] != 0)
+
+def renvoie_nombre_grenouilles_reserve(etat, identifiant):
+    """
+       Renvoie le nombre de grenouilles en réserve du joueur d'identifiant donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+       Sorties:
+         * nombre_grenouilles_reserve: entier
+           Le nombre de grenouilles en réserve du joueur
+    """
+    return(int(etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + RESERVE]))
+
+def modifie_nombre_grenouilles_reserve(etat, identifiant, nombre_grenouilles_reserve):
+    """
+       Modifie le nombre de grenouilles en réserve du joueur d'identifiant donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * identifiant: entier
+           L'identifiant du joueur
+         * nombre_grenouilles_reserve: entier
+           Le nouveau nombre de grenouilles en réserve du joueur
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + RESERVE] = nombre_grenouilles_reserve
+
+def possede_jeton(etat, identifiant, couleur_male):
+    """
+       Teste si le joueur d'identifiant donné possède le jeton mâle donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+         * couleur_male: entier
+           La couleur du mâle, entre carte.MALE_BLEU et carte.MALE_VIOLET
+       Sorties:
+         * possede: booléen
+           True si le joueur possède le jeton
+    """
+    masque = int(etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + JETONS])
+    return((masque >> joueur.JETONS_MALES.index(couleur_male)) & 1 == 1)
+
+def retire_jeton(etat, identifiant, couleur_male):
+    """
+       Retire un jeton mâle au joueur d'identifiant donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * identifiant: entier
+           L'identifiant du joueur
+         * couleur_male: entier
+           La couleur du mâle, entre carte.MALE_BLEU et carte.MALE_VIOLET
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    indice = DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + JETONS
+    etat[indice] = int(etat[indice]) & ~(1 << joueur.JETONS_MALES.index(couleur_male))
+
+def renvoie_priorite_maximale(etat, identifiant):
+    """
+       Renvoie la priorité maximale des grenouilles du joueur d'identifiant
+       donné.
+       Entrées:
+         * etat: ndarray
+           L'état à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+       Sorties:
+         * priorite_maximale: entier
+           La priorité maximale des grenouilles du joueur
+    """
+    return(int(etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + PRIORITE_MAXIMALE]))
+
+def modifie_priorite_maximale(etat, identifiant, priorite_maximale):
+    """
+       Modifie la priorité maximale des grenouilles du joueur d'identifiant
+       donné.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * identifiant: entier
+           L'identifiant du joueur
+         * priorite_maximale: entier
+           La nouvelle priorité maximale
+
+       Notes:
+         L'état est modifié à la sortie de la fonction.
+    """
+    etat[DEBUT_JOUEURS + identifiant * CHAMPS_JOUEUR + PRIORITE_MAXIMALE] = priorite_maximale
+
+def retire_joueur(etat, identifiant):
+    """
+       Retire le joueur d'identifiant donné du jeu ainsi que toutes ses
+       grenouilles des dalles.
+       Entrées:
+         * etat: ndarray
+           L'état à modifier
+         * identifiant: entier
+           L'identifiant du joueur à retirer
+
+       Notes:
+         Comme plateau.retire_joueur(), les grenouilles restantes d'une dalle
+         conservent leur ordre. L'état est modifié à la sortie de la fonction.
+    """
+    dalles = renvoie_dalles(etat)
+    grenouilles = dalles[:, GRENOUILLE_1:GRENOUILLE_3 + 1]
+    grenouilles[(grenouilles & MASQUE_PROPRIETAIRE) == identifiant + 1] = 0
+    # Les grenouilles restantes passent en tête, dans le même ordre: le tri
+    # stable place les champs occupés avant les champs vides
+    ordre = np.argsort(grenouilles == 0, axis=1, kind='stable')
+    grenouilles[:] = np.take_along_axis(grenouilles, ordre, axis=1)
+    renvoie_joueurs(etat)[identifiant] = 0
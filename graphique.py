@@ -3,35 +3,366 @@
 """
 
 # Modules externes
-import matplotlib.pyplot as plt
-import matplotlib.image as img
+import os
 import numpy as np
+# Les modules matplotlib ne sont importés qu'au premier besoin: à la première
+# utilisation d'une image pour matplotlib.image (cf charge_images()) et à la
+# création de la fenêtre pour matplotlib.pyplot (cf initialise()). Le moteur du
+# jeu peut ainsi être utilisé sans payer le démarrage de l'interface graphique.
+plt = None
+Bbox = None
 
-IMAGES_FACES = [img.imread("Images/" + name + ".png") for name in \
-                ["nenuphar", "roseaux", "moustique", "male_bleu", \
-                 "male_jaune", "male_orange", "male_rose", "male_vert", \
-                 "male_violet", "vase", "brochet", "rondin"]]
-IMAGES_DOS = [img.imread("Images/" + name + ".png") for name in \
-              ["eau_peu_profonde", "eau_profonde_1", "eau_profonde_2", \
-               "oui", "non", "deux", "trois", "quatre"]]
+# Facteur de réduction de la résolution de rendu par rapport à celle des
+# images du répertoire Images (1804x1804 pixels pour le fond). La fenêtre
+# graphique ne faisant que 900x900 pixels, un facteur 2 permet de composer
+# les images du plateau à la résolution de l'affichage. Il peut être choisi
+# via la variable d'environnement CROA_REDUCTION, entier supérieur ou égal
+# à 1.
+REDUCTION = int(os.environ.get("CROA_REDUCTION", "1"))
+if REDUCTION < 1:
+    raise ValueError("graphique: CROA_REDUCTION doit être un entier supérieur ou égal à 1, pas " + str(REDUCTION))
+# Mode sans fenêtre graphique, choisi via la variable d'environnement
+# CROA_SANS_FENETRE=1: matplotlib.pyplot n'est jamais importé et la fenêtre ne
+# peut pas être créée. Les images du plateau peuvent toujours être composées.
+SANS_FENETRE = os.environ.get("CROA_SANS_FENETRE", "0") == "1"
+# Format des pixels des images, choisi via la variable d'environnement
+# CROA_OCTETS: par défaut chaque composante est un réel float32 dans [0,1],
+# avec CROA_OCTETS=1 c'est un entier uint8 dans [0,255]. Les images sont
+# alors quatre fois plus petites.
+OCTETS = os.environ.get("CROA_OCTETS", "0") == "1"
+# Valeur d'une composante d'un pixel blanc dans ce format
+BLANC = 255 if OCTETS else 1
 
-IMAGES_REINES = [img.imread("Images/reine_" + name + ".png") for name in \
-                 ["bleue", "rose", "rouge", "verte"]]
-IMAGES_SERVANTES = [img.imread("Images/servante_" + name + ".png") for \
-                    name in ["bleue", "rose", "rouge", "verte"]]
+def convertis_image(image):
+    """
+       Convertit une image à composantes réelles dans le format des pixels
+       choisi (cf OCTETS).
+       Entrées:
+         * image: ndarray
+           L'image à composantes réelles dans [0,1]
+       Sorties:
+         * image_convertie: ndarray
+           L'image dans le format des pixels choisi
+    """
+    if not OCTETS:
+        return(image)
+    return(np.round(image * 255).astype(np.uint8))
+
+def convertis_couleur(couleur):
+    """
+       Convertit une couleur dans le format des pixels choisi (cf OCTETS).
+       Entrées:
+         * couleur: tuple
+           La couleur sous la forme d'un triplet de réels dans [0,1]
+       Sorties:
+         * couleur_convertie: tuple
+           La couleur dans le format des pixels choisi
+    """
+    if not OCTETS:
+        return(couleur)
+    return(tuple(int(round(composante * 255)) for composante in couleur))
+
+def melange(zone, image):
+    """
+       Mélange une image en proportions égales avec une zone d'une autre image.
+       Entrées:
+         * zone: ndarray
+           La zone de l'image à modifier, de mêmes dimensions que l'image
+         * image: ndarray
+           L'image à mélanger à la zone
 
-IMAGE_FOND = img.imread("Images/fond.png")
+       Notes:
+         Le paramètre zone est modifié à la sortie de la fonction, sans
+         allocation d'image intermédiaire pour des composantes réelles. Pour
+         des composantes entières, le mélange (a + b) / 2 est arrondi à
+         l'entier inférieur et calculé sans dépassement sous la forme
+         a/2 + b/2 + (1 si a et b sont impairs).
+    """
+    if OCTETS:
+        retenue = zone & image & 1
+        zone >>= 1
+        zone += image >> 1
+        zone += retenue
+    else:
+        zone += image
+        zone *= 0.5
+
+def reduis(image):
+    """
+       Réduit la résolution d'une image du facteur REDUCTION.
+       Entrées:
+         * image: ndarray
+           L'image à réduire
+       Sorties:
+         * image_reduite: ndarray
+           L'image réduite
+
+       Notes:
+         Chaque pixel de l'image réduite est la moyenne d'un bloc de
+         REDUCTION x REDUCTION pixels de l'image d'origine. Les lignes et
+         colonnes ne formant pas un bloc complet sont ignorées.
+    """
+    if REDUCTION == 1:
+        return(image)
+    largeur = image.shape[0] // REDUCTION
+    hauteur = image.shape[1] // REDUCTION
+    blocs = image[:largeur * REDUCTION, :hauteur * REDUCTION]
+    blocs = blocs.reshape(largeur, REDUCTION, hauteur, REDUCTION, image.shape[2])
+    return(blocs.mean(axis=(1, 3), dtype=np.float32))
+
+def reduis_sprite(image):
+    """
+       Réduit la résolution de l'image d'une grenouille du facteur REDUCTION.
+       Entrées:
+         * image: ndarray
+           L'image à réduire, dont les pixels blancs sont transparents
+       Sorties:
+         * image_reduite: ndarray
+           L'image réduite
+
+       Notes:
+         Contrairement à reduis(), seuls les pixels qui ne sont pas blancs
+         contribuent à la couleur d'un bloc, afin de ne pas créer de halo clair
+         autour de la grenouille. Un bloc reste blanc, donc transparent, si la
+         majorité de ses pixels sont blancs.
+    """
+    if REDUCTION == 1:
+        return(image)
+    opaque = (image[:, :, 0] + image[:, :, 1] + image[:, :, 2] < 3)[:, :, np.newaxis]
+    couverture = reduis(opaque.astype(np.float32))
+    image_reduite = reduis(image * opaque) / np.maximum(couverture, 1 / REDUCTION ** 2)
+    image_reduite[couverture[:, :, 0] < 0.5] = 1
+    return(image_reduite.astype(np.float32))
+
+# Couleurs associées aux joueurs
+COULEURS_JOUEURS = [(81/255, 222/255, 255/255), (224/255, 181/255, 208/255), \
+                    (219/255, 145/255, 132/255), (197/255, 224/255, 147/255)]
+
+def cree_sprite(image):
+    """
+       Crée le sprite associé à l'image d'une grenouille.
+       Entrées:
+         * image: ndarray
+           L'image de la grenouille
+       Sorties:
+         * sprite: liste
+           Une liste [image, masque, image_couchee, masque_couche]
+
+       Notes:
+         Le masque est un tableau de booléens de dimensions (largeur, hauteur, 1)
+         valant True pour les pixels qui ne sont pas blancs, c'est-à-dire dont
+         l'une des composantes rouge, vert et bleu n'est pas égale à BLANC. Seuls ces pixels sont copiés dans l'image du plateau, par exemple
+         via np.copyto(zone, image, where=masque).
+         L'image couchée est l'image retournée utilisée pour une grenouille
+         enlisée dans la vase, accompagnée de son propre masque.
+    """
+    masque = np.any(image != BLANC, axis=2)[:, :, np.newaxis]
+    image_couchee = np.ascontiguousarray(image[::-1, :])
+    masque_couche = np.ascontiguousarray(masque[::-1, :])
+    return([image, masque, image_couchee, masque_couche])
+
+def cree_vignettes_jetons(couleur):
+    """
+       Crée les vignettes des jetons mâles aux couleurs d'un joueur.
+       Entrées:
+         * couleur: tuple
+           La couleur du joueur
+       Sorties:
+         * vignettes: liste
+           La liste des vignettes indexée par identifiant de face de carte
+
+       Notes:
+         Une vignette est l'image de la face réduite de moitié dans laquelle
+         les pixels blancs sont remplacés par la couleur du joueur.
+    """
+    vignettes = []
+    for image in IMAGES_FACES:
+        vignette = np.copy(image[::2, ::2][:image.shape[0] // 2, :image.shape[1] // 2])
+        masque = np.all(vignette == BLANC, axis=2)
+        vignette[masque] = convertis_couleur(couleur)
+        vignettes.append(vignette)
+    return(vignettes)
+
+# Noms des images du jeu et de l'atlas des sprites. Ces variables globales ne
+# sont définies qu'au premier accès à l'une d'elles (cf __getattr__()):
+# IMAGES_FACES[face], IMAGES_DOS[dos] sont les images des cartes,
+# IMAGES_REINES[i], IMAGES_SERVANTES[i] celles des grenouilles du joueur
+# d'identifiant i et IMAGE_FOND celle du fond du plateau.
+# SPRITES_REINES[i] et SPRITES_SERVANTES[i] sont les sprites des grenouilles du
+# joueur d'identifiant i (cf cree_sprite()), VIGNETTES_JETONS[i][face] la
+# vignette du jeton mâle de face donnée pour le joueur d'identifiant i
+NOMS_IMAGES = ["IMAGES_FACES", "IMAGES_DOS", "IMAGES_REINES", "IMAGES_SERVANTES", \
+               "IMAGE_FOND", "SPRITES_REINES", "SPRITES_SERVANTES", "VIGNETTES_JETONS"]
+
+# Noms des fichiers PNG des images du jeu dans le répertoire Images, dans
+# l'ordre des variables IMAGES_FACES, IMAGES_DOS, IMAGES_REINES,
+# IMAGES_SERVANTES et IMAGE_FOND
+FICHIERS_IMAGES = ["nenuphar", "roseaux", "moustique", "male_bleu", \
+                   "male_jaune", "male_orange", "male_rose", "male_vert", \
+                   "male_violet", "vase", "brochet", "rondin"] + \
+                  ["eau_peu_profonde", "eau_profonde_1", "eau_profonde_2", \
+                   "oui", "non", "deux", "trois", "quatre"] + \
+                  ["reine_" + nom for nom in ["bleue", "rose", "rouge", "verte"]] + \
+                  ["servante_" + nom for nom in ["bleue", "rose", "rouge", "verte"]] + \
+                  ["fond"]
+# Paquet des images préparées (cf ecris_paquet_images()): un tableau à une
+# dimension contenant toutes les images à la suite, réduites et converties
+# pour la configuration courante (cf REDUCTION et OCTETS), et son index donnant
+# pour chaque image de FICHIERS_IMAGES [début, largeur, hauteur, composantes].
+# Chaque configuration a son propre paquet.
+CONFIGURATION_PAQUET = str(REDUCTION) + ("_u8" if OCTETS else "_f32")
+PAQUET_IMAGES = "Images/paquet_images_" + CONFIGURATION_PAQUET + ".npy"
+INDEX_PAQUET_IMAGES = "Images/index_paquet_images_" + CONFIGURATION_PAQUET + ".npy"
+
+def prepare_images(images):
+    """
+       Réduit et convertit les images décodées des fichiers de FICHIERS_IMAGES
+       pour la configuration courante (cf REDUCTION et OCTETS).
+       Entrées:
+         * images: liste
+           Les images décodées, dans l'ordre de FICHIERS_IMAGES
+       Sorties:
+         * images_preparees: liste
+           Les images réduites (cf reduis() et reduis_sprite()) puis
+           converties (cf convertis_image()), dans le même ordre
+    """
+    return([convertis_image(reduis(image)) for image in images[0:20]] + \
+           [convertis_image(reduis_sprite(image)) for image in images[20:28]] + \
+           [convertis_image(reduis(images[28]))])
+
+def ecris_paquet_images():
+    """
+       Décode les fichiers PNG du répertoire Images et écrit les images
+       préparées pour la configuration courante (cf prepare_images()) dans le
+       paquet d'images PAQUET_IMAGES et son index INDEX_PAQUET_IMAGES.
+
+       Notes:
+         Cette fonction est appelée par le script construis_paquet_images.py.
+         Le paquet doit être reconstruit après toute modification d'une image
+         PNG, faute de quoi ces dernières sont décodées à chaque lancement
+         (cf lis_images()).
+    """
+    import matplotlib.image as img
+    images = prepare_images([img.imread("Images/" + nom + ".png") for nom in FICHIERS_IMAGES])
+    index = []
+    debut = 0
+    for image in images:
+        index.append([debut, image.shape[0], image.shape[1], image.shape[2]])
+        debut += image.size
+    paquet = np.lib.format.open_memmap(PAQUET_IMAGES, mode="w+", dtype=images[0].dtype, shape=(debut,))
+    for image, position in zip(images, index):
+        paquet[position[0]:position[0] + image.size] = image.ravel()
+    paquet.flush()
+    del paquet
+    np.save(INDEX_PAQUET_IMAGES, np.array(index, dtype=np.int64))
+
+def paquet_images_a_jour():
+    """
+       Indique si le paquet d'images de la configuration courante existe et
+       est plus récent que toutes les images PNG du répertoire Images.
+       Sorties:
+         * a_jour: booléen
+           True si le paquet peut être utilisé à la place des images PNG
+    """
+    if not os.path.exists(PAQUET_IMAGES) or not os.path.exists(INDEX_PAQUET_IMAGES):
+        return(False)
+    date_paquet = min(os.path.getmtime(PAQUET_IMAGES), os.path.getmtime(INDEX_PAQUET_IMAGES))
+    for nom in FICHIERS_IMAGES:
+        if os.path.getmtime("Images/" + nom + ".png") > date_paquet:
+            return(False)
+    return(True)
+
+def lis_images():
+    """
+       Renvoie les images des fichiers de FICHIERS_IMAGES, préparées pour la
+       configuration courante (cf prepare_images()).
+       Sorties:
+         * images: liste
+           La liste des images, dans l'ordre de FICHIERS_IMAGES
+
+       Notes:
+         Si le paquet d'images de la configuration courante est à jour, il est
+         projeté en mémoire (memory map) au lieu de décoder et préparer les
+         images PNG: les images renvoyées sont alors des vues en lecture seule
+         du paquet, dont les pages sont partagées entre tous les processus du
+         jeu lancés sur la machine avec la même configuration.
+    """
+    if paquet_images_a_jour():
+        paquet = np.load(PAQUET_IMAGES, mmap_mode="r")
+        index = np.load(INDEX_PAQUET_IMAGES)
+        if len(index) == len(FICHIERS_IMAGES):
+            return([paquet[debut:debut + largeur * hauteur * composantes].reshape(largeur, hauteur, composantes) \
+                    for debut, largeur, hauteur, composantes in index])
+    import matplotlib.image as img
+    return(prepare_images([img.imread("Images/" + nom + ".png") for nom in FICHIERS_IMAGES]))
+
+def charge_images():
+    """
+       Charge les images du jeu et construit l'atlas des sprites.
+
+       Notes:
+         Cette fonction ne renvoie rien: elle définit les variables globales
+         nommées dans NOMS_IMAGES. Elle est appelée automatiquement au premier
+         accès à l'une d'elles. Les images ne doivent pas être modifiées.
+    """
+    global IMAGES_FACES, IMAGES_DOS, IMAGES_REINES, IMAGES_SERVANTES, IMAGE_FOND
+    global SPRITES_REINES, SPRITES_SERVANTES, VIGNETTES_JETONS
+    images = lis_images()
+    IMAGES_FACES = images[0:12]
+    IMAGES_DOS = images[12:20]
+    IMAGES_REINES = images[20:24]
+    IMAGES_SERVANTES = images[24:28]
+    IMAGE_FOND = images[28]
+    SPRITES_REINES = [cree_sprite(image) for image in IMAGES_REINES]
+    SPRITES_SERVANTES = [cree_sprite(image) for image in IMAGES_SERVANTES]
+    VIGNETTES_JETONS = [cree_vignettes_jetons(couleur) for couleur in COULEURS_JOUEURS]
+
+def __getattr__(nom):
+    """
+       Appelée par Python lors de l'accès à une variable globale du module qui
+       n'est pas encore définie, par exemple graphique.IMAGE_FOND.
+       Entrées:
+         * nom: chaîne de caractères
+           Le nom de la variable
+       Sorties:
+         * valeur:
+           La valeur de la variable, après chargement des images si c'est
+           l'une d'elles
+    """
+    if nom in NOMS_IMAGES:
+        charge_images()
+        return(globals()[nom])
+    raise AttributeError("module 'graphique' has no attribute '" + nom + "'")
 
 # Fenêtre graphique pour le visuel du jeu
 # FIG est l'identifiant de la figure pyplot contenant l'image du plateau
 # AX est le système d'axes de la figure
-FIG, AX = plt.subplots(figsize=(9, 9), dpi=100, frameon=False)
-# Pas d'affichage des axes
-AX.axis('off')
-# Pas de marges dans la fenêtre
-FIG.tight_layout(pad=0,rect=[0,0,1,1])
+# Elles ne sont créées que par initialise()
+FIG = None
+AX = None
+# Objet pyplot correspondant à l'image du plateau
+IMG = None
 # Image du plateau
 IMAGE_PLATEAU = None
+# Copie du fond statique de la figure (tout sauf l'image du plateau et les
+# messages) utilisée pour rafraîchir la fenêtre par blitting
+FOND_FIGURE = None
+# Image affichée dans la fenêtre lors du rafraîchissement par blitting:
+# l'image du plateau complétée d'une composante alpha, format que pyplot
+# dessine sans conversion. C'est le tableau de l'objet pyplot IMG.
+IMAGE_AFFICHEE = None
+# Zone de l'image affichée qui diffère de la dernière image affichée sans zone
+# (cf rafraichit()), None si elle est inconnue
+ZONE_AFFICHEE = None
+# Liste des [message, cadre] des messages actuellement affichés, où cadre est
+# le rectangle occupé par le message dans la fenêtre
+MESSAGES_AFFICHES = []
+# Pile des [image, pixels, sauvegarde, zone] des pixels d'images recouverts par
+# des éléments temporaires (cadres, dalles d'un choix), cf sauvegarde_pixels()
+ZONES_SAUVEGARDEES = []
+# Tableaux préalloués disponibles pour les sauvegardes de zones, réutilisés
+# d'une sauvegarde à l'autre
+TAMPONS_SAUVEGARDE = []
 
 def initialise(image):
     """
@@ -52,18 +383,186 @@ def initialise(image):
          Cette fonction ne renvoie rien: elle initialise le composant graphique
          global IMG qui est l'objet pyplot correspondant à une image donnée sous
          la forme d'un tableau. Elle crée également la fenêtre graphique pyplot.
+         Si la fenêtre le permet, l'image et les messages sont animés: ils ne
+         sont pas dessinés avec le fond de la figure mais par blitting.
+         C'est cette fonction qui importe matplotlib.pyplot: elle ne peut pas
+         être appelée en mode sans fenêtre (cf SANS_FENETRE).
     """
-    global IMG
+    global IMG, FIG, AX, plt, Bbox
+    if SANS_FENETRE:
+        raise RuntimeError("graphique: pas de fenêtre en mode sans fenêtre (CROA_SANS_FENETRE=1)")
+    import matplotlib.pyplot as plt
+    from matplotlib.transforms import Bbox
+    FIG, AX = plt.subplots(figsize=(9, 9), dpi=100, frameon=False)
+    # Pas d'affichage des axes
+    AX.axis('off')
+    # Pas de marges dans la fenêtre
+    FIG.tight_layout(pad=0,rect=[0,0,1,1])
     FIG.show()
-    IMG = AX.imshow(image)
+    IMG = AX.imshow(image, animated=FIG.canvas.supports_blit)
+    FIG.canvas.mpl_connect('draw_event', memorise_fond)
+    FIG.canvas.draw()
+
+def memorise_fond(evenement):
+    """
+       Cette fonction est appelée après chaque dessin complet de la fenêtre
+       graphique pour mémoriser le fond statique de la figure.
+       Entrées:
+         * evenement: DrawEvent
+           L'évènement pyplot de dessin de la figure
+
+       Notes:
+         Les éléments animés (l'image du plateau et les messages) ne font pas
+         partie du fond: ils sont redessinés par dessus.
+    """
+    global FOND_FIGURE, ZONE_AFFICHEE
+    if not FIG.canvas.supports_blit:
+        return
+    FOND_FIGURE = FIG.canvas.copy_from_bbox(FIG.bbox)
+    ZONE_AFFICHEE = None
+    dessine_elements_animes()
+
+def dessine_elements_animes(cadre=None):
+    """
+       Dessine l'image du plateau et les messages par dessus le fond de la
+       figure et mémorise les rectangles occupés par les messages.
+       Entrées:
+         * cadre: Bbox (optionnel)
+           Le rectangle de la fenêtre auquel limiter le dessin. Sans cadre,
+           l'image et les messages sont dessinés entièrement.
+    """
+    global MESSAGES_AFFICHES
+    if cadre is not None:
+        IMG.set_clip_box(cadre)
+    AX.draw_artist(IMG)
+    IMG.set_clip_box(AX.bbox)
+    MESSAGES_AFFICHES = []
+    for message in FIG.texts:
+        message.set_clip_box(cadre)
+        FIG.draw_artist(message)
+        message.set_clip_box(None)
+        cadre_message = message.get_window_extent()
+        if message.get_bbox_patch() is not None:
+            cadre_message = Bbox.union([cadre_message, message.get_bbox_patch().get_window_extent()])
+        MESSAGES_AFFICHES.append([message, cadre_message.padded(2)])
+
+def convertis_zone_vers_cadre(zone):
+    """
+       Convertis une zone de l'image affichée en rectangle de la fenêtre.
+       Entrées:
+         * zone: liste
+           Un rectangle [i_min, i_max, j_min, j_max] de l'image affichée
+       Sorties:
+         * cadre: Bbox
+           Le rectangle correspondant en pixels de la fenêtre, élargi d'un
+           pixel pour couvrir les pixels partiellement recouverts
+    """
+    i_min, i_max, j_min, j_max = zone
+    coins = AX.transData.transform([[j_min - 0.5, i_max - 0.5], [j_max - 0.5, i_min - 0.5]])
+    return(Bbox(coins).expanded(1, 1).padded(1))
+
+def sauvegarde_zone(image, zone):
+    """
+       Sauvegarde une zone d'une image avant d'y dessiner un élément temporaire.
+       Entrées:
+         * image: ndarray
+           L'image à modifier, par exemple IMAGE_PLATEAU
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] de l'image à sauvegarder
+
+       Notes:
+         Plutôt que de dessiner les éléments temporaires dans une copie de
+         l'image entière, on les dessine dans l'image elle-même après en avoir
+         sauvegardé la zone recouverte, puis on restaure cette zone (cf
+         restaure_zones()).
+    """
+    i_min, i_max, j_min, j_max = zone
+    sauvegarde_pixels(image, (slice(i_min, i_max), slice(j_min, j_max)), zone)
+
+def sauvegarde_pixels(image, pixels, zone):
+    """
+       Sauvegarde des pixels d'une image avant d'y dessiner un élément
+       temporaire.
+       Entrées:
+         * image: ndarray
+           L'image à modifier, par exemple IMAGE_PLATEAU
+         * pixels: tuple
+           La sélection des pixels à sauvegarder, telle que image[pixels]
+           désigne ces pixels: par exemple (lignes, colonnes) où lignes et
+           colonnes sont des tableaux d'indices
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] contenant ces pixels
+
+       Notes:
+         La sauvegarde est copiée dans un tableau préalloué de
+         TAMPONS_SAUVEGARDE s'il en existe un de mêmes dimensions.
+    """
+    contenu = image[pixels]
+    indice_tampon = -1
+    for k in range(len(TAMPONS_SAUVEGARDE)):
+        tampon = TAMPONS_SAUVEGARDE[k]
+        if indice_tampon == -1 and tampon.shape == contenu.shape and tampon.dtype == contenu.dtype:
+            indice_tampon = k
+    if indice_tampon == -1:
+        sauvegarde = np.empty_like(contenu)
+    else:
+        sauvegarde = TAMPONS_SAUVEGARDE.pop(indice_tampon)
+    np.copyto(sauvegarde, contenu)
+    ZONES_SAUVEGARDEES.append([image, pixels, sauvegarde, zone])
+
+def restaure_zones(marque):
+    """
+       Restaure les zones d'images sauvegardées depuis une marque.
+       Entrées:
+         * marque: entier
+           Le nombre de zones sauvegardées (len(ZONES_SAUVEGARDEES)) avant la
+           sauvegarde de la première zone à restaurer
+       Sorties:
+         * zone: liste
+           Le plus petit rectangle contenant les zones restaurées
+
+       Notes:
+         Les zones sont restaurées de la dernière sauvegardée à la première, ce
+         qui permet à des zones sauvegardées de se recouvrir.
+    """
+    zone_restauree = []
+    while len(ZONES_SAUVEGARDEES) > marque:
+        image, pixels, sauvegarde, zone = ZONES_SAUVEGARDEES.pop()
+        image[pixels] = sauvegarde
+        TAMPONS_SAUVEGARDE.append(sauvegarde)
+        zone_restauree = reunis_zones(zone_restauree, zone)
+    return(zone_restauree)
+
+def reunis_zones(zone_1, zone_2):
+    """
+       Renvoie le plus petit rectangle contenant deux zones de l'image.
+       Entrées:
+         * zone_1, zone_2: listes
+           Des rectangles [i_min, i_max, j_min, j_max], éventuellement vides
+       Sorties:
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] contenant les deux zones,
+           vide si les deux zones sont vides
+    """
+    if len(zone_1) == 0:
+        return(zone_2)
+    if len(zone_2) == 0:
+        return(zone_1)
+    return([min(zone_1[0], zone_2[0]), max(zone_1[1], zone_2[1]), \
+            min(zone_1[2], zone_2[2]), max(zone_1[3], zone_2[3])])
 
-def rafraichit(image):
+def rafraichit(image, zone=None):
     """
        Cette fonction est utilisée pour modifier le contenu de la fenêtre
        graphique du jeu.
        Entrées:
          * image: ndarray
            L'image à afficher dans la fenêtre pyplot.
+         * zone: liste (optionnelle)
+           Le rectangle [i_min, i_max, j_min, j_max] de l'image hors duquel elle
+           est identique à la dernière image affichée sans zone, par exemple
+           une image du plateau sur laquelle ont été dessinés des cadres. Une
+           zone vide signifie que l'image est identique à cette dernière image.
 
        Notes:
          Une image est un tableau numpy de dimensions (largeur, hauteur, 3) car
@@ -77,10 +576,69 @@ def rafraichit(image):
          Cette fonction modifie le contenu du composant graphique global IMG qui
          est l'objet pyplot correspondant à une image donnée sous la forme d'un
          tableau.
+         Si la fenêtre le permet, seuls l'image et les messages sont redessinés
+         par dessus le fond mémorisé de la figure, et seule la partie modifiée
+         de la fenêtre est transmise à l'écran (blitting). Sinon toute la
+         figure est redessinée. Sans zone, toute l'image est transmise à
+         l'écran.
     """
-    global IMG
-    IMG.set_data(image)
-    IMG.axes.figure.canvas.draw()
+    global IMG, IMAGE_AFFICHEE, ZONE_AFFICHEE
+    canvas = IMG.axes.figure.canvas
+    if not canvas.supports_blit or FOND_FIGURE is None:
+        IMG.set_data(image)
+        canvas.draw()
+        return
+    # Zone de l'image modifiée depuis le dernier rafraîchissement: la zone
+    # donnée et la zone précédemment modifiée. None si elle est inconnue, ou
+    # si un nouveau message doit être affiché.
+    anciens_messages = [m[0] for m in MESSAGES_AFFICHES]
+    nouveau_message = False
+    for message in FIG.texts:
+        nouveau_message = nouveau_message or message not in anciens_messages
+    if zone is None or ZONE_AFFICHEE is None or nouveau_message:
+        zone_modifiee = None
+    else:
+        zone_modifiee = reunis_zones(zone, ZONE_AFFICHEE)
+    if zone is None:
+        ZONE_AFFICHEE = []
+    else:
+        ZONE_AFFICHEE = zone
+    # Recopie de la zone modifiée dans l'image affichée. Après une recopie
+    # complète, l'image affichée est le tableau de l'objet pyplot lui-même, que
+    # set_data() recopie: les recopies partielles y sont faites directement.
+    if zone_modifiee is None or IMAGE_AFFICHEE is None or IMAGE_AFFICHEE.shape[:2] != image.shape[:2]:
+        zone_modifiee = None
+        image_rgba = np.full((image.shape[0], image.shape[1], 4), BLANC, image.dtype)
+        image_rgba[:, :, :3] = image
+        IMG.set_data(image_rgba)
+        IMAGE_AFFICHEE = IMG.get_array()
+    elif len(zone_modifiee) > 0:
+        i_min, i_max, j_min, j_max = zone_modifiee
+        IMAGE_AFFICHEE[i_min:i_max, j_min:j_max, :3] = image[i_min:i_max, j_min:j_max]
+        IMG.stale = True
+    # Image entièrement modifiée: tout est redessiné sur le fond de la figure
+    if zone_modifiee is None:
+        canvas.restore_region(FOND_FIGURE)
+        dessine_elements_animes()
+        canvas.blit(FIG.bbox)
+        canvas.flush_events()
+        return
+    # Sinon seul le rectangle de la fenêtre couvrant la zone modifiée et les
+    # messages disparus est redessiné puis transmis à l'écran. L'image du
+    # plateau étant opaque, elle recouvre entièrement l'ancien contenu de ce
+    # rectangle.
+    cadres = []
+    if len(zone_modifiee) > 0:
+        cadres.append(convertis_zone_vers_cadre(zone_modifiee))
+    for message, cadre_message in MESSAGES_AFFICHES:
+        if message not in FIG.texts:
+            cadres.append(cadre_message)
+    if len(cadres) == 0:
+        return
+    cadre = Bbox.union(cadres)
+    dessine_elements_animes(cadre)
+    canvas.blit(cadre)
+    canvas.flush_events()
 
 def attend_clic():
     """
@@ -135,4 +693,5 @@ def cree_texte(texte, couleur):
     couleur_claire = [0.5 + 0.5 * i for i in couleur_foncee]
     # On positionne le texte
     return(FIG.text(0.5, 0.6, texte, horizontalalignment='center', \
-                    verticalalignment='center', color=couleur_foncee, size=24, transform=AX.transAxes, bbox=dict(boxstyle="round", ec=couleur, fc=couleur_claire)))
+                    verticalalignment='center', color=couleur_foncee, size=24, transform=AX.transAxes, bbox=dict(boxstyle="round", ec=couleur, fc=couleur_claire), \
+                    animated=FIG.canvas.supports_blit))
@@ -2,9 +2,16 @@
     Ce fichier regroupe les structures et les services associés
     à la création et aux manipulations d'une grenouille
 """
+# Modules externes
+import numpy as np
+
 # Modules internes
 import carte
 import graphique
+import journal
+
+# Nombre de niveaux de priorité d'une grenouille (cf cree())
+NOMBRE_PRIORITES = 3
 
 def cree(identifiant, statut, priorite):
     """
@@ -103,6 +110,8 @@ def modifie_priorite(grenouille, priorite):
         * 2 si la grenouille doit être sélectionnée de manière prioritaire
       La fonction ne renvoie rien, la grenouille passée en argument est modifiée.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(grenouille, 2)
     grenouille[2] = priorite
 
 def renvoie_identifiant(grenouille):
@@ -153,6 +162,45 @@ def dessine(grenouille, position, est_vase_visible, i_base, j_base, image_platea
            * 3 pour une grenouille décalée sur la droite aux 3/4 de la dalle
          La fonction ne renvoie rien, l'image passée en argument est modifiée
     """
+    if est_reine(grenouille):
+        sprite = graphique.SPRITES_REINES[renvoie_identifiant(grenouille)]
+    else:
+        sprite = graphique.SPRITES_SERVANTES[renvoie_identifiant(grenouille)]
+    # Si la grenouille est dans la vase il faut
+    # l'afficher couchée
+    if renvoie_priorite(grenouille) == 0 and est_vase_visible:
+        image, masque = sprite[2:]
+    else:
+        image, masque = sprite[:2]
+    i_min, i_max, j_min, j_max = renvoie_zone(grenouille, position, i_base, j_base)
+    # On n'affiche que les pixels qui ne sont pas blancs, dont le masque est
+    # précalculé dans l'atlas des sprites (cf graphique.cree_sprite())
+    np.copyto(image_plateau[i_min:i_max, j_min:j_max], image, where=masque)
+
+def renvoie_zone(grenouille, position, i_base, j_base):
+    """
+       Renvoie la zone de l'image du plateau occupée par la grenouille dessinée
+       à la position donnée
+       Entrées:
+         * grenouille: liste
+           La grenouille dessinée
+         * position: entier
+           La position de la grenouille dans sa dalle (cf dessine())
+         * i_base: entier
+           Le numéro de ligne du coin supérieur gauche de l'image de la carte
+           dans le tableau numpy représentant le plateau de jeu
+         * j_base: entier
+           Le numéro de colonne du coin supérieur gauche de l'image de la carte
+           dans le tableau numpy représentant le plateau de jeu
+       Sorties:
+         * zone: liste
+           Le rectangle [i_min, i_max, j_min, j_max] couvert par l'image de la
+           grenouille dessinée par dessine()
+
+       Notes:
+         L'image d'une grenouille couchée a les mêmes dimensions que celle d'une
+         grenouille en position normale.
+    """
     if est_reine(grenouille):
         image = graphique.IMAGES_REINES[renvoie_identifiant(grenouille)]
     else:
@@ -163,15 +211,4 @@ def dessine(grenouille, position, est_vase_visible, i_base, j_base, image_platea
     hauteur_carte = graphique.IMAGES_FACES[0].shape[1]
     decalage_i = i_base + largeur_carte // 2 - largeur // 2
     decalage_j = j_base + (position * hauteur_carte) // 4 - hauteur // 2
-    # On n'affiche que les pixels qui ne sont pas blancs, c'est-à dire
-    # dont la somme des composantes rouge, vert et bleu est strictement inférieure
-    # à 3
-    # Si la grenouille est dans la vase il faut
-    # l'afficher couchée
-    if renvoie_priorite(grenouille) == 0 and est_vase_visible:
-        image = image[::-1, :]
-        masque = image[:,:,0] + image[:,:,1] + image[:,:,2] < 3
-        image_plateau[decalage_i:decalage_i + largeur, decalage_j:decalage_j + hauteur][masque] = image[masque]
-    else:
-        masque = image[:,:,0] + image[:,:,1] + image[:,:,2] < 3
-        image_plateau[decalage_i:decalage_i + largeur, decalage_j:decalage_j + hauteur][masque] = image[masque]
+    return([decalage_i, decalage_i + largeur, decalage_j, decalage_j + hauteur])
@@ -2,14 +2,11 @@
     Ce fichier regroupe les fonctions implémentant les interactions des joueurs
     avec le jeu
 """
-# Modules externes
-import numpy as np
-
 # Modules du jeu
 import carte
+import coups
 import dalle
 import graphique
-import grenouille
 import joueur
 import plateau
 
@@ -67,7 +64,8 @@ def affiche_message(plateau_croa, joueur_actif, texte):
     graphique.rafraichit(graphique.IMAGE_PLATEAU)
     graphique.attend_clic()
     message.remove()
-    graphique.rafraichit(graphique.IMAGE_PLATEAU)
+    # Seul le message a disparu
+    graphique.rafraichit(graphique.IMAGE_PLATEAU, [])
 
 def selectionne_dalle(numeros_dalles_valides, liste_dalles, joueur_actif):
     """
@@ -89,12 +87,18 @@ def selectionne_dalle(numeros_dalles_valides, liste_dalles, joueur_actif):
          chacune de ces dalles.
          Après chaque clic souris, il faut vérifier que le curseur était bien sur
          une dalle.
+         Seule la zone couvrant les dalles encadrées est rafraîchie: l'image
+         graphique.IMAGE_PLATEAU doit donc être identique à la dernière image
+         affichée en dehors de ces dalles.
+         Les cadres sont dessinés en une seule opération directement dans
+         graphique.IMAGE_PLATEAU, dont les pixels recouverts sont sauvegardés
+         puis restaurés après la sélection: l'image n'est pas recopiée. Les
+         cadres restent affichés jusqu'au prochain rafraîchissement.
     """
-    image_plateau_choix = np.copy(graphique.IMAGE_PLATEAU)
-    for numero in numeros_dalles_valides:
-      i_base, j_base = plateau.convertis_numero_dalle_vers_coordonnees(numero)
-      dalle.encadre(liste_dalles[numero], joueur_actif, i_base, j_base, image_plateau_choix)
-    graphique.rafraichit(image_plateau_choix)
+    marque = len(graphique.ZONES_SAUVEGARDEES)
+    positions = [plateau.convertis_numero_dalle_vers_coordonnees(numero) for numero in numeros_dalles_valides]
+    zone = dalle.encadre_dalles(positions, joueur_actif, graphique.IMAGE_PLATEAU)
+    graphique.rafraichit(graphique.IMAGE_PLATEAU, zone)
     selection_invalide = True
     while selection_invalide:
       coordonnees = graphique.attend_clic()
@@ -105,6 +109,8 @@ def selectionne_dalle(numeros_dalles_valides, liste_dalles, joueur_actif):
           if numero == i:
             selection_invalide = False
             break
+    # Effacement des cadres de l'image du plateau
+    graphique.restaure_zones(marque)
     return(numero)
 
 
@@ -122,15 +128,12 @@ def selectionne_dalle_depart(plateau_croa, joueur_actif):
            Le numéro de la dalle sélectionnée
 
        Notes:
-         Cette fonction construit la liste des dalles de départ valides en
-         s'appuyant sur dalle.est_valide_depart() puis s'appuie sur la fonction
+         Cette fonction obtient la liste des dalles de départ valides de
+         coups.renvoie_numeros_dalles_depart() puis s'appuie sur la fonction
          selectionne_dalle() pour la sélection proprement dite.
     """
-    numeros_dalles_valides= []
+    numeros_dalles_valides = coups.renvoie_numeros_dalles_depart(plateau_croa, joueur_actif)
     liste_dalles = plateau.renvoie_liste_dalles(plateau_croa)
-    for i in range(len(liste_dalles)):
-      if dalle.est_valide_depart(liste_dalles[i], joueur_actif):
-        numeros_dalles_valides.append(i)
     return(selectionne_dalle(numeros_dalles_valides, liste_dalles, joueur_actif))
 
 def choisis(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, transparent):
@@ -165,19 +168,24 @@ def choisis(plateau_croa, joueur_actif, texte, dalle_gauche, dalle_droite, trans
          le joueur est arrivé, rendant la raison du choix peu compréhensible.
     """
     # On rafraichit l'affichage du plateau
+    # L'image renvoyée par plateau.dessine() ne doit pas être modifiée: les
+    # zones recouvertes par les dalles du choix sont sauvegardées puis
+    # restaurées une fois le choix fait
     graphique.IMAGE_PLATEAU = plateau.dessine(plateau_croa)
-    image_plateau_copie = np.copy(graphique.IMAGE_PLATEAU)
+    marque = len(graphique.ZONES_SAUVEGARDEES)
     liste_dalles = plateau.renvoie_liste_dalles(plateau_croa)
     numeros_dalles_valides=[35, 36]
     message = cree_message(joueur_actif, texte)
+    graphique.rafraichit(graphique.IMAGE_PLATEAU)
     i, j = plateau.convertis_numero_dalle_vers_coordonnees(numeros_dalles_valides[0])
+    graphique.sauvegarde_zone(graphique.IMAGE_PLATEAU, dalle.renvoie_zone_cadre(i, j))
     dalle.dessine(dalle_gauche, transparent, i, j, graphique.IMAGE_PLATEAU)
     i, j = plateau.convertis_numero_dalle_vers_coordonnees(numeros_dalles_valides[1])
+    graphique.sauvegarde_zone(graphique.IMAGE_PLATEAU, dalle.renvoie_zone_cadre(i, j))
     dalle.dessine(dalle_droite,transparent, i, j, graphique.IMAGE_PLATEAU)
-    graphique.rafraichit(image_plateau_copie)
     choix = selectionne_dalle(numeros_dalles_valides, liste_dalles,joueur_actif )== numeros_dalles_valides[0]
     message.remove()
-    graphique.IMAGE_PLATEAU = image_plateau_copie
+    graphique.restaure_zones(marque)
     graphique.rafraichit(graphique.IMAGE_PLATEAU)
     return(choix)
 
@@ -213,55 +221,21 @@ def choisis_grenouille(plateau_croa, joueur_actif):
              adverse)
            * 1 reine 1 servante (idem cas précédent)
          S'il n'y a qu'une grenouille sur la dalle c'est la bonne, pas de choix
-         à faire!
+         à faire! Les cas où le joueur a le choix sont donnés par
+         coups.renvoie_choix_grenouilles().
+         La grenouille choisie est retirée de la dalle de départ par
+         plateau.retire_grenouille_jouee(), qui signale la dalle comme modifiée
+         au plateau.
     """
-    numero_dalle_choisie= selectionne_dalle_depart(plateau_croa, joueur_actif)
+    numero_dalle_choisie = selectionne_dalle_depart(plateau_croa, joueur_actif)
     dalle_depart = plateau.renvoie_dalle(plateau_croa, numero_dalle_choisie)
-    grenouilles= dalle.renvoie_liste_grenouilles(dalle_depart)
-    #Si il n'y a qu'une grenouille sur la dalle:
-    if len(grenouilles) == 1:
-      choix_reine = grenouille.est_reine(grenouilles[0])
-      dalle.modifie_liste_grenouilles(dalle_depart, [])
-      return(numero_dalle_choisie, choix_reine)
-    #Sinon il y en a deux, laquelle prendre?
-    identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
-    grenouille_0_active = grenouille.renvoie_identifiant(grenouilles[0]) == identifiant_joueur_actif
-    grenouille_1_active = grenouille.renvoie_identifiant(grenouilles[1]) == identifiant_joueur_actif
-    #Est-ce que les deux grenouilles m'appartiennent?
-    #Cas avec 2 grenouilles de team différentes
-    #Quand deux grenouilles de camps différents sont sur la mm case, ce sont obligatoirement deux servantes.
-    if not grenouille_1_active:
-      choix_reine = False
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[1]])
-      return(numero_dalle_choisie, choix_reine)
-    if not grenouille_0_active:
-      choix_reine = False
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[0]])
-      return(numero_dalle_choisie, choix_reine)
-    #Cas de deux grenouilles de même famille:
-    grenouille.modifie_priorite(grenouilles[0], 1)
-    grenouille.modifie_priorite(grenouilles[1], 1)
-    #Si les deux grenouilles sont des servantes, on laisse la première sur la dalle et on prend la deuxième.
-    grenouille_0_servante = grenouille.est_servante(grenouilles[0])
-    grenouille_1_servante = grenouille.est_servante(grenouilles[1])
-    if grenouille_0_servante and grenouille_1_servante:
-      choix_reine = False
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[0]])
-      return(numero_dalle_choisie, choix_reine)
-    #Si une des deux grenouilles est la reine, il faut faire le choix: on sélectionne la reine ou la servante?
-    choix_reine = choisis(plateau_croa, joueur_actif, "Voulez-vous prendre la reine?", OUI, NON, True)
-    #Si la grenouille 1 est reine et la grenouille 0 servante:
-    if choix_reine and grenouille_0_servante:
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[0]])
-    #Si la grenouille 0 est reine et la grenouille 1 servante:
-    if choix_reine and grenouille_1_servante:
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[1]])
-    #Si on n'a pas choisi la reine et que grenouille 0 est une servante, c'est quon a pris grenouille 0:
-    if not choix_reine and grenouille_0_servante:
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[1]])
-    #Dernier cas possible:
-    if not choix_reine and grenouille_1_servante:
-      dalle.modifie_liste_grenouilles(dalle_depart, [grenouilles[0]])
+    choix_possibles = coups.renvoie_choix_grenouilles(dalle_depart, joueur_actif)
+    if len(choix_possibles) == 1:
+      choix_reine = choix_possibles[0]
+    #Si la dalle porte la reine et une servante du joueur, il faut faire le choix
+    else:
+      choix_reine = choisis(plateau_croa, joueur_actif, "Voulez-vous prendre la reine?", OUI, NON, True)
+    plateau.retire_grenouille_jouee(plateau_croa, joueur_actif, numero_dalle_choisie, choix_reine)
     return(numero_dalle_choisie, choix_reine)
 
 
@@ -286,43 +260,16 @@ def selectionne_dalle_arrivee(plateau_croa, joueur_actif, numero_dalle_depart, c
          Cette fonction construit la liste des dalles d'arrivée valides et
          s'appuie sur la fonction selectionne_dalle() pour la sélection proprement
          dite.
-         La construction de cette liste est nettement plus complexe que pour le
-         choix de la dalle de départ, car elle dépend de la position de la dalle
-         de départ sur le plateau (dans un coin, sur un bord, dans le plateau),
-         puis du contenu de la dalle (cf dalle.est_valide_arrivee()) et enfin du
-         dernier occupant si aucune autre dalle n'est disponible (cas du roseau,
-         traité comme une succession de mouvements élémentaires)
+         Les dalles candidates sont les voisines de la dalle de départ dont le
+         contenu est valide (cf coups.renvoie_numeros_dalles_arrivee()). La dalle
+         dont le joueur actif est le dernier occupant n'est proposée que si
+         aucune autre dalle n'est disponible (cas du roseau, traité comme une
+         succession de mouvements élémentaires)
     """
-    #On fabrique la liste des dalles candidates:
-    numero_dalles_candidates = []
-    ligne_depart, colonne_depart = plateau.convertis_numero_dalle_vers_indices(numero_dalle_depart)
-    if ligne_depart > 0:
-      if colonne_depart>0:
-        numero_dalles_candidates.append(numero_dalle_depart -9)
-      numero_dalles_candidates.append(numero_dalle_depart -8) # on ajoute les dalles de la ligne au-dessus
-      if colonne_depart <7:
-        numero_dalles_candidates.append(numero_dalle_depart -7)
-    if colonne_depart>0:
-      numero_dalles_candidates.append(numero_dalle_depart -1)
-    if colonne_depart <7:
-      numero_dalles_candidates.append(numero_dalle_depart +1)
-    if ligne_depart <7:
-      if colonne_depart>0:
-        numero_dalles_candidates.append(numero_dalle_depart +7)
-      numero_dalles_candidates.append(numero_dalle_depart +8) # on ajoute les dalles de la ligne au-dessous
-      if colonne_depart <7:
-        numero_dalles_candidates.append(numero_dalle_depart +9)
+    liste_numeros_dalles_valides = coups.renvoie_numeros_dalles_arrivee(plateau_croa, joueur_actif,
+                                                                        numero_dalle_depart,
+                                                                        choix_reine)
     liste_dalles = plateau.renvoie_liste_dalles(plateau_croa)
-    liste_numeros_dalles_valides = []
-    identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
-    for numero in numero_dalles_candidates:
-      if dalle.est_valide_arrivee(liste_dalles[numero], joueur_actif, choix_reine):
-        if dalle.renvoie_dernier_occupant(liste_dalles[numero]) == identifiant_joueur_actif:
-          numero_dalle_reserve = numero
-        else:
-          liste_numeros_dalles_valides.append(numero)
-    if len(liste_numeros_dalles_valides)== 0:
-      liste_numeros_dalles_valides.append(numero_dalle_reserve)
     return(selectionne_dalle(liste_numeros_dalles_valides, liste_dalles, joueur_actif))
 
 
@@ -341,25 +288,22 @@ def definis_joueurs():
     """
     plateau_croa = plateau.cree([])
     graphique.IMAGE_PLATEAU = plateau.dessine(plateau_croa)
+    marque = len(graphique.ZONES_SAUVEGARDEES)
     joueur_actif = joueur.cree("0", 0, "")
     message= cree_message(joueur_actif,"À combien voulez-vous jouer?")
     transparent = False
     numero_dalles_valides = [34, 45, 51]
-    i, j = plateau.convertis_numero_dalle_vers_coordonnees(numero_dalles_valides[0])
-    dalle.dessine(DEUX, transparent, i, j, graphique.IMAGE_PLATEAU)
-    i, j = plateau.convertis_numero_dalle_vers_coordonnees(numero_dalles_valides[1])
-    dalle.dessine(TROIS, transparent, i, j, graphique.IMAGE_PLATEAU)
-    i, j = plateau.convertis_numero_dalle_vers_coordonnees(numero_dalles_valides[2])
-    dalle.dessine(QUATRE, transparent, i, j, graphique.IMAGE_PLATEAU)
+    dalles_choix = [DEUX, TROIS, QUATRE]
+    for k in range(len(numero_dalles_valides)):
+      i, j = plateau.convertis_numero_dalle_vers_coordonnees(numero_dalles_valides[k])
+      graphique.sauvegarde_zone(graphique.IMAGE_PLATEAU, dalle.renvoie_zone_cadre(i, j))
+      dalle.dessine(dalles_choix[k], transparent, i, j, graphique.IMAGE_PLATEAU)
+    graphique.rafraichit(graphique.IMAGE_PLATEAU)
     liste_dalles= plateau.renvoie_liste_dalles(plateau_croa)
     choix= selectionne_dalle(numero_dalles_valides, liste_dalles, joueur_actif)
     message.remove()
-    if choix == numero_dalles_valides[0]:
-      joueurs= [joueur.cree("Joueur 1", 0, "NO"), joueur.cree("Joueur 2", 1, "SE")]
-    if choix == numero_dalles_valides[1]:
-      joueurs= [joueur.cree("Joueur 1", 0, "SO"), joueur.cree("Joueur 2", 1, "E"), joueur.cree("Joueur 3", 2, "NO")]
-    if choix == numero_dalles_valides[2]:
-      joueurs= [joueur.cree("Joueur 1", 0, "NE"), joueur.cree("Joueur 2", 1, "SE"), joueur.cree("Joueur 3", 2, "SO"), joueur.cree("Joueur 4", 3, "NO")]
+    graphique.restaure_zones(marque)
+    joueurs= joueur.cree_joueurs(numero_dalles_valides.index(choix) + 2)
     return(joueurs)
 
 
@@ -0,0 +1,377 @@
+"""
+    Ce fichier regroupe les structures et les services associés à la
+    recherche arborescente Monte-Carlo à ensembles d'information (ISMCTS):
+    une stratégie (cf strategie.py) qui évalue les coups autorisés par des
+    parties simulées au hasard jusqu'à leur fin.
+
+    Les faces des cartes face cachée sont inconnues de tous les joueurs: à
+    chaque itération, la recherche tire une donne compatible avec ce que les
+    joueurs voient (cf determinise()), puis descend dans l'arbre en ne
+    considérant que les coups autorisés dans cette donne. Tous les joueurs
+    voyant la même chose, un ensemble d'information est simplement l'état du
+    jeu privé des faces cachées: les noeuds de l'arbre sont repérés par son
+    empreinte (cf renvoie_empreinte_observable()) et rangés dans une table de
+    transpositions de taille fixe (cf transpositions.py). L'arbre est conservé
+    d'un coup à l'autre, la recherche suivante repartant des statistiques déjà
+    accumulées pour le nouvel état.
+"""
+# Modules externes
+import multiprocessing
+import time
+import numpy as np
+
+# Modules internes
+import carte
+import coups
+import dalle
+import decideur
+import joueur
+import plateau
+import regles
+import transpositions
+import zobrist
+
+# Constante d'exploration de la formule de sélection (cf selectionne()), les
+# gains d'une partie simulée étant compris entre 0 et 1
+EXPLORATION = 0.7
+# Durée de réflexion par défaut d'un coup, en secondes
+DUREE_COUP = 1.0
+# Nombre maximal de tours d'une partie simulée, au-delà duquel la partie est
+# arrêtée et comptée comme un partage entre les joueurs encore en jeu
+PROFONDEUR_SIMULATION_MAX = 200
+# Logarithme en base 2 du nombre d'entrées de la table des noeuds de l'arbre
+TAILLE_TABLE_LOG2 = 16
+
+# Indices des champs d'une recherche (cf cree_recherche())
+TABLE      = 0
+GENERATEUR = 1
+DECIDEUR   = 2
+PROCESSUS  = 3
+
+# Indices des champs d'une arête de l'arbre: statistiques d'un coup joué
+# depuis un noeud
+VISITES        = 0
+GAINS          = 1
+DISPONIBILITES = 2
+
+def cree_recherche(graine=None):
+    """
+       Crée une recherche vide.
+       Entrées:
+         * graine: entier
+           La graine du générateur pseudo-aléatoire de la recherche, tirée au
+           hasard si elle n'est pas fournie
+       Sorties:
+         * recherche: liste
+           Une liste [table, generateur, decideur, processus], table étant la
+           table de transpositions des noeuds de l'arbre indexés par
+           empreinte observable (cf transpositions.cree()), generateur le
+           générateur des donnes et des coups simulés, decideur le décideur
+           aléatoire des parties simulées et processus le groupe de processus
+           auxiliaires, créé à la première recherche parallèle
+
+       Notes:
+         Un noeud est une entrée de la table: sa profondeur est le nombre de
+         passages par le noeud, sa valeur le dictionnaire des arêtes
+         [visites, gains, disponibilites] indexées par coup (sous forme de
+         tuple), son âge le numéro de la dernière recherche l'ayant visité.
+         Les gains d'une arête sont ceux du joueur qui joue le coup, la
+         disponibilité le nombre de passages par le noeud où le coup était
+         autorisé. Un noeud peu visité cède ainsi sa case à un noeud plus
+         visité de la recherche en cours (cf transpositions.enregistre()).
+    """
+    generateur = np.random.RandomState(graine)
+    return([transpositions.cree(TAILLE_TABLE_LOG2), generateur, decideur.cree_aleatoire(generateur.randint(2 ** 31)), None])
+
+def determinise(plateau_croa, generateur):
+    """
+       Tire une donne compatible avec les cartes visibles d'un plateau.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire
+       Sorties:
+         * plateau_determinise: liste
+           Une copie du plateau (cf plateau.copie()) dont les cartes face
+           cachée ont reçu des faces tirées au hasard
+
+       Notes:
+         Les faces encore cachées de chaque dos sont lues dans les compteurs
+         de cartes face cachée du plateau (cf
+         plateau.renvoie_nombres_cartes_cachees()): elles sont réparties au
+         hasard entre les dalles face cachée de ce dos. Seules les dalles face
+         cachée sont retenues, et leurs faces ne sont pas lues.
+    """
+    plateau_determinise = plateau.copie(plateau_croa)
+    dalles_cachees = [[] for dos in range(plateau.NOMBRE_DOS)]
+    liste_dalles = plateau.renvoie_liste_dalles(plateau_determinise)
+    for numero_dalle in range(len(liste_dalles)):
+        c = dalle.renvoie_carte(liste_dalles[numero_dalle])
+        if not carte.renvoie_face_visible(c):
+            dalles_cachees[carte.renvoie_dos(c)].append(numero_dalle)
+    for dos in range(plateau.NOMBRE_DOS):
+        if len(dalles_cachees[dos]) == 0:
+            continue
+        # La liste des faces est construite avant toute modification: les
+        # compteurs sont mis à jour à chaque carte remplacée
+        nombres_cartes = plateau.renvoie_nombres_cartes_cachees(plateau_determinise, dos)
+        faces = [face for face in range(len(nombres_cartes)) for i in range(nombres_cartes[face])]
+        generateur.shuffle(faces)
+        for numero_dalle, face in zip(dalles_cachees[dos], faces):
+            dalle.modifie_carte(liste_dalles[numero_dalle], carte.cree(face, dos))
+            plateau.actualise_index(plateau_determinise, numero_dalle)
+    return(plateau_determinise)
+
+def renvoie_empreinte_observable(plateau_croa, joueur_actif):
+    """
+       Renvoie l'empreinte de l'ensemble d'information d'un état du jeu
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+       Sorties:
+         * empreinte: entier
+           L'empreinte de Zobrist de l'état (cf plateau.renvoie_empreinte())
+           dont sont retirées les faces des cartes face cachée: deux donnes
+           d'un même état ont la même empreinte observable
+    """
+    empreinte = plateau.renvoie_empreinte(plateau_croa, joueur_actif)
+    liste_dalles = plateau.renvoie_liste_dalles(plateau_croa)
+    for numero_dalle in range(len(liste_dalles)):
+        c = dalle.renvoie_carte(liste_dalles[numero_dalle])
+        if not carte.renvoie_face_visible(c):
+            empreinte ^= zobrist.FACES[numero_dalle][carte.renvoie_face(c)]
+    return(empreinte)
+
+def selectionne(aretes, liste_coups, generateur):
+    """
+       Choisit le coup joué depuis un noeud de l'arbre.
+       Entrées:
+         * aretes: dictionnaire
+           Les arêtes du noeud (cf cree_recherche())
+         * liste_coups: liste
+           Les coups autorisés dans la donne courante
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire
+       Sorties:
+         * coup: liste
+           Le coup choisi
+         * arete: liste
+           Son arête, créée si le coup n'avait jamais été essayé
+
+       Notes:
+         Les coups jamais essayés sont choisis en premier, au hasard. Sinon,
+         le coup choisi maximise
+           gains / visites + EXPLORATION * sqrt(ln(disponibilites) / visites)
+         La disponibilité de chaque coup autorisé est incrémentée.
+    """
+    non_essayes = []
+    for coup in liste_coups:
+        arete = aretes.get(tuple(coup))
+        if arete is None:
+            non_essayes.append(coup)
+        else:
+            arete[DISPONIBILITES] += 1
+    if len(non_essayes) > 0:
+        coup = non_essayes[generateur.randint(len(non_essayes))]
+        arete = [0, 0.0, 1]
+        aretes[tuple(coup)] = arete
+        return(coup, arete)
+    meilleure_valeur = -1.0
+    for c in liste_coups:
+        a = aretes[tuple(c)]
+        valeur = a[GAINS] / a[VISITES] + EXPLORATION * np.sqrt(np.log(a[DISPONIBILITES]) / a[VISITES])
+        if valeur > meilleure_valeur:
+            meilleure_valeur = valeur
+            coup = c
+            arete = a
+    return(coup, arete)
+
+def renvoie_gains(plateau_croa):
+    """
+       Renvoie les gains des joueurs à la fin d'une partie simulée
+       Entrées:
+         * plateau_croa: liste
+           Le plateau en fin de partie simulée
+       Sorties:
+         * gains: liste
+           La liste, indexée par identifiant de joueur, des gains: 1 pour le
+           vainqueur, un partage égal entre les joueurs encore en jeu si la
+           partie n'est pas terminée, 0 pour les autres
+    """
+    gains = [0.0] * plateau.NOMBRE_JOUEURS_MAX
+    liste_joueurs = plateau.renvoie_liste_joueurs(plateau_croa)
+    for j in liste_joueurs:
+        gains[joueur.renvoie_identifiant(j)] = 1.0 / len(liste_joueurs)
+    return(gains)
+
+def itere(recherche, plateau_croa, identifiant):
+    """
+       Effectue une itération de la recherche: tirage d'une donne, descente
+       dans l'arbre, ajout d'une arête, partie simulée au hasard et
+       rétropropagation des gains.
+       Entrées:
+         * recherche: liste
+           La recherche (cf cree_recherche())
+         * plateau_croa: liste
+           Le plateau de la racine, qui n'est pas modifié
+         * identifiant: entier
+           L'identifiant du joueur actif à la racine
+
+       Notes:
+         La boucle de jeu est celle de simule.joue_partie(). La descente
+         s'arrête à la première arête ajoutée, en revenant sur un noeud déjà
+         traversé pendant l'itération ou sur un nouveau noeud qui n'a pas de
+         place dans la table; la partie est ensuite jouée au hasard.
+    """
+    table = recherche[TABLE]
+    generateur = recherche[GENERATEUR]
+    plateau_simule = determinise(plateau_croa, generateur)
+    joueur_actif = plateau.renvoie_joueur(plateau_simule, identifiant)
+    chemin = []
+    empreintes_traversees = []
+    dans_arbre = True
+    nombre_tours = 0
+    while len(plateau.renvoie_liste_joueurs(plateau_simule)) >= 2 and nombre_tours < PROFONDEUR_SIMULATION_MAX:
+        nombre_tours += 1
+        if joueur.renvoie_priorite_maximale(joueur_actif) == 0:
+            plateau.reveille_grenouilles(plateau_simule, joueur_actif)
+            joueur_actif = regles.renvoie_joueur_suivant(plateau_simule, joueur_actif)
+            continue
+        liste_coups = coups.renvoie_coups(plateau_simule, joueur_actif)
+        if len(liste_coups) == 0:
+            break
+        if dans_arbre:
+            empreinte = renvoie_empreinte_observable(plateau_simule, joueur_actif)
+            noeud = transpositions.consulte(table, empreinte)
+            if noeud is None and transpositions.enregistre(table, empreinte, 0, {}, None):
+                noeud = transpositions.consulte(table, empreinte)
+            dans_arbre = noeud is not None and empreinte not in empreintes_traversees
+        if dans_arbre:
+            noeud[transpositions.PROFONDEUR] += 1
+            noeud[transpositions.AGE] = table[1]
+            empreintes_traversees.append(empreinte)
+            coup, arete = selectionne(noeud[transpositions.VALEUR], liste_coups, generateur)
+            chemin.append([arete, joueur.renvoie_identifiant(joueur_actif)])
+            dans_arbre = arete[VISITES] > 0
+        else:
+            coup = liste_coups[generateur.randint(len(liste_coups))]
+        joueur_actif = regles.joue(plateau_simule, joueur_actif, coup, recherche[DECIDEUR])
+    gains = renvoie_gains(plateau_simule)
+    for arete, identifiant_joueur in chemin:
+        arete[VISITES] += 1
+        arete[GAINS] += gains[identifiant_joueur]
+
+def cherche(recherche, plateau_croa, joueur_actif, duree=DUREE_COUP, iterations_max=None):
+    """
+       Effectue une recherche depuis un état du jeu.
+       Entrées:
+         * recherche: liste
+           La recherche (cf cree_recherche())
+         * plateau_croa: liste
+           Le plateau de jeu, qui n'est pas modifié
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+         * duree: flottant
+           La durée de la recherche en secondes, ou None pour ne s'arrêter
+           qu'au nombre maximal d'itérations
+         * iterations_max: entier
+           Le nombre maximal d'itérations, ou None pour ne s'arrêter qu'à la
+           fin de la durée
+       Sorties:
+         * aretes: dictionnaire
+           Les arêtes du noeud de l'état (cf cree_recherche())
+
+       Notes:
+         Au moins une itération est effectuée. Les noeuds des recherches
+         précédentes restent dans la table, mais leurs cases sont reprises en
+         priorité (cf transpositions.nouvelle_recherche()): les sous-arbres
+         encore atteignables depuis le nouvel état sont conservés d'un coup à
+         l'autre tant que la table n'est pas saturée.
+    """
+    table = recherche[TABLE]
+    transpositions.nouvelle_recherche(table)
+    identifiant = joueur.renvoie_identifiant(joueur_actif)
+    fin = time.perf_counter() + (duree if duree is not None else 0)
+    nombre_iterations = 0
+    while nombre_iterations == 0 or \
+          ((iterations_max is None or nombre_iterations < iterations_max) and
+           (duree is None or time.perf_counter() < fin)):
+        itere(recherche, plateau_croa, identifiant)
+        nombre_iterations += 1
+    return(transpositions.consulte(table, renvoie_empreinte_observable(plateau_croa, joueur_actif))[transpositions.VALEUR])
+
+def cherche_lot(arguments):
+    """
+       Effectue une recherche indépendante dans un processus auxiliaire (cf
+       cree_strategie()).
+       Entrées:
+         * arguments: liste
+           Une liste [plateau_croa, identifiant, duree, iterations_max, graine]
+       Sorties:
+         * visites: liste
+           La liste des couples [coup, nombre de visites] des arêtes de la
+           racine
+    """
+    plateau_croa, identifiant, duree, iterations_max, graine = arguments
+    aretes = cherche(cree_recherche(graine), plateau_croa, plateau.renvoie_joueur(plateau_croa, identifiant),
+                     duree, iterations_max)
+    return([[cle, aretes[cle][VISITES]] for cle in aretes])
+
+def cree_strategie(duree=DUREE_COUP, iterations_max=None, graine=None, nombre_processus=1):
+    """
+       Crée une stratégie jouant le coup le plus visité par une recherche
+       ISMCTS.
+       Entrées:
+         * duree: flottant
+           La durée de réflexion par coup en secondes, ou None
+         * iterations_max: entier
+           Le nombre maximal d'itérations par coup (et par processus), ou
+           None. Avec une durée None, la stratégie est déterministe pour une
+           graine donnée.
+         * graine: entier
+           La graine du générateur pseudo-aléatoire de la recherche
+         * nombre_processus: entier
+           Le nombre de processus effectuant les itérations: au-delà de 1,
+           des processus auxiliaires mènent des recherches indépendantes sur
+           le même état (parallélisation à la racine) et leurs visites sont
+           additionnées à celles de la recherche principale
+       Sorties:
+         * strategie: fonction
+           La stratégie (cf strategie.py)
+
+       Notes:
+         La recherche principale conserve son arbre d'un coup à l'autre, pas
+         celles des processus auxiliaires. Ces derniers sont créés au premier
+         coup et conservés jusqu'à la fin du programme; une stratégie
+         utilisée dans un processus auxiliaire (cf simule.simule_en_parallele())
+         doit n'utiliser qu'un processus.
+    """
+    recherche = cree_recherche(graine)
+
+    def strategie_ismcts(plateau_croa, joueur_actif, liste_coups):
+        if len(liste_coups) == 1:
+            return(liste_coups[0])
+        lots = None
+        if nombre_processus > 1:
+            if recherche[PROCESSUS] is None:
+                recherche[PROCESSUS] = multiprocessing.Pool(nombre_processus - 1)
+            identifiant = joueur.renvoie_identifiant(joueur_actif)
+            lots = recherche[PROCESSUS].map_async(cherche_lot, [[plateau_croa, identifiant, duree, iterations_max,
+                                                                 recherche[GENERATEUR].randint(2 ** 31)]
+                                                                for i in range(nombre_processus - 1)])
+        aretes = cherche(recherche, plateau_croa, joueur_actif, duree, iterations_max)
+        visites = {cle: aretes[cle][VISITES] for cle in aretes}
+        if lots is not None:
+            for lot in lots.get():
+                for cle, nombre_visites in lot:
+                    visites[cle] = visites.get(cle, 0) + nombre_visites
+        meilleur_coup = liste_coups[0]
+        for coup in liste_coups:
+            if visites.get(tuple(coup), 0) > visites.get(tuple(meilleur_coup), 0):
+                meilleur_coup = coup
+        return(meilleur_coup)
+
+    return(strategie_ismcts)
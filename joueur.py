@@ -3,21 +3,28 @@
    à la création et à l'évolution d'un joueur
 """
 
+# Modules externes
+import numpy as np
+
 # Modules internes
 import carte
 import graphique
+import journal
+
+# Nombre maximal de joueurs d'une partie, qui dimensionne les tables indexées
+# par identifiant de joueur (cf plateau.py, etat.py, zobrist.py)
+NOMBRE_JOUEURS_MAX = 4
 
 # Couleurs associées aux joueurs
-COULEURS_JOUEURS = [(81/255, 222/255, 255/255), (224/255, 181/255, 208/255), \
-                    (219/255, 145/255, 132/255), (197/255, 224/255, 147/255)]
+COULEURS_JOUEURS = graphique.COULEURS_JOUEURS
 JETONS_MALES = [carte.MALE_BLEU, carte.MALE_JAUNE, carte.MALE_ORANGE, \
                 carte.MALE_ROSE, carte.MALE_VERT, carte.MALE_VIOLET]
 
 # Marge permettant d'espacer les grenouilles en réserve et les jetons mâles
-MARGE = 10
+MARGE = 10 // graphique.REDUCTION
 
 # Demi-largeur de l'inscription Croâ! sur le plateau
-DEMI_CROA = 200
+DEMI_CROA = 200 // graphique.REDUCTION
 
 def cree(nom, identifiant, position_camp):
     """
@@ -48,6 +55,24 @@ def cree(nom, identifiant, position_camp):
     priorite_maximale = 1
     return([nom, nombre_grenouille_reserve, liste_jetons_males, priorite_maximale, identifiant, position_camp])
 
+def cree_joueurs(nombre_joueurs):
+    """
+       Crée la liste des joueurs d'une partie dans leur état initial.
+       Entrées:
+         * nombre_joueurs: entier
+           Le nombre de joueurs de la partie, 2, 3 ou 4
+       Sorties:
+         * joueurs: liste
+           La liste des joueurs, d'identifiants 0 à nombre_joueurs - 1, dont
+           les camps correspondent aux positions initiales des grenouilles
+           (cf plateau.cree())
+    """
+    if nombre_joueurs == 2:
+        return([cree("Joueur 1", 0, "NO"), cree("Joueur 2", 1, "SE")])
+    if nombre_joueurs == 3:
+        return([cree("Joueur 1", 0, "SO"), cree("Joueur 2", 1, "E"), cree("Joueur 3", 2, "NO")])
+    return([cree("Joueur 1", 0, "NE"), cree("Joueur 2", 1, "SE"), cree("Joueur 3", 2, "SO"), cree("Joueur 4", 3, "NO")])
+
 def possede_jeton(joueur, couleur_male):
     """
        Test si le joueur donné possède le jeton mâle de la couleur donnée
@@ -103,6 +128,8 @@ def modifie_nombre_grenouilles_reserve(joueur, nombre_grenouilles_reserve):
        Notes:
          Le joueur est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(joueur, 1)
     joueur[1]= nombre_grenouilles_reserve
 
 def renvoie_liste_jetons(joueur):
@@ -129,6 +156,8 @@ def modifie_liste_jetons(joueur, jetons_male):
        Notes:
          Le joueur est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(joueur, 2)
     joueur[2]= jetons_male
 
 def renvoie_priorite_maximale(joueur):
@@ -155,6 +184,8 @@ def modifie_priorite_maximale(joueur, priorite_maximale):
        Notes:
          Le joueur est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(joueur, 3)
     joueur[3]= priorite_maximale
 
 
@@ -190,6 +221,109 @@ def renvoie_position_camp(joueur):
     """
     return(joueur[5])
 
+def renvoie_placement_servantes(joueur):
+    """
+       Renvoie la position de la première grenouille en réserve du joueur dans
+       l'image du plateau et le déplacement permettant de passer d'une
+       grenouille à la suivante, selon la position du camp du joueur
+       Entrées:
+         * joueur: liste
+           Le joueur à consulter
+       Sorties:
+         * placement: liste
+           Une liste [i_base, j_base, pas_i, pas_j], vide si la position du
+           camp du joueur est inconnue
+    """
+    largeur_fond = graphique.IMAGE_FOND.shape[0]
+    hauteur_fond = graphique.IMAGE_FOND.shape[1]
+    largeur_servante = graphique.IMAGES_SERVANTES[joueur[4]].shape[0]
+    hauteur_servante = graphique.IMAGES_SERVANTES[joueur[4]].shape[1]
+    largeur_carte = graphique.IMAGES_FACES[0].shape[0]
+    if joueur[5] == "NO":
+        return([MARGE, (largeur_carte - largeur_servante)// 2, \
+                hauteur_servante + MARGE, 0])
+    if joueur[5] == "NE":
+        return([MARGE, largeur_fond - (largeur_carte - largeur_servante)// 2, \
+                hauteur_servante + MARGE, 0])
+    if joueur[5] == "SO":
+        return([hauteur_fond - (MARGE + hauteur_servante), \
+                (largeur_carte - largeur_servante)// 2, \
+                -(hauteur_servante + MARGE), 0])
+    if joueur[5] == "SE":
+        return([hauteur_fond - (MARGE + hauteur_servante), \
+                largeur_fond - (largeur_carte - largeur_servante)// 2, \
+                -(hauteur_servante + MARGE), 0])
+    if joueur[5] == "E":
+        return([hauteur_fond//2 - (DEMI_CROA + MARGE + hauteur_servante), \
+                largeur_fond - (largeur_carte - largeur_servante)// 2, \
+                -(hauteur_servante + MARGE), 0])
+    return([])
+
+def renvoie_placement_jetons(joueur):
+    """
+       Renvoie la position du premier jeton mâle du joueur dans l'image du
+       plateau et le déplacement permettant de passer d'un jeton au suivant,
+       selon la position du camp du joueur
+       Entrées:
+         * joueur: liste
+           Le joueur à consulter
+       Sorties:
+         * placement: liste
+           Une liste [i_base, j_base, pas_i, pas_j], vide si la position du
+           camp du joueur est inconnue
+    """
+    largeur_fond = graphique.IMAGE_FOND.shape[0]
+    hauteur_fond = graphique.IMAGE_FOND.shape[1]
+    largeur_male = graphique.IMAGES_FACES[0].shape[0]
+    hauteur_male = graphique.IMAGES_FACES[0].shape[1]
+    if joueur[5] == "NO":
+        return([hauteur_male//4, largeur_male, 0, largeur_male//2 + MARGE])
+    if joueur[5] == "NE":
+        return([hauteur_male//4, largeur_fond - (3*largeur_male //2), \
+                0, -(largeur_male//2 + MARGE)])
+    if joueur[5] == "SO":
+        return([hauteur_fond - (3*hauteur_male//4), largeur_male, \
+                0, largeur_male//2 + MARGE])
+    if joueur[5] == "SE":
+        return([hauteur_fond - (3*hauteur_male//4), \
+                largeur_fond - (3*largeur_male //2), \
+                0, -(largeur_male//2 + MARGE)])
+    if joueur[5] == "E":
+        return([hauteur_fond//2 + DEMI_CROA + MARGE, \
+                largeur_fond - (3*largeur_male //4), \
+                hauteur_male//2 + MARGE, 0])
+    return([])
+
+def renvoie_zones(joueur):
+    """
+       Renvoie les zones de l'image du plateau occupées par les grenouilles en
+       réserve et les jetons du joueur
+       Entrées:
+         * joueur: liste
+           Le joueur à consulter
+       Sorties:
+         * zones: liste
+           Une liste de rectangles [i_min, i_max, j_min, j_max] de l'image du
+           plateau
+
+       Notes:
+         Ces zones permettent d'effacer la réserve du joueur sans redessiner
+         tout le plateau.
+    """
+    zones = []
+    image_servante = graphique.IMAGES_SERVANTES[joueur[4]]
+    image_male = graphique.VIGNETTES_JETONS[joueur[4]][0]
+    for nombre, placement, image in \
+        [[joueur[1], renvoie_placement_servantes(joueur), image_servante], \
+         [len(joueur[2]), renvoie_placement_jetons(joueur), image_male]]:
+        if nombre > 0 and len(placement) > 0:
+            i_base, j_base, pas_i, pas_j = placement
+            i_fin = i_base + (nombre - 1) * pas_i
+            j_fin = j_base + (nombre - 1) * pas_j
+            zones.append([min(i_base, i_fin), max(i_base, i_fin) + image.shape[0], \
+                          min(j_base, j_fin), max(j_base, j_fin) + image.shape[1]])
+    return(zones)
+
 def dessine(joueur, image_plateau):
     """
        Modifie l'image du plateau pour y dessiner les jetons et les grenouilles
@@ -203,112 +337,26 @@ def dessine(joueur, image_plateau):
        Notes:
          Le paramètre image_plateau est modifié à la sortie de la fonction.
     """
-    largeur_fond= graphique.IMAGE_FOND.shape[0]
-    hauteur_fond= graphique.IMAGE_FOND.shape[1]
-
     #affichage des servantes:
-    if joueur[1]>0:
-      image_servante = graphique.IMAGES_SERVANTES[joueur[4]]
-      masque = image_servante[:, :, 0] + image_servante[:, :, 1] + image_servante[:, :, 2] < 3.0
+    placement = renvoie_placement_servantes(joueur)
+    if joueur[1]>0 and len(placement) > 0:
+      image_servante, masque = graphique.SPRITES_SERVANTES[joueur[4]][:2]
       largeur_servante = image_servante.shape[0]
       hauteur_servante = image_servante.shape[1]
-      largeur_carte = graphique.IMAGES_FACES[0].shape[0]
-      hauteur_carte = graphique.IMAGES_FACES[0].shape[1]
-
-      if joueur[5]== "NO":
-        i_base = MARGE
-        j_base = (largeur_carte - largeur_servante)// 2
-        for i in range(joueur[1]):
-          image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante][masque] = image_servante[masque]
-          i_base += hauteur_servante + MARGE
-      if joueur[5]== "NE":
-        i_base = MARGE
-        j_base = largeur_fond - (largeur_carte - largeur_servante)// 2
-        for i in range(joueur[1]):
-          image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante][masque] = image_servante[masque]
-          i_base += hauteur_servante + MARGE
-      if joueur[5]== "SO":
-        i_base = hauteur_fond - (MARGE + hauteur_servante)
-        j_base = (largeur_carte - largeur_servante)// 2
-        for i in range(joueur[1]):
-          image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante][masque] = image_servante[masque]
-          i_base -= hauteur_servante + MARGE
-      if joueur[5]== "SE":
-        i_base = hauteur_fond - (MARGE + hauteur_servante)
-        j_base = largeur_fond - (largeur_carte - largeur_servante)// 2
-        for i in range(joueur[1]):
-          image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante][masque] = image_servante[masque]
-          i_base -= hauteur_servante + MARGE
-      if joueur[5]== "E":
-        i_base = hauteur_fond//2 - (DEMI_CROA + MARGE + hauteur_servante)
-        j_base = largeur_fond - (largeur_carte - largeur_servante)// 2
-        for i in range(joueur[1]):
-          image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante][masque] = image_servante[masque]
-          i_base -= hauteur_servante + MARGE
+      i_base, j_base, pas_i, pas_j = placement
+      for i in range(joueur[1]):
+        np.copyto(image_plateau[i_base: i_base + largeur_servante , j_base : j_base + hauteur_servante], image_servante, where=masque)
+        i_base += pas_i
+        j_base += pas_j
 
     #affichage des jetons:
-    if len(joueur[2])>0:
+    placement = renvoie_placement_jetons(joueur)
+    if len(joueur[2])>0 and len(placement) > 0:
       largeur_male = graphique.IMAGES_FACES[0].shape[0]
       hauteur_male = graphique.IMAGES_FACES[0].shape[1]
-      couleur = COULEURS_JOUEURS[joueur[4]]
-      if joueur[5] == "NO":
-        i_base = hauteur_male//4
-        j_base = largeur_male
-        for i in range(len(joueur[2])):
-          image_male= graphique.IMAGES_FACES[joueur[2][i]]
-          vignette = image_male[::2, ::2]
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignette
-          masque = vignette[:, :, 0] + vignette[:, :, 1] + vignette[:, :, 2] == 3
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2][masque] = couleur
-          j_base += largeur_male//2 + MARGE
-
-      if joueur[5] == "NE":
-        i_base = hauteur_male//4
-        j_base = largeur_fond - (3*largeur_male //2)
-        for i in range(len(joueur[2])):
-          image_male= graphique.IMAGES_FACES[joueur[2][i]]
-          vignette = image_male[::2, ::2]
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignette
-          masque = vignette[:, :, 0] + vignette[:, :, 1] + vignette[:, :, 2] == 3
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2][masque] = couleur
-          j_base -= largeur_male//2 + MARGE
-
-      if joueur[5] == "SO":
-        i_base = hauteur_fond - (3*hauteur_male//4)
-        j_base = largeur_male
-        for i in range(len(joueur[2])):
-          image_male= graphique.IMAGES_FACES[joueur[2][i]]
-          vignette = image_male[::2, ::2]
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignette
-          masque = vignette[:, :, 0] + vignette[:, :, 1] + vignette[:, :, 2] == 3
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2][masque] = couleur
-          j_base += largeur_male//2 + MARGE
-
-      if joueur[5] == "SE":
-        i_base = hauteur_fond - (3*hauteur_male//4)
-        j_base = largeur_fond - (3*largeur_male //2)
-        for i in range(len(joueur[2])):
-          image_male= graphique.IMAGES_FACES[joueur[2][i]]
-          vignette = image_male[::2, ::2]
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignette
-          masque = vignette[:, :, 0] + vignette[:, :, 1] + vignette[:, :, 2] == 3
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2][masque] = couleur
-          j_base -= largeur_male//2 + MARGE
-
-      if joueur[5] == "E":
-        i_base = hauteur_fond//2 + DEMI_CROA + MARGE
-        j_base = largeur_fond - (3*largeur_male //4)
-        for i in range(len(joueur[2])):
-          image_male= graphique.IMAGES_FACES[joueur[2][i]]
-          vignette = image_male[::2, ::2]
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignette
-          masque = vignette[:, :, 0] + vignette[:, :, 1] + vignette[:, :, 2] == 3
-          image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2][masque] = couleur
-          i_base += hauteur_male//2 + MARGE
-
-
-
-
-
-
-
+      vignettes = graphique.VIGNETTES_JETONS[joueur[4]]
+      i_base, j_base, pas_i, pas_j = placement
+      for i in range(len(joueur[2])):
+        image_plateau[i_base: i_base + largeur_male//2 , j_base : j_base + hauteur_male//2] = vignettes[joueur[2][i]]
+        i_base += pas_i
+        j_base += pas_j
@@ -0,0 +1,92 @@
+"""
+    Ce fichier regroupe les services associés au journal des modifications:
+    lorsqu'il est ouvert, chaque modification élémentaire d'une structure du
+    jeu (carte, dalle, grenouille, joueur, plateau) y est enregistrée, ce qui
+    permet d'annuler exactement un ou plusieurs coups sans copier le plateau.
+
+    Utilisation typique pour essayer un coup puis revenir en arrière:
+        journal.ouvre()
+        marque = journal.renvoie_marque()
+        joueur_suivant = regles.joue(plateau_croa, joueur_actif, coup, decideur_croa)
+        ...
+        journal.annule(marque)
+        journal.ferme()
+"""
+
+# Liste des modifications enregistrées, chacune sous la forme
+# [liste, indice, ancienne_valeur], ou None si le journal est fermé
+JOURNAL = None
+
+def ouvre():
+    """
+       Ouvre le journal: les modifications suivantes y sont enregistrées.
+
+       Notes:
+         Ouvrir un journal déjà ouvert ne fait rien, les modifications déjà
+         enregistrées sont conservées.
+    """
+    global JOURNAL
+    if JOURNAL is None:
+        JOURNAL = []
+
+def ferme():
+    """
+       Ferme le journal et oublie les modifications enregistrées, qui ne
+       peuvent plus être annulées.
+    """
+    global JOURNAL
+    JOURNAL = None
+
+def est_ouvert():
+    """
+       Indique si le journal est ouvert
+       Sorties:
+         * statut: booléen
+           Egal à True si les modifications sont enregistrées
+    """
+    return(JOURNAL is not None)
+
+def renvoie_marque():
+    """
+       Renvoie la marque de l'état courant, à passer à annule() pour y revenir
+       Sorties:
+         * marque: entier
+           Le nombre de modifications enregistrées
+    """
+    return(len(JOURNAL))
+
+def enregistre(liste, indice):
+    """
+       Enregistre la valeur courante d'un élément de liste, juste avant sa
+       modification.
+       Entrées:
+         * liste: liste
+           La structure du jeu sur le point d'être modifiée
+         * indice: entier
+           L'indice de l'élément sur le point d'être modifié
+
+       Notes:
+         Les fonctions de modification appellent enregistre() uniquement si le
+         journal est ouvert (cf est_ouvert()). Les listes contenues dans les
+         structures (listes de grenouilles, de jetons...) doivent être
+         remplacées et non modifiées sur place pour que l'annulation soit
+         exacte.
+    """
+    JOURNAL.append([liste, indice, liste[indice]])
+
+def annule(marque):
+    """
+       Annule toutes les modifications enregistrées depuis une marque, de la
+       plus récente à la plus ancienne.
+       Entrées:
+         * marque: entier
+           La marque de l'état à retrouver (cf renvoie_marque())
+
+       Notes:
+         Les drapeaux de modification des dalles du plateau ne sont pas
+         enregistrés: les dalles modifiées puis restaurées restent signalées
+         comme modifiées et seront simplement redessinées.
+    """
+    while len(JOURNAL) > marque:
+        liste, indice, valeur = JOURNAL.pop()
+        liste[indice] = valeur
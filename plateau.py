@@ -6,84 +6,126 @@
 import numpy as np
 
 # Modules internes
+import bitboard
 import carte
 import dalle
 import graphique
 import grenouille
 import joueur
+import journal
+import zobrist
 
 
 # Les dalles du plateau ne commencent pas au bord mais sont
 # décalées de la même valeur en x et y
-DECALAGE = 195
+# Ces distances sont exprimées dans la résolution de rendu, éventuellement
+# réduite (cf graphique.REDUCTION): ce sont alors des réels
+DECALAGE = 195 / graphique.REDUCTION
 # Les coins supérieur gauche des dalles sont distants de leurs
 # voisins horizontaux de (pas, 0) et verticaux de (0, pas)
-PAS = 179
+PAS = 179 / graphique.REDUCTION
 
-def cree(liste_joueurs):
+# Nombre maximal de joueurs et nombre de niveaux de priorité d'une grenouille
+# (cf grenouille.renvoie_priorite()), qui dimensionnent les compteurs de
+# priorités du plateau
+NOMBRE_JOUEURS_MAX = joueur.NOMBRE_JOUEURS_MAX
+NOMBRE_PRIORITES = grenouille.NOMBRE_PRIORITES
+# Nombres d'identifiants de faces et de dos de cartes (cf carte.py), qui
+# dimensionnent les compteurs de cartes face cachée du plateau
+NOMBRE_FACES = carte.NOMBRE_FACES
+NOMBRE_DOS = carte.NOMBRE_DOS
+
+# Image du plateau conservée d'un appel à l'autre de dessine(): seules les
+# dalles modifiées depuis le dernier appel y sont redessinées
+IMAGE_PERSISTANTE = None
+# Couche des cartes: l'image du fond et des cartes du plateau, sans les
+# grenouilles ni les joueurs. Elle n'est modifiée que lorsqu'une carte change
+# (par exemple lorsqu'elle est retournée) et sert à effacer les grenouilles
+# et les joueurs de IMAGE_PERSISTANTE.
+COUCHE_CARTES = None
+# Cartes représentées dans COUCHE_CARTES, indexées par numéro de dalle
+CARTES_DESSINEES = []
+# Zones occupées par les grenouilles dessinées dans IMAGE_PERSISTANTE sur
+# chaque dalle, indexées par numéro de dalle
+GRENOUILLES_DESSINEES = []
+# Plateau actuellement représenté par IMAGE_PERSISTANTE
+PLATEAU_DESSINE = None
+# Etat des joueurs représentés dans IMAGE_PERSISTANTE: une liste de
+# [identifiant, nombre_grenouilles_reserve, liste_jetons, zones]
+JOUEURS_DESSINES = []
+
+# Composition du paquet de cartes: une liste de [face, dos, nombre de cartes]
+# (cf cree_cartes())
+COMPOSITION_PAQUET = [[carte.NENUPHAR   , carte.EAU_PEU_PROFONDE, 6 ],
+                      [carte.NENUPHAR   , carte.EAU_PROFONDE_1  , 4 ],
+                      [carte.NENUPHAR   , carte.EAU_PROFONDE_2  , 4 ],
+                      [carte.ROSEAUX    , carte.EAU_PEU_PROFONDE, 10],
+                      [carte.ROSEAUX    , carte.EAU_PROFONDE_1  , 3 ],
+                      [carte.ROSEAUX    , carte.EAU_PROFONDE_2  , 3 ],
+                      [carte.MOUSTIQUE  , carte.EAU_PEU_PROFONDE, 4 ],
+                      [carte.MOUSTIQUE  , carte.EAU_PROFONDE_1  , 2 ],
+                      [carte.MOUSTIQUE  , carte.EAU_PROFONDE_2  , 2 ],
+                      [carte.MALE_BLEU  , carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_BLEU  , carte.EAU_PROFONDE_1  , 1 ],
+                      [carte.MALE_JAUNE , carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_JAUNE , carte.EAU_PROFONDE_1  , 1 ],
+                      [carte.MALE_ORANGE, carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_ORANGE, carte.EAU_PROFONDE_1  , 1 ],
+                      [carte.MALE_ROSE  , carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_ROSE  , carte.EAU_PROFONDE_2  , 1 ],
+                      [carte.MALE_VERT  , carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_VERT  , carte.EAU_PROFONDE_2  , 1 ],
+                      [carte.MALE_VIOLET, carte.EAU_PEU_PROFONDE, 1 ],
+                      [carte.MALE_VIOLET, carte.EAU_PROFONDE_2  , 1 ],
+                      [carte.VASE       , carte.EAU_PEU_PROFONDE, 4 ],
+                      [carte.BROCHET    , carte.EAU_PROFONDE_1  , 2 ],
+                      [carte.BROCHET    , carte.EAU_PROFONDE_2  , 2 ],
+                      [carte.RONDIN     , carte.EAU_PEU_PROFONDE, 2 ],
+                      [carte.RONDIN     , carte.EAU_PROFONDE_1  , 2 ],
+                      [carte.RONDIN     , carte.EAU_PROFONDE_2  , 2 ]]
+
+def cree_cartes():
+    """
+       Crée les cartes du paquet, face cachée, dans l'ordre de
+       COMPOSITION_PAQUET.
+       Sorties:
+         * liste_cartes: liste
+           La liste des 64 cartes du jeu
+    """
+    liste_cartes = []
+    for face, dos, nombre in COMPOSITION_PAQUET:
+        for i in range(nombre):
+            liste_cartes.append(carte.cree(face, dos))
+    return(liste_cartes)
+
+def cree(liste_joueurs, graine=None):
     """
        Crée la structure de données associée à un plateau dans son
        état initial.
        Entrées:
          * liste_joueurs: liste
            La liste des joueurs initialement dans le jeu.
+         * graine: entier
+           La graine du mélange des dalles, tirée au hasard si elle n'est pas
+           fournie. Une même graine donne toujours le même plateau.
        Sorties:
          * plateau: liste
-           Une liste [liste_joueurs, liste_dalles]
+           Une liste [liste_joueurs, liste_dalles, dalles_modifiees,
+           compteurs_priorites, priorites_dalles, dalles_joueurs,
+           empreinte_dalles, empreintes_dalles, cartes_cachees_dalles,
+           nombres_cartes_cachees, masques, masques_dalles] (cf assemble())
 
        Notes:
          La liste des dalles est construite partiellement à partir de la liste
          des joueurs puisque le nombre de joueurs détermine leur position initiale.
     """
     # Création des cartes
-    liste_cartes = []
-    for i in range(6):
-        liste_cartes.append(carte.cree(carte.NENUPHAR   , carte.EAU_PEU_PROFONDE))
-    for i in range(4):
-        liste_cartes.append(carte.cree(carte.NENUPHAR   , carte.EAU_PROFONDE_1  ))
-    for i in range(4):
-        liste_cartes.append(carte.cree(carte.NENUPHAR   , carte.EAU_PROFONDE_2  ))
-    for i in range(10):
-        liste_cartes.append(carte.cree(carte.ROSEAUX    , carte.EAU_PEU_PROFONDE))
-    for i in range(3):
-        liste_cartes.append(carte.cree(carte.ROSEAUX    , carte.EAU_PROFONDE_1  ))
-    for i in range(3):
-        liste_cartes.append(carte.cree(carte.ROSEAUX    , carte.EAU_PROFONDE_2  ))
-    for i in range(4):
-        liste_cartes.append(carte.cree(carte.MOUSTIQUE  , carte.EAU_PEU_PROFONDE))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.MOUSTIQUE  , carte.EAU_PROFONDE_1  ))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.MOUSTIQUE  , carte.EAU_PROFONDE_2  ))
-    liste_cartes.append(carte.cree(carte.MALE_BLEU  , carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_BLEU  , carte.EAU_PROFONDE_1  ))
-    liste_cartes.append(carte.cree(carte.MALE_JAUNE , carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_JAUNE , carte.EAU_PROFONDE_1  ))
-    liste_cartes.append(carte.cree(carte.MALE_ORANGE, carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_ORANGE, carte.EAU_PROFONDE_1  ))
-    liste_cartes.append(carte.cree(carte.MALE_ROSE  , carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_ROSE  , carte.EAU_PROFONDE_2  ))
-    liste_cartes.append(carte.cree(carte.MALE_VERT  , carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_VERT  , carte.EAU_PROFONDE_2  ))
-    liste_cartes.append(carte.cree(carte.MALE_VIOLET, carte.EAU_PEU_PROFONDE))
-    liste_cartes.append(carte.cree(carte.MALE_VIOLET, carte.EAU_PROFONDE_2  ))
-    for i in range(4):
-        liste_cartes.append(carte.cree(carte.VASE       , carte.EAU_PEU_PROFONDE))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.BROCHET    , carte.EAU_PROFONDE_1  ))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.BROCHET    , carte.EAU_PROFONDE_2  ))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.RONDIN     , carte.EAU_PEU_PROFONDE))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.RONDIN     , carte.EAU_PROFONDE_1  ))
-    for i in range(2):
-        liste_cartes.append(carte.cree(carte.RONDIN     , carte.EAU_PROFONDE_2  ))
+    liste_cartes = cree_cartes()
     # Création des dalles
     liste_dalles = [dalle.cree(c, [], -1) for c in liste_cartes]
     # Mélange des dalles
-    np.random.seed()
-    np.random.shuffle(liste_dalles)
+    # Générateur local: l'état du générateur global de numpy n'est pas modifié
+    np.random.RandomState(graine).shuffle(liste_dalles)
     # Position initiale des grenouilles en fonction du nombre de joueurs
     nombre_joueurs = len(liste_joueurs)
     if nombre_joueurs == 2:
@@ -116,7 +158,327 @@ def cree(liste_joueurs):
         liste_dalles[0][1]  = [grenouille.cree(3, True,  1)]
         liste_dalles[1][1]  = [grenouille.cree(3, False, 1)]
         liste_dalles[8][1]  = [grenouille.cree(3, False, 1)]
-    return([liste_joueurs, liste_dalles])
+    return(assemble(liste_joueurs, liste_dalles))
+
+def assemble(liste_joueurs, liste_dalles):
+    """
+       Crée un plateau à partir de ses joueurs et de ses dalles.
+       Entrées:
+         * liste_joueurs: liste
+           La liste des joueurs en jeu
+         * liste_dalles: liste
+           La liste des dalles du plateau
+       Sorties:
+         * plateau: liste
+           Une liste [liste_joueurs, liste_dalles, dalles_modifiees,
+           compteurs_priorites, priorites_dalles, dalles_joueurs,
+           empreinte_dalles, empreintes_dalles, cartes_cachees_dalles,
+           nombres_cartes_cachees, masques, masques_dalles]
+
+       Notes:
+         La liste dalles_modifiees contient pour chaque dalle un drapeau
+         indiquant si la dalle a été modifiée depuis le dernier appel à
+         dessine(). Toutes les dalles sont initialement à dessiner.
+         La liste compteurs_priorites contient pour chaque identifiant de joueur
+         le nombre de ses grenouilles en jeu de chaque priorité, la liste
+         priorites_dalles contient pour chaque dalle les couples
+         [identifiant, priorité] de ses grenouilles pris en compte dans ces
+         compteurs. La liste dalles_joueurs contient pour chaque identifiant de
+         joueur les numéros des dalles portant au moins une de ses grenouilles.
+         La liste empreintes_dalles contient l'empreinte de Zobrist de chaque
+         dalle (cf zobrist.renvoie_empreinte_dalle()) et l'entier
+         empreinte_dalles leur ou exclusif.
+         La liste nombres_cartes_cachees contient pour chaque dos de carte le
+         nombre de cartes face cachée de chaque face, la liste
+         cartes_cachees_dalles contient pour chaque dalle le code
+         dos * NOMBRE_FACES + face de sa carte prise en compte dans ces
+         compteurs, ou -1 si sa carte est face visible.
+         La liste masques contient les masques de bits du plateau (cf
+         bitboard.cree()), la liste masques_dalles contient pour chaque dalle
+         les indices des masques auxquels elle appartient (cf
+         bitboard.renvoie_indices_masques()).
+         Ces éléments forment l'index du plateau (cf actualise_index()).
+    """
+    plateau = [liste_joueurs, liste_dalles, [True] * len(liste_dalles), [], [], [], 0, [], [], [], [], []]
+    initialise_index(plateau)
+    return(plateau)
+
+def copie(plateau):
+    """
+       Renvoie une copie indépendante d'un plateau, bien plus rapide que
+       copy.deepcopy().
+       Entrées:
+         * plateau: liste
+           Le plateau à copier
+       Sorties:
+         * plateau_copie: liste
+           Un plateau égal au plateau copié, dont les modifications par les
+           fonctions de modification des structures du jeu n'affectent pas
+           l'original (et réciproquement)
+
+       Notes:
+         Seuls les éléments modifiés sur place sont copiés: joueurs, cartes
+         face cachée, grenouilles, dalles et listes du plateau. Les éléments
+         qui ne sont jamais modifiés sur place mais toujours remplacés sont
+         partagés entre les deux plateaux: cartes face visible (une carte
+         retournée ne l'est plus jamais), listes de grenouilles vides, listes
+         de jetons des joueurs, listes de l'index par dalle et par joueur
+         (sauf les compteurs, modifiés sur place).
+         Les joueurs de la copie sont de nouvelles listes: le joueur actif de
+         la copie s'obtient par renvoie_joueur() à partir de son identifiant.
+    """
+    liste_dalles = [[d[0] if d[0][0] else d[0][:],
+                     d[1] and [g[:] for g in d[1]],
+                     d[2]] for d in plateau[1]]
+    return([[j[:] for j in plateau[0]], liste_dalles, plateau[2][:],
+            [compteurs[:] for compteurs in plateau[3]], plateau[4][:], plateau[5][:],
+            plateau[6], plateau[7][:], plateau[8][:], [nombres[:] for nombres in plateau[9]],
+            plateau[10][:], plateau[11][:]])
+
+def initialise_index(plateau):
+    """
+       Calcule l'index du plateau (compteurs de priorités, dalles de chaque
+       joueur, empreintes des dalles, compteurs de cartes face cachée et
+       masques de bits) en parcourant toutes ses dalles.
+       Entrées:
+         * plateau: liste
+           Le plateau à modifier
+
+       Notes:
+         Le plateau est modifié à la sortie de la fonction.
+    """
+    if journal.JOURNAL is not None:
+        for indice in range(3, 12):
+            journal.enregistre(plateau, indice)
+    plateau[3] = [[0] * NOMBRE_PRIORITES for i in range(NOMBRE_JOUEURS_MAX)]
+    plateau[4] = [[] for d in plateau[1]]
+    plateau[5] = [[] for i in range(NOMBRE_JOUEURS_MAX)]
+    plateau[6] = 0
+    plateau[7] = [0] * len(plateau[1])
+    plateau[8] = [-1] * len(plateau[1])
+    plateau[9] = [[0] * NOMBRE_FACES for dos in range(NOMBRE_DOS)]
+    plateau[10] = bitboard.cree()
+    plateau[11] = [[] for d in plateau[1]]
+    for numero_dalle in range(len(plateau[1])):
+        actualise_index(plateau, numero_dalle)
+
+def actualise_index(plateau, numero_dalle):
+    """
+       Met à jour l'index du plateau après une modification de la dalle en
+       position numero_dalle.
+       Entrées:
+         * plateau: liste
+           Le plateau à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle modifiée
+
+       Notes:
+         Les grenouilles de la dalle prises en compte lors de la mise à jour
+         précédente sont décomptées, puis ses grenouilles actuelles sont
+         comptées. La dalle est retirée des dalles des joueurs qui n'y ont plus
+         de grenouille et ajoutée à celles des joueurs qui viennent d'y
+         arriver. L'empreinte de la dalle est recalculée et remplace
+         l'ancienne dans l'empreinte des dalles. Si sa carte vient d'être
+         retournée, elle est décomptée des cartes face cachée. Son bit est
+         mis à jour dans les seuls masques qu'elle quitte ou rejoint. Le coût
+         ne dépend donc que du nombre de grenouilles de la dalle.
+         Les listes de dalles des joueurs sont remplacées et non modifiées sur
+         place, pour que leur modification puisse être enregistrée dans le
+         journal (cf journal.enregistre()).
+         Le plateau est modifié à la sortie de la fonction.
+    """
+    journal_ouvert = journal.JOURNAL is not None
+    compteurs = plateau[3]
+    dalles_joueurs = plateau[5]
+    anciens_identifiants = []
+    for identifiant, priorite in plateau[4][numero_dalle]:
+        if journal_ouvert:
+            journal.enregistre(compteurs[identifiant], priorite)
+        compteurs[identifiant][priorite] -= 1
+        anciens_identifiants.append(identifiant)
+    priorites_dalle = []
+    nouveaux_identifiants = []
+    for g in dalle.renvoie_liste_grenouilles(plateau[1][numero_dalle]):
+        identifiant = grenouille.renvoie_identifiant(g)
+        priorite = grenouille.renvoie_priorite(g)
+        if journal_ouvert:
+            journal.enregistre(compteurs[identifiant], priorite)
+        compteurs[identifiant][priorite] += 1
+        priorites_dalle.append([identifiant, priorite])
+        nouveaux_identifiants.append(identifiant)
+    if journal_ouvert:
+        journal.enregistre(plateau[4], numero_dalle)
+        journal.enregistre(plateau, 6)
+        journal.enregistre(plateau[7], numero_dalle)
+    plateau[4][numero_dalle] = priorites_dalle
+    empreinte_dalle = zobrist.renvoie_empreinte_dalle(numero_dalle, plateau[1][numero_dalle])
+    plateau[6] ^= plateau[7][numero_dalle] ^ empreinte_dalle
+    plateau[7][numero_dalle] = empreinte_dalle
+    carte_dalle = dalle.renvoie_carte(plateau[1][numero_dalle])
+    code_carte = -1
+    if not carte.renvoie_face_visible(carte_dalle):
+        code_carte = carte.renvoie_dos(carte_dalle) * NOMBRE_FACES + carte.renvoie_face(carte_dalle)
+    ancien_code_carte = plateau[8][numero_dalle]
+    if code_carte != ancien_code_carte:
+        nombres_cartes = plateau[9]
+        if journal_ouvert:
+            journal.enregistre(plateau[8], numero_dalle)
+        plateau[8][numero_dalle] = code_carte
+        if ancien_code_carte >= 0:
+            dos, face = divmod(ancien_code_carte, NOMBRE_FACES)
+            if journal_ouvert:
+                journal.enregistre(nombres_cartes[dos], face)
+            nombres_cartes[dos][face] -= 1
+        if code_carte >= 0:
+            dos, face = divmod(code_carte, NOMBRE_FACES)
+            if journal_ouvert:
+                journal.enregistre(nombres_cartes[dos], face)
+            nombres_cartes[dos][face] += 1
+    indices_masques = bitboard.renvoie_indices_masques(plateau[1][numero_dalle])
+    anciens_indices_masques = plateau[11][numero_dalle]
+    if indices_masques != anciens_indices_masques:
+        masques = plateau[10]
+        bit = 1 << numero_dalle
+        for indice in anciens_indices_masques:
+            if indice not in indices_masques:
+                if journal_ouvert:
+                    journal.enregistre(masques, indice)
+                masques[indice] &= ~bit
+        for indice in indices_masques:
+            if indice not in anciens_indices_masques:
+                if journal_ouvert:
+                    journal.enregistre(masques, indice)
+                masques[indice] |= bit
+        if journal_ouvert:
+            journal.enregistre(plateau[11], numero_dalle)
+        plateau[11][numero_dalle] = indices_masques
+    for identifiant in anciens_identifiants:
+        if identifiant not in nouveaux_identifiants and numero_dalle in dalles_joueurs[identifiant]:
+            if journal_ouvert:
+                journal.enregistre(dalles_joueurs, identifiant)
+            dalles_joueurs[identifiant] = [n for n in dalles_joueurs[identifiant] if n != numero_dalle]
+    for identifiant in nouveaux_identifiants:
+        if identifiant not in anciens_identifiants and numero_dalle not in dalles_joueurs[identifiant]:
+            if journal_ouvert:
+                journal.enregistre(dalles_joueurs, identifiant)
+            dalles_joueurs[identifiant] = dalles_joueurs[identifiant] + [numero_dalle]
+
+def renvoie_empreinte(plateau, joueur_actif):
+    """
+       Renvoie l'empreinte de Zobrist de l'état du jeu
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+       Sorties:
+         * empreinte: entier
+           L'empreinte de l'état du jeu: dalles (cartes et leur visibilité,
+           grenouilles, derniers occupants), joueurs en jeu (réserves, jetons,
+           priorités maximales) et joueur actif
+
+       Notes:
+         L'empreinte des dalles est tenue à jour à chaque modification de
+         dalle, celle des joueurs est calculée à la demande: son coût ne dépend
+         que du nombre de joueurs.
+    """
+    empreinte = plateau[6] ^ zobrist.JOUEURS_ACTIFS[joueur.renvoie_identifiant(joueur_actif)]
+    for j in plateau[0]:
+        empreinte ^= zobrist.renvoie_empreinte_joueur(j)
+    return(empreinte)
+
+def renvoie_nombres_cartes_cachees(plateau, dos):
+    """
+       Renvoie le nombre de cartes face cachée d'un dos donné, par face
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+         * dos: entier
+           L'identifiant du dos de carte
+       Sorties:
+         * nombres_cartes: liste
+           La liste, indexée par face, du nombre de cartes face cachée de ce
+           dos sur le plateau. Elle ne doit pas être modifiée.
+
+       Notes:
+         Les compteurs sont tenus à jour à chaque modification de dalle (cf
+         actualise_index()): la lecture ne parcourt pas les dalles.
+    """
+    return(plateau[9][dos])
+
+def renvoie_masques(plateau):
+    """
+       Renvoie les masques de bits du plateau
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+       Sorties:
+         * masques: liste
+           La liste des masques du plateau (cf bitboard.cree())
+
+       Notes:
+         Les masques sont tenus à jour dalle par dalle (cf actualise_index()):
+         la lecture ne parcourt pas les dalles. La liste renvoyée fait partie
+         de l'index du plateau: elle ne doit pas être modifiée.
+    """
+    return(plateau[10])
+
+def renvoie_dalles_joueur(plateau, identifiant):
+    """
+       Renvoie les numéros des dalles portant les grenouilles d'un joueur
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+       Sorties:
+         * numeros_dalles: liste
+           Les numéros des dalles portant au moins une grenouille du joueur,
+           dans un ordre quelconque
+
+       Notes:
+         La liste renvoyée fait partie de l'index du plateau: elle ne doit pas
+         être modifiée. Elle est remplacée, et non modifiée, lorsque les dalles
+         du joueur changent: elle peut donc être parcourue pendant une
+         modification des dalles.
+    """
+    return(plateau[5][identifiant])
+
+def renvoie_nombre_grenouilles_priorite(plateau, identifiant, priorite):
+    """
+       Renvoie le nombre de grenouilles en jeu d'un joueur ayant une priorité
+       donnée
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+         * priorite: entier
+           La priorité des grenouilles à compter
+       Sorties:
+         * nombre: entier
+           Le nombre de grenouilles du joueur de cette priorité sur le plateau
+    """
+    return(plateau[3][identifiant][priorite])
+
+def renvoie_priorite_maximale(plateau, identifiant):
+    """
+       Renvoie la plus grande priorité des grenouilles en jeu d'un joueur
+       Entrées:
+         * plateau: liste
+           Le plateau à consulter
+         * identifiant: entier
+           L'identifiant du joueur
+       Sorties:
+         * priorite_maximale: entier
+           La plus grande priorité des grenouilles du joueur, 0 s'il n'a plus
+           de grenouille en jeu
+    """
+    compteurs = plateau[3][identifiant]
+    for priorite in range(NOMBRE_PRIORITES - 1, 0, -1):
+        if compteurs[priorite] > 0:
+            return(priorite)
+    return(0)
 
 def renvoie_liste_joueurs(plateau):
     """
@@ -142,6 +504,8 @@ def modifie_liste_joueurs(plateau, liste_joueurs):
        Notes:
          Le plateau est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(plateau, 0)
     plateau[0] = liste_joueurs
 
 def renvoie_joueur(plateau, identifiant):
@@ -186,20 +550,26 @@ def retire_joueur(plateau, joueur_a_retirer):
          Le plateau est modifié à la sortie de la fonction.
     """
     identifiant_joueur_a_retirer = joueur.renvoie_identifiant(joueur_a_retirer)
-    # On retire d'abord les grenouilles du joueur de toutes les dalles
-    for i in range(len(plateau[1])):
+    # On retire d'abord les grenouilles du joueur de toutes ses dalles, connues
+    # par l'index du plateau
+    for i in renvoie_dalles_joueur(plateau, identifiant_joueur_a_retirer):
         grenouilles = dalle.renvoie_liste_grenouilles(plateau[1][i])
         nouvelles_grenouilles = []
         for g in grenouilles:
             # Si la grenouille n'appartient pas au joueur à retirer on la conserve
             if grenouille.renvoie_identifiant(g) != identifiant_joueur_a_retirer:
                 nouvelles_grenouilles.append(g)
-        dalle.modifie_liste_grenouilles(plateau[1][i], nouvelles_grenouilles)
+        # Seules les dalles ayant perdu une grenouille sont à redessiner
+        if len(nouvelles_grenouilles) != len(grenouilles):
+            dalle.modifie_liste_grenouilles(plateau[1][i], nouvelles_grenouilles)
+            signale_modification_dalle(plateau, i)
     # On retire ensuite le joueur de la liste des joueurs du plateau
     nouveaux_joueurs = []
     for i in range(len(plateau[0])):
         if joueur.renvoie_identifiant(plateau[0][i]) != identifiant_joueur_a_retirer:
             nouveaux_joueurs.append(plateau[0][i])
+    if journal.JOURNAL is not None:
+        journal.enregistre(plateau, 0)
     plateau[0] = nouveaux_joueurs
 
 def actualise_priorites_maximales(plateau):
@@ -213,34 +583,13 @@ def actualise_priorites_maximales(plateau):
          La mise à jour des priorités maximales consiste à modifier les joueurs
          encore en jeu dans le plateau donné en déterminant pour chacun des
          joueurs du plateau la plus grande priorité de ses grenouilles en jeu.
-         Le calcul se fait en parcourant les dalles du plateau, et pour chaque
-         dalle la liste de ses grenouilles. Chaque grenouille permet de mettre
-         à jour la priorité maximale du joueur correspondant.
-         Le plateau est modifié à la sortie de la fonction.       
-    """
-    nombre_joueurs = len(plateau[0])
-    identifiants_joueurs = []
-    priorites_maximales = []
-    # Initialise la liste des identifiants des joueurs en jeu
-    # et les nouvelles priorites maximales
-    for i in range(nombre_joueurs):
-        identifiants_joueurs.append(joueur.renvoie_identifiant(plateau[0][i]))
-        priorites_maximales.append(0)
-    # Parcours toutes les dalles
-    for d in plateau[1]:
-        grenouilles = dalle.renvoie_liste_grenouilles(d)
-        # Pour chaque grenouille de la dalle
-        for g in grenouilles:
-            identifiant_grenouille = grenouille.renvoie_identifiant(g)
-            priorite_grenouille = grenouille.renvoie_priorite(g)
-            # Trouve à quel joueur appartient la grenouille
-            for i in range(nombre_joueurs):
-                if identifiants_joueurs[i] == identifiant_grenouille:
-                    # Mets à jour la priorité maximale
-                    priorites_maximales[i] = max(priorites_maximales[i], priorite_grenouille)
-    # Mets à jour les priorités maximales
-    for i in range(nombre_joueurs):
-        joueur.modifie_priorite_maximale(plateau[0][i], priorites_maximales[i])
+         Cette priorité se lit sur les compteurs de priorités du plateau, tenus
+         à jour à chaque modification de dalle: aucun parcours des dalles n'est
+         nécessaire.
+         Le plateau est modifié à la sortie de la fonction.
+    """
+    for j in plateau[0]:
+        joueur.modifie_priorite_maximale(j, renvoie_priorite_maximale(plateau, joueur.renvoie_identifiant(j)))
 
 def renvoie_liste_dalles(plateau):
     """
@@ -264,9 +613,15 @@ def modifie_liste_dalles(plateau, liste_dalles):
            La nouvelle liste des dalles du plateau.
 
        Notes:
+         Toutes les dalles sont signalées comme modifiées et l'index du
+         plateau est recalculé.
          Le plateau est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(plateau, 1)
     plateau[1] = liste_dalles
+    plateau[2] = [True] * len(liste_dalles)
+    initialise_index(plateau)
 
 def renvoie_dalle(plateau, numero_dalle):
     """
@@ -295,9 +650,32 @@ def modifie_dalle(plateau, numero_dalle, dalle):
            numero_dalle.
 
        Notes:
+         La dalle est signalée comme modifiée. Cette fonction doit donc être
+         appelée après toute modification d'une dalle du plateau, même si la
+         dalle a été modifiée sur place.
          Le plateau est modifié à la sortie de la fonction.
     """
+    if journal.JOURNAL is not None:
+        journal.enregistre(plateau[1], numero_dalle)
     plateau[1][numero_dalle] = dalle
+    signale_modification_dalle(plateau, numero_dalle)
+
+def signale_modification_dalle(plateau, numero_dalle):
+    """
+       Signale que la dalle du plateau en position numero_dalle a été modifiée
+       et doit être redessinée au prochain appel à dessine()
+       Entrées:
+         * plateau: liste
+           Le plateau à modifier
+         * numero_dalle: entier
+           Le numéro de la dalle modifiée
+
+       Notes:
+         L'index du plateau est mis à jour pour la dalle modifiée.
+         Le plateau est modifié à la sortie de la fonction.
+    """
+    plateau[2][numero_dalle] = True
+    actualise_index(plateau, numero_dalle)
 
 def reveille_grenouilles(plateau, joueur_actif):
     """
@@ -320,12 +698,21 @@ def reveille_grenouilles(plateau, joueur_actif):
     """
     # Identifiant du joueur actif
     identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
-    for d in plateau[1]:
-        liste_grenouilles = dalle.renvoie_liste_grenouilles(d)
+    # Rien à faire si le joueur n'a aucune grenouille en priorité 0
+    if renvoie_nombre_grenouilles_priorite(plateau, identifiant_joueur_actif, 0) == 0:
+        return
+    # Seules les dalles portant des grenouilles du joueur sont parcourues
+    for numero_dalle in renvoie_dalles_joueur(plateau, identifiant_joueur_actif):
+        liste_grenouilles = dalle.renvoie_liste_grenouilles(plateau[1][numero_dalle])
         for g in liste_grenouilles:
             if grenouille.renvoie_identifiant(g) == identifiant_joueur_actif and \
                    grenouille.renvoie_priorite(g) == 0:
                 grenouille.modifie_priorite(g, len(liste_grenouilles))
+                # Une grenouille réveillée sur une carte vase n'est plus couchée
+                signale_modification_dalle(plateau, numero_dalle)
+        # Toutes les grenouilles endormies du joueur ont été réveillées
+        if renvoie_nombre_grenouilles_priorite(plateau, identifiant_joueur_actif, 0) == 0:
+            return
 
 def depose_une_grenouille_sur_une_dalle(plateau, numero_dalle, nouvelle_grenouille):
     """
@@ -364,11 +751,55 @@ def ajoute_une_grenouille_sur_une_dalle(plateau, numero_dalle, nouvelle_grenouil
          Le plateau est modifié à la sortie de la fonction.
     """
     dalle_arrivee = renvoie_dalle(plateau, numero_dalle)
-    grenouilles = dalle.renvoie_liste_grenouilles(dalle_arrivee)
-    grenouilles.append(nouvelle_grenouille)
+    # La liste de grenouilles est remplacée et non modifiée sur place (cf
+    # journal.enregistre())
+    grenouilles = dalle.renvoie_liste_grenouilles(dalle_arrivee) + [nouvelle_grenouille]
     dalle.modifie_liste_grenouilles(dalle_arrivee, grenouilles)
     modifie_dalle(plateau, numero_dalle, dalle_arrivee)
 
+def retire_grenouille_jouee(plateau, joueur_actif, numero_dalle, choix_reine):
+    """
+       Retire de sa dalle de départ la grenouille jouée par le joueur actif.
+       Entrées:
+         * plateau: liste
+           Le plateau à modifier
+         * joueur_actif: liste
+           Le joueur actif
+         * numero_dalle: entier
+           Le numéro de la dalle de départ, valide pour le joueur actif
+         * choix_reine: booléen
+           Vaut True si le joueur joue sa reine, False s'il joue une servante
+           (cf coups.renvoie_choix_grenouilles())
+
+       Notes:
+         S'il y a deux grenouilles sur la dalle:
+           * si l'une appartient à un autre joueur, c'est elle qui reste
+           * si les deux appartiennent au joueur actif, elles passent en
+             priorité 1 et c'est la seconde qui est jouée si elle est du type
+             choisi, la première sinon
+         Le plateau est modifié à la sortie de la fonction.
+    """
+    dalle_depart = renvoie_dalle(plateau, numero_dalle)
+    grenouilles = dalle.renvoie_liste_grenouilles(dalle_depart)
+    if len(grenouilles) == 1:
+        grenouilles_restantes = []
+    else:
+        identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
+        if grenouille.renvoie_identifiant(grenouilles[1]) != identifiant_joueur_actif:
+            grenouilles_restantes = [grenouilles[1]]
+        elif grenouille.renvoie_identifiant(grenouilles[0]) != identifiant_joueur_actif:
+            grenouilles_restantes = [grenouilles[0]]
+        else:
+            grenouille.modifie_priorite(grenouilles[0], 1)
+            grenouille.modifie_priorite(grenouilles[1], 1)
+            # La seconde grenouille est jouée si elle est du type choisi
+            if grenouille.est_reine(grenouilles[1]) == choix_reine:
+                grenouilles_restantes = [grenouilles[0]]
+            else:
+                grenouilles_restantes = [grenouilles[1]]
+    dalle.modifie_liste_grenouilles(dalle_depart, grenouilles_restantes)
+    modifie_dalle(plateau, numero_dalle, dalle_depart)
+
 def trouve_reine(plateau, joueur_actif):
     """
        Renvoie le numéro de la dalle contenant la reine du joueur actif
@@ -377,19 +808,19 @@ def trouve_reine(plateau, joueur_actif):
            Le plateau à consulter
          * joueur_actif: liste
            Le joueur dont on cherche la reine
+
+       Notes:
+         Seules les dalles du joueur actif sont parcourues (cf
+         renvoie_dalles_joueur()). Si la reine n'est pas sur le plateau, la
+         fonction renvoie le nombre de dalles du plateau.
     """
     identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
-    numero_dalle = 0
-    for d in plateau[1]:
-        grenouilles = dalle.renvoie_liste_grenouilles(d)
-        # Si la liste grenouilles est vide le corps de la boucle n'est pas
-        # exécuté
-        for g in grenouilles:
+    for numero_dalle in renvoie_dalles_joueur(plateau, identifiant_joueur_actif):
+        for g in dalle.renvoie_liste_grenouilles(plateau[1][numero_dalle]):
             if grenouille.renvoie_identifiant(g) == identifiant_joueur_actif and \
                grenouille.est_reine(g):
                 return(numero_dalle)
-        numero_dalle += 1
-    return(numero_dalle)
+    return(len(plateau[1]))
     
 def reinitialise_dernier_occupant(plateau):
     """
@@ -401,8 +832,13 @@ def reinitialise_dernier_occupant(plateau):
        Notes:
          Le plateau est modifié à la sortie de la fonction.
     """
-    for d in plateau[1]:
-        dalle.modifie_dernier_occupant(d, -1)
+    for numero_dalle in range(len(plateau[1])):
+        d = plateau[1][numero_dalle]
+        if dalle.renvoie_dernier_occupant(d) != -1:
+            dalle.modifie_dernier_occupant(d, -1)
+            # Le dernier occupant fait partie de l'empreinte de la dalle, mais
+            # la dalle n'est pas à redessiner
+            actualise_index(plateau, numero_dalle)
 
 ########
 # Fonctions de changement de repérage des dalles:
@@ -514,10 +950,10 @@ def convertis_coordonnees_vers_numero_dalle(coordonnees):
          Si les coordonnées ne correspondent pas à un point d'une dalle, le
          numéro renvoyé est égal à -1
     """
-    numero_ligne = (coordonnees[0] - DECALAGE) // PAS
+    numero_ligne = int((coordonnees[0] - DECALAGE) // PAS)
     if numero_ligne < 0 or numero_ligne > 7:
         return(-1)
-    numero_colonne = (coordonnees[1] - DECALAGE) // PAS
+    numero_colonne = int((coordonnees[1] - DECALAGE) // PAS)
     if numero_colonne < 0 or numero_colonne > 7:
         return(-1)
     return(convertis_indices_dalle_vers_numero([numero_ligne, numero_colonne]))
@@ -546,11 +982,11 @@ def convertis_indices_dalle_vers_coordonnees(indices):
              i_base = DECALAGE, j_base = DECALAGE pour la dalle
              supérieur gauche dans une image stockée comme ndarray
     """
-    return([DECALAGE + indices[0] * PAS, DECALAGE + indices[1] * PAS])
+    return([int(DECALAGE + indices[0] * PAS), int(DECALAGE + indices[1] * PAS)])
 
 def dessine(plateau):
     """
-       Crée une image représentant un plateau dans son état courant
+       Renvoie une image représentant un plateau dans son état courant
        Entrées:
          * plateau: liste
            Le plateau à dessiner
@@ -558,18 +994,99 @@ def dessine(plateau):
          * image: ndarray
            Un tableau numpy (HxLx3) où chaque point de l'image est représenté
            par un triplet (rouge, vert, bleu) de réels dans [0, 1]
+
+       Notes:
+         L'image renvoyée est l'image persistante IMAGE_PERSISTANTE, mise à jour
+         sur place: seules les dalles signalées comme modifiées depuis le
+         dernier appel et les réserves des joueurs dont l'état a changé sont
+         redessinées. Les cartes ne sont redessinées que lorsqu'elles changent,
+         dans la couche des cartes COUCHE_CARTES sur laquelle sont ensuite
+         dessinées les grenouilles: le déplacement d'une grenouille ne coûte
+         que la restauration et le dessin des zones des grenouilles. L'image
+         est entièrement redessinée si le plateau n'est pas celui du dernier
+         appel.
+         L'image renvoyée ne doit pas être modifiée par l'appelant, qui doit
+         en faire une copie s'il souhaite y ajouter des éléments, ou en
+         restaurer les zones modifiées (cf graphique.sauvegarde_zone()). Le
+         même tableau est réutilisé pour tous les plateaux: l'image d'un
+         plateau précédent est écrasée.
     """
-    image_plateau = np.copy(graphique.IMAGE_FOND)
-    # Numéro de la dalle en cours
-    numero_dalle = 0
-    # Parcours des 8x8 dalles
-    for i in range(8):
-        for j in range(8):
-            i_base, j_base = convertis_indices_dalle_vers_coordonnees([i, j])
-            dalleIJ = plateau[1][numero_dalle]
-            dalle.dessine(dalleIJ, False, i_base, j_base, image_plateau)
-            numero_dalle += 1
-    # Parcours des joueurs encore en jeu
+    global IMAGE_PERSISTANTE, PLATEAU_DESSINE, JOUEURS_DESSINES
+    global COUCHE_CARTES, CARTES_DESSINEES, GRENOUILLES_DESSINEES
+    dalles_modifiees = plateau[2]
+    # Nouveau plateau: tout est à redessiner
+    if plateau is not PLATEAU_DESSINE:
+        # L'image persistante et la couche des cartes sont réutilisées d'un
+        # plateau à l'autre
+        if IMAGE_PERSISTANTE is None or IMAGE_PERSISTANTE.shape != graphique.IMAGE_FOND.shape \
+           or IMAGE_PERSISTANTE.dtype != graphique.IMAGE_FOND.dtype:
+            IMAGE_PERSISTANTE = np.empty_like(graphique.IMAGE_FOND)
+            COUCHE_CARTES = np.empty_like(graphique.IMAGE_FOND)
+        np.copyto(IMAGE_PERSISTANTE, graphique.IMAGE_FOND)
+        np.copyto(COUCHE_CARTES, graphique.IMAGE_FOND)
+        PLATEAU_DESSINE = plateau
+        JOUEURS_DESSINES = []
+        CARTES_DESSINEES = [[] for numero_dalle in range(len(plateau[1]))]
+        GRENOUILLES_DESSINEES = [[] for numero_dalle in range(len(plateau[1]))]
+        for numero_dalle in range(len(dalles_modifiees)):
+            dalles_modifiees[numero_dalle] = True
+    # Parcours des dalles modifiées. Si la carte a changé, elle est redessinée
+    # dans la couche des cartes puis recopiée entièrement, ce qui efface les
+    # anciennes grenouilles. Sinon seules les zones des anciennes grenouilles
+    # sont restaurées depuis la couche des cartes. Les grenouilles sont
+    # ensuite dessinées par dessus.
+    for numero_dalle in range(len(plateau[1])):
+        if dalles_modifiees[numero_dalle]:
+            i_base, j_base = convertis_numero_dalle_vers_coordonnees(numero_dalle)
+            dalle_plateau = plateau[1][numero_dalle]
+            carte_dalle = dalle.renvoie_carte(dalle_plateau)
+            if carte_dalle != CARTES_DESSINEES[numero_dalle]:
+                carte.dessine(carte_dalle, False, i_base, j_base, COUCHE_CARTES)
+                CARTES_DESSINEES[numero_dalle] = list(carte_dalle)
+                efface_zones([carte.renvoie_zone(carte_dalle, i_base, j_base)], IMAGE_PERSISTANTE)
+            else:
+                efface_zones(GRENOUILLES_DESSINEES[numero_dalle], IMAGE_PERSISTANTE)
+            dalle.dessine_grenouilles(dalle_plateau, i_base, j_base, IMAGE_PERSISTANTE)
+            GRENOUILLES_DESSINEES[numero_dalle] = dalle.renvoie_zones_grenouilles(dalle_plateau, i_base, j_base)
+            dalles_modifiees[numero_dalle] = False
+    # Parcours des joueurs encore en jeu: seuls les joueurs dont la réserve ou
+    # les jetons ont changé sont redessinés
+    anciens_joueurs_dessines = JOUEURS_DESSINES
+    JOUEURS_DESSINES = []
     for j in plateau[0]:
-        joueur.dessine(j, image_plateau)
-    return(image_plateau)
+        etat_joueur = [joueur.renvoie_identifiant(j), \
+                       joueur.renvoie_nombre_grenouilles_reserve(j), \
+                       list(joueur.renvoie_liste_jetons(j))]
+        ancien_etat_joueur = []
+        for etat in anciens_joueurs_dessines:
+            if etat[0] == etat_joueur[0]:
+                ancien_etat_joueur = etat
+        if len(ancien_etat_joueur) > 0:
+            anciens_joueurs_dessines.remove(ancien_etat_joueur)
+            if ancien_etat_joueur[:3] == etat_joueur:
+                JOUEURS_DESSINES.append(ancien_etat_joueur)
+                continue
+            efface_zones(ancien_etat_joueur[3], IMAGE_PERSISTANTE)
+        joueur.dessine(j, IMAGE_PERSISTANTE)
+        etat_joueur.append(joueur.renvoie_zones(j))
+        JOUEURS_DESSINES.append(etat_joueur)
+    # Les joueurs retirés du jeu sont effacés
+    for etat in anciens_joueurs_dessines:
+        efface_zones(etat[3], IMAGE_PERSISTANTE)
+    return(IMAGE_PERSISTANTE)
+
+def efface_zones(zones, image_plateau):
+    """
+       Restaure la couche des cartes du plateau (cf COUCHE_CARTES) dans les
+       zones données
+       Entrées:
+         * zones: liste
+           Une liste de rectangles [i_min, i_max, j_min, j_max] de l'image
+         * image_plateau: ndarray
+           Le tableau numpy dans lequel restaurer la couche des cartes
+
+       Notes:
+         Le paramètre image_plateau est modifié à la sortie de la fonction.
+    """
+    for i_min, i_max, j_min, j_max in zones:
+        image_plateau[i_min:i_max, j_min:j_max] = COUCHE_CARTES[i_min:i_max, j_min:j_max]
@@ -5,7 +5,9 @@
 
 # Modules internes
 import carte
+import coups
 import dalle
+import decideur
 import grenouille
 import interaction
 import joueur
@@ -50,7 +52,7 @@ def renvoie_joueur_suivant(plateau_croa, joueur_actif):
 ############################################
 # Fonctions implémentant les règles du jeu #
 ############################################
-def applique_nenuphar(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_nenuphar(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte nénuphar: la grenouille doit changer
        de dalle sans revenir sur ses pas sauf si c'est la seule possibilité
@@ -66,6 +68,9 @@ def applique_nenuphar(plateau_croa, joueur_actif, numero_dalle_depart, numero_da
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), inutilisé par cette règle
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -92,7 +97,7 @@ def applique_nenuphar(plateau_croa, joueur_actif, numero_dalle_depart, numero_da
     # Pas de modification du joueur actif puisqu'il est obligé de rejouer
     return(joueur_actif)
 
-def applique_roseaux(plateau_croa, joueur_actif, numero_dalle_arrivee, choix_reine):
+def applique_roseaux(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte roseaux: le joueur passe la main
        Entrées:
@@ -100,11 +105,16 @@ def applique_roseaux(plateau_croa, joueur_actif, numero_dalle_arrivee, choix_rei
            Le plateau de jeu
          * joueur_actif: liste
            Le joueur dont c'est le tour de jouer
+         * numero_dalle_depart: entier
+           Le numéro de la dalle de départ
          * numero_dalle_arrivee: entier
            Le numéro de la dalle d'arrivée
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), inutilisé par cette règle
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -119,7 +129,7 @@ def applique_roseaux(plateau_croa, joueur_actif, numero_dalle_arrivee, choix_rei
     # Passe au joueur suivant
     return(renvoie_joueur_suivant(plateau_croa, joueur_actif))
 
-def applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte moustique: le joueur peut rester en
        jeu s'il choisit de bouger une autre grenouille, sinon il rend la main
@@ -135,6 +145,9 @@ def applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_d
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), decideur.GRAPHIQUE par défaut
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -150,26 +163,22 @@ def applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_d
     # état au moment du choix
     nouvelle_grenouille = grenouille.cree(identifiant_joueur_actif, choix_reine, 1)
     plateau.depose_une_grenouille_sur_une_dalle(plateau_croa, numero_dalle_arrivee, nouvelle_grenouille)
-    # Regarde s'il y a une autre grenouille du joueur actif qui peut être jouée
-    autre_grenouilles_disponibles = False
-    dalles = plateau.renvoie_liste_dalles(plateau_croa)
-    for numero_dalle in range(len(dalles)):
-        if numero_dalle != numero_dalle_arrivee:
-            grenouilles = dalle.renvoie_liste_grenouilles(dalles[numero_dalle])
-            for g in grenouilles:
-                identifiant = grenouille.renvoie_identifiant(g)
-                priorite = grenouille.renvoie_priorite(g)
-                autre_grenouilles_disponibles = (identifiant == identifiant_joueur_actif) and priorite != 0
-                # On sort de la boucle sur les grenouilles de la dalle
-                if autre_grenouilles_disponibles:
-                    break
-        # On sort de la boucle sur les dalles
-        if autre_grenouilles_disponibles:
-            break
+    # Regarde s'il y a une autre grenouille du joueur actif qui peut être jouée:
+    # les compteurs de priorités du plateau donnent le nombre de grenouilles
+    # du joueur actif de priorité non nulle, dont on retire celles de la dalle
+    # d'arrivée
+    nombre_grenouilles_disponibles = plateau.renvoie_nombre_grenouilles_priorite(plateau_croa, identifiant_joueur_actif, 1) + \
+                                     plateau.renvoie_nombre_grenouilles_priorite(plateau_croa, identifiant_joueur_actif, 2)
+    dalle_arrivee = plateau.renvoie_dalle(plateau_croa, numero_dalle_arrivee)
+    for g in dalle.renvoie_liste_grenouilles(dalle_arrivee):
+        if grenouille.renvoie_identifiant(g) == identifiant_joueur_actif and \
+           grenouille.renvoie_priorite(g) != 0:
+            nombre_grenouilles_disponibles -= 1
+    autre_grenouilles_disponibles = nombre_grenouilles_disponibles > 0
     # Choisis de jouer une autre grenouille s'il y en a une de disponible sur une
     # ature dalle
     if autre_grenouilles_disponibles:
-        choix = interaction.choisis(plateau_croa, joueur_actif, "Voulez-vous jouer une autre grenouille?", interaction.OUI, interaction.NON, True)
+        choix = decideur.choisis(decideur_croa, plateau_croa, joueur_actif, decideur.QUESTION_MOUSTIQUE, interaction.OUI, interaction.NON, True)
         # Si on joue une nouvelle grenouille il faut desactiver la grenouille de la dalle courante
         # Ajoute la grenouille à la dalle
         if choix:
@@ -179,7 +188,7 @@ def applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_d
     # Passe au joueur suivant
     return(renvoie_joueur_suivant(plateau_croa, joueur_actif))
 
-def applique_male(plateau_croa, joueur_actif, couleur_male, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_male(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte mâle: le joueur gagne une servante
        sur la dalle d'arrivée si c'est sa reine qui est arrivée sur la dalle et
@@ -189,9 +198,6 @@ def applique_male(plateau_croa, joueur_actif, couleur_male, numero_dalle_depart,
            Le plateau de jeu
          * joueur_actif: liste
            Le joueur dont c'est le tour de jouer
-         * couleur_male: entier
-           La couleur du mâle présent sur la dalle, entre carte.MALE_BLEU et
-           carte.MALE_VIOLET
          * numero_dalle_depart: entier
            Le numéro de la dalle de départ
          * numero_dalle_arrivee: entier
@@ -199,6 +205,9 @@ def applique_male(plateau_croa, joueur_actif, couleur_male, numero_dalle_depart,
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), inutilisé par cette règle
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -208,9 +217,12 @@ def applique_male(plateau_croa, joueur_actif, couleur_male, numero_dalle_depart,
          nouvelle servante. Le pion mâle est retiré uniquement si la reine a pu
          se reproduire. Comme il n'y a aucun moyen de renouveler le stock de
          grenouillles en réserve, de toute façon le jeton est devenu inutile.
+         La couleur du mâle, entre carte.MALE_BLEU et carte.MALE_VIOLET, est
+         celle de la carte de la dalle d'arrivée.
          Le plateau de jeu est modifié à la sortie de la fonction.
     """
     identifiant_joueur_actif = joueur.renvoie_identifiant(joueur_actif)
+    couleur_male = carte.renvoie_face(dalle.renvoie_carte(plateau.renvoie_dalle(plateau_croa, numero_dalle_arrivee)))
     # C'est la reine qui arrive sur la dalle
     if choix_reine:
         # Elle peut se reproduire avec le mâle
@@ -245,7 +257,7 @@ def applique_male(plateau_croa, joueur_actif, couleur_male, numero_dalle_depart,
         plateau.depose_une_grenouille_sur_une_dalle(plateau_croa, numero_dalle_arrivee, servante)
     return(renvoie_joueur_suivant(plateau_croa, joueur_actif))
 
-def applique_vase(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_vase(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte vase: le joueur passe la main et
        sa grenouille reste inactive pour un tour
@@ -261,6 +273,9 @@ def applique_vase(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), inutilisé par cette règle
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -276,7 +291,7 @@ def applique_vase(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_
     plateau.depose_une_grenouille_sur_une_dalle(plateau_croa, numero_dalle_arrivee, nouvelle_grenouille)
     return(renvoie_joueur_suivant(plateau_croa, joueur_actif))
 
-def applique_brochet(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_brochet(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte brochet: la grenouille sort du jeu.
        Si c'est une reine, le joueur perd et toutes ses grenouilles sont retirées
@@ -292,6 +307,9 @@ def applique_brochet(plateau_croa, joueur_actif, numero_dalle_depart, numero_dal
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), decideur.GRAPHIQUE par défaut
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -310,13 +328,13 @@ def applique_brochet(plateau_croa, joueur_actif, numero_dalle_depart, numero_dal
         # On choisi le joueur suivant avant de retirer le joueur actif pour avancer dans la liste des joueurs en jeu de manière naturelle
         joueur_suivant = renvoie_joueur_suivant(plateau_croa, joueur_actif)
         # Au revoir au joueur actif!
-        interaction.affiche_message(plateau_croa, joueur_actif, "Au revoir " + joueur.renvoie_nom(joueur_actif))
+        decideur.affiche_message(decideur_croa, plateau_croa, joueur_actif, "Au revoir " + joueur.renvoie_nom(joueur_actif))
         plateau.retire_joueur(plateau_croa, joueur_actif)
     else:
         joueur_suivant = renvoie_joueur_suivant(plateau_croa, joueur_actif)
     return(joueur_suivant)
 
-def applique_rondin(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+def applique_rondin(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique la règle associée à la carte rondin: si la grenouille est une
        reine elle fait sortir du jeu les éventuelles grenouilles présentes sur le
@@ -337,6 +355,9 @@ def applique_rondin(plateau_croa, joueur_actif, numero_dalle_depart, numero_dall
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), decideur.GRAPHIQUE par défaut
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -379,20 +400,91 @@ def applique_rondin(plateau_croa, joueur_actif, numero_dalle_depart, numero_dall
                 carte_rondin = dalle.renvoie_carte(dalle_arrivee)
                 dalle_gauche = dalle.cree(carte_rondin, [grenouille_gauche], -1)
                 dalle_droite = dalle.cree(carte_rondin, [grenouille_droite], -1)
-                choix = interaction.choisis(plateau_croa, joueur_actif, "Quelle grenouille supprimer?", dalle_gauche, dalle_droite, False)
+                choix = decideur.choisis(decideur_croa, plateau_croa, joueur_actif, decideur.QUESTION_RONDIN, dalle_gauche, dalle_droite, False)
                 if choix:
                     grenouilles = [grenouilles[1]]
                 else:
                     grenouilles = [grenouilles[0]]
         # On ajoute la nouvelle grenouille
+        # La liste de grenouilles est remplacée et non modifiée sur place (cf
+        # journal.enregistre())
         nouvelle_grenouille = grenouille.cree(identifiant_joueur_actif, choix_reine, 1)
-        grenouilles.append(nouvelle_grenouille)
+        grenouilles = grenouilles + [nouvelle_grenouille]
         dalle.modifie_liste_grenouilles(dalle_arrivee, grenouilles)
         plateau.modifie_dalle(plateau_croa, numero_dalle_arrivee, dalle_arrivee)
     # On passe au joueur suivant
     return(renvoie_joueur_suivant(plateau_croa, joueur_actif))
 
-def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine):
+###############################
+# Table des règles des cartes #
+###############################
+# Effets déclarés par les règles des cartes et pris en compte par applique(),
+# combinés en un entier:
+#   * EFFET_DALLE_CONSERVEE: les grenouilles présentes sur la dalle d'arrivée
+#     ne sont pas renvoyées dans les réserves avant l'application de la règle
+EFFET_DALLE_CONSERVEE = 1
+
+def cree_regles_cartes():
+    """
+       Construit la table des règles des cartes.
+       Sorties:
+         * regles_cartes: liste
+           Une liste indexée par les faces de cartes (carte.NENUPHAR à
+           carte.RONDIN), l'élément d'indice face étant une liste
+           [fonction, effets]
+
+       Notes:
+         Toutes les fonctions de règle ont la même signature que
+         applique_nenuphar() et renvoient le joueur suivant. Les effets valent
+         0 ou une combinaison des constantes EFFET_... (cf
+         EFFET_DALLE_CONSERVEE).
+    """
+    regles_cartes = [None] * (carte.RONDIN + 1)
+    regles_cartes[carte.NENUPHAR] = [applique_nenuphar, 0]
+    regles_cartes[carte.ROSEAUX] = [applique_roseaux, 0]
+    regles_cartes[carte.MOUSTIQUE] = [applique_moustique, 0]
+    for couleur_male in range(carte.MALE_BLEU, carte.MALE_VIOLET + 1):
+        regles_cartes[couleur_male] = [applique_male, 0]
+    regles_cartes[carte.VASE] = [applique_vase, 0]
+    regles_cartes[carte.BROCHET] = [applique_brochet, 0]
+    regles_cartes[carte.RONDIN] = [applique_rondin, EFFET_DALLE_CONSERVEE]
+    return(regles_cartes)
+
+# Table des règles des cartes, consultée par applique()
+REGLES_CARTES = cree_regles_cartes()
+
+def enregistre_regle_carte(face, fonction, effets):
+    """
+       Remplace la règle associée à une face de carte, pour jouer avec une
+       variante des règles.
+       Entrées:
+         * face: entier
+           La face de carte concernée, entre carte.NENUPHAR et carte.RONDIN
+         * fonction: fonction
+           La fonction appliquant la règle, de même signature que
+           applique_nenuphar()
+         * effets: entier
+           Les effets de la règle (cf EFFET_DALLE_CONSERVEE)
+
+       Notes:
+         La table REGLES_CARTES est modifiée: la variante s'applique à toutes
+         les parties jusqu'au prochain appel ou jusqu'à l'appel de
+         restaure_regles_cartes().
+    """
+    REGLES_CARTES[face] = [fonction, effets]
+
+def restaure_regles_cartes():
+    """
+       Rétablit les règles d'origine de toutes les faces de cartes, après
+       l'enregistrement de variantes (cf enregistre_regle_carte()).
+
+       Notes:
+         La table REGLES_CARTES est modifiée sur place: les modules qui la
+         référencent voient aussi les règles d'origine.
+    """
+    REGLES_CARTES[:] = cree_regles_cartes()
+
+def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa=None):
     """
        Applique les règles du jeu: d'abord les règles prioritaires puis les règles
        de la carte présente sur la dalle d'arrivée
@@ -408,6 +500,9 @@ def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arriv
          * choix_reine: booléen
            Drapeau indiquant si le joueur joue sa reine (True) ou une
            servante (False)
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), decideur.GRAPHIQUE par défaut
        Sorties:
          * joueur_suivant: liste
            Le joueur suivant
@@ -433,6 +528,13 @@ def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arriv
          https://www.trictrac.net/forum/sujet/croa-quelques-questions
          on prend le parti de les remettre dans la réserve de leurs joueurs
          respectifs
+         La règle de la carte de la dalle d'arrivée est lue dans la table
+         REGLES_CARTES (cf enregistre_regle_carte() pour les variantes).
+         Les priorités maximales des joueurs sont recalculées après toute
+         règle de carte: aucun effet ne permet d'en dispenser une règle, car
+         le recalcul est lu sur les compteurs de priorités du plateau (cf
+         plateau.actualise_priorites_maximales()) et ne coûte qu'un passage
+         sur les joueurs.
          Le plateau de jeu est modifié à la sortie de la fonction.
     """
     # Réinitialisation du dernier occupant de toutes les dalles
@@ -463,7 +565,7 @@ def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arriv
             nouvelle_grenouille = grenouille.cree(identifiant_joueur_actif, choix_reine, 2)
         plateau.depose_une_grenouille_sur_une_dalle(plateau_croa, numero_dalle_arrivee, nouvelle_grenouille)
         # On dit au revoir au joueur éliminé
-        interaction.affiche_message(plateau_croa, joueur_elimine, "Au revoir " + joueur.renvoie_nom(joueur_elimine))
+        decideur.affiche_message(decideur_croa, plateau_croa, joueur_elimine, "Au revoir " + joueur.renvoie_nom(joueur_elimine))
         # On supprime les grenouilles du joueur éliminé
         plateau.retire_joueur(plateau_croa, joueur_elimine)
         # On ajoute une servante sur la case de la reine
@@ -487,9 +589,12 @@ def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arriv
     face_carte = carte.renvoie_face(carte_arrivee)
     # Mets la carte de la dalle face visible
     carte.modifie_face_visible(carte_arrivee, True)
-    # Supprime les grenouilles présentes sur une dalle dont la carte n'est pas un rondin
+    # Règle associée à la face de la carte
+    fonction, effets = REGLES_CARTES[face_carte]
+    # Supprime les grenouilles présentes sur la dalle d'arrivée, sauf si la
+    # règle les conserve (rondin)
     # Chaque grenouille retourne dans la réserve du joueur auquel elle appartient
-    if face_carte != carte.RONDIN:
+    if not effets & EFFET_DALLE_CONSERVEE:
         grenouilles = dalle.renvoie_liste_grenouilles(dalle_arrivee)
         for g in grenouilles:
             identifiant_grenouille = grenouille.renvoie_identifiant(g)
@@ -500,20 +605,42 @@ def applique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arriv
         dalle.modifie_liste_grenouilles(dalle_arrivee, [])
         plateau.modifie_dalle(plateau_croa, numero_dalle_arrivee, dalle_arrivee)
     # Modifie l'état du jeu selon la carte
-    if face_carte == carte.NENUPHAR:
-        joueur_suivant = applique_nenuphar(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
-    if face_carte == carte.ROSEAUX:
-        joueur_suivant = applique_roseaux(plateau_croa, joueur_actif, numero_dalle_arrivee, choix_reine)
-    if face_carte == carte.MOUSTIQUE:
-        joueur_suivant = applique_moustique(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
-    if face_carte >= carte.MALE_BLEU and face_carte <= carte.MALE_VIOLET:
-        joueur_suivant = applique_male(plateau_croa, joueur_actif, face_carte, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
-    if face_carte == carte.VASE:
-        joueur_suivant = applique_vase(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
-    if face_carte == carte.BROCHET:
-        joueur_suivant = applique_brochet(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
-    if face_carte == carte.RONDIN:
-        joueur_suivant = applique_rondin(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine)
+    joueur_suivant = fonction(plateau_croa, joueur_actif, numero_dalle_depart, numero_dalle_arrivee, choix_reine, decideur_croa)
     # Mets à jour les priorités maximales des différents joueurs encore en jeu
+    # (cf Notes)
     plateau.actualise_priorites_maximales(plateau_croa)
     return(joueur_suivant)
+
+def joue(plateau_croa, joueur_actif, coup, decideur_croa=None):
+    """
+       Joue un coup complet du joueur actif, sans interaction graphique si le
+       décideur n'est pas graphique.
+       Entrées:
+         * plateau_croa: liste
+           Le plateau de jeu
+         * joueur_actif: liste
+           Le joueur dont c'est le tour de jouer
+         * coup: liste
+           Le coup à jouer, autorisé pour le joueur actif (cf coups.renvoie_coups())
+         * decideur_croa: liste
+           Le décideur fournissant les choix des joueurs et recevant leurs
+           messages (cf decideur.cree()), decideur.GRAPHIQUE par défaut
+       Sorties:
+         * joueur_suivant: liste
+           Le joueur suivant
+
+       Notes:
+         Enchaîne les étapes de la boucle de jeu de croa.py: retrait de la
+         grenouille de sa dalle de départ, réveil des grenouilles du joueur
+         actif puis application des règles.
+         Si le journal est ouvert (cf journal.ouvre()), toutes les
+         modifications sont enregistrées et le coup peut être annulé
+         exactement par journal.annule().
+         Le plateau de jeu est modifié à la sortie de la fonction.
+    """
+    numero_dalle_depart = coups.renvoie_numero_dalle_depart(coup)
+    choix_reine = coups.renvoie_choix_reine(coup)
+    plateau.retire_grenouille_jouee(plateau_croa, joueur_actif, numero_dalle_depart, choix_reine)
+    plateau.reveille_grenouilles(plateau_croa, joueur_actif)
+    return(applique(plateau_croa, joueur_actif, numero_dalle_depart,
+                    coups.renvoie_numero_dalle_arrivee(coup), choix_reine, decideur_croa))
@@ -0,0 +1,297 @@
+"""
+   Ce fichier est l'entrée des simulations du jeu Croâ: des parties complètes
+   sont jouées sans affichage ni interaction par des stratégies (cf
+   strategie.py) et des décideurs (cf decideur.py), chaque partie étant
+   entièrement déterminée par sa graine.
+
+   Utilisation:
+       python simule.py [nombre_parties] [nombre_joueurs] [graine] [nombre_processus]
+   La partie d'indice i de la simulation a pour graine graine + i. Avec
+   nombre_processus différent de 1, les parties sont réparties par lots entre
+   plusieurs processus (0: autant de processus que de coeurs).
+"""
+# Modules externes
+import multiprocessing
+import os
+import sys
+import time
+import numpy as np
+
+# Aucune fenêtre graphique n'est nécessaire (cf graphique.SANS_FENETRE)
+os.environ.setdefault("CROA_SANS_FENETRE", "1")
+
+# Modules internes
+import carte
+import coups
+import dalle
+import decideur
+import joueur
+import plateau
+import regles
+import strategie
+
+# Nombre maximal de tours (coups joués et tours passés) d'une partie, au-delà
+# duquel la partie est arrêtée sans vainqueur
+NOMBRE_TOURS_MAX = 2000
+
+# Nombre de parties d'un lot confié à un processus (cf simule_en_parallele())
+TAILLE_LOT = 50
+
+# Indices des champs du résultat d'une partie (cf joue_partie())
+GRAINE        = 0
+GAGNANT       = 1
+NOMBRE_COUPS  = 2
+NOMBRE_PASSES = 3
+ELIMINATIONS  = 4
+
+# Indices des champs du bilan d'une série de parties (cf cree_bilan())
+PARTIES             = 0
+COUPS               = 1
+PASSES              = 2
+DUREE               = 3
+VICTOIRES           = 4
+ELIMINATIONS_CARTES = 5
+
+def joue_partie(nombre_joueurs, graine, strategies=None, decideurs=None):
+    """
+       Joue une partie complète sans affichage.
+       Entrées:
+         * nombre_joueurs: entier
+           Le nombre de joueurs de la partie, 2, 3 ou 4
+         * graine: entier
+           La graine de la partie: elle détermine le plateau et, s'ils ne sont
+           pas fournis, les générateurs des stratégies et des décideurs
+         * strategies: liste
+           Les stratégies des joueurs (cf strategie.py), indexées par
+           identifiant de joueur. Par défaut, des stratégies aléatoires.
+         * decideurs: liste
+           Les décideurs des joueurs (cf decideur.cree()), indexés par
+           identifiant de joueur. Par défaut, des décideurs aléatoires.
+       Sorties:
+         * resultat: liste
+           Une liste [graine, gagnant, nombre_coups, nombre_passes,
+           eliminations], gagnant étant l'identifiant du vainqueur (qui est
+           aussi sa place dans l'ordre de jeu) ou -1 si la partie s'est
+           terminée sans vainqueur, et eliminations la liste, indexée par face
+           de carte, du nombre de joueurs éliminés par un coup arrivant sur une
+           carte de cette face (capture de reine ou brochet)
+
+       Notes:
+         La boucle de jeu est celle de croa.py: un joueur dont la priorité
+         maximale est nulle réveille ses grenouilles et passe son tour. La
+         partie est arrêtée sans vainqueur si le joueur actif n'a aucun coup
+         autorisé ou si elle dépasse NOMBRE_TOURS_MAX tours.
+    """
+    joueurs = joueur.cree_joueurs(nombre_joueurs)
+    plateau_croa = plateau.cree(joueurs, graine)
+    generateur = np.random.RandomState(graine)
+    if strategies is None:
+        strategies = [strategie.cree_aleatoire(generateur.randint(2 ** 31)) for j in joueurs]
+    if decideurs is None:
+        decideurs = [decideur.cree_aleatoire(generateur.randint(2 ** 31)) for j in joueurs]
+    joueur_actif = joueurs[0]
+    nombre_coups = 0
+    nombre_passes = 0
+    eliminations = [0] * (carte.RONDIN + 1)
+    while len(plateau.renvoie_liste_joueurs(plateau_croa)) >= 2 and \
+          nombre_coups + nombre_passes < NOMBRE_TOURS_MAX:
+        identifiant = joueur.renvoie_identifiant(joueur_actif)
+        # Le joueur actif ne peut pas jouer: il réveille ses grenouilles et
+        # passe son tour
+        if joueur.renvoie_priorite_maximale(joueur_actif) == 0:
+            plateau.reveille_grenouilles(plateau_croa, joueur_actif)
+            joueur_actif = regles.renvoie_joueur_suivant(plateau_croa, joueur_actif)
+            nombre_passes += 1
+            continue
+        liste_coups = coups.renvoie_coups(plateau_croa, joueur_actif)
+        # Partie bloquée
+        if len(liste_coups) == 0:
+            break
+        coup = strategies[identifiant](plateau_croa, joueur_actif, liste_coups)
+        nombre_joueurs_en_jeu = len(plateau.renvoie_liste_joueurs(plateau_croa))
+        joueur_actif = regles.joue(plateau_croa, joueur_actif, coup, decideurs[identifiant])
+        nombre_coups += 1
+        nombre_joueurs_elimines = nombre_joueurs_en_jeu - len(plateau.renvoie_liste_joueurs(plateau_croa))
+        if nombre_joueurs_elimines > 0:
+            dalle_arrivee = plateau.renvoie_dalle(plateau_croa, coups.renvoie_numero_dalle_arrivee(coup))
+            eliminations[carte.renvoie_face(dalle.renvoie_carte(dalle_arrivee))] += nombre_joueurs_elimines
+    liste_joueurs = plateau.renvoie_liste_joueurs(plateau_croa)
+    gagnant = -1
+    if len(liste_joueurs) == 1:
+        gagnant = joueur.renvoie_identifiant(liste_joueurs[0])
+    return([graine, gagnant, nombre_coups, nombre_passes, eliminations])
+
+def cree_bilan(nombre_joueurs):
+    """
+       Crée le bilan vide d'une série de parties.
+       Entrées:
+         * nombre_joueurs: entier
+           Le nombre de joueurs des parties
+       Sorties:
+         * bilan: liste
+           Une liste [nombre_parties, nombre_coups, nombre_passes, duree,
+           victoires, eliminations], victoires étant la liste du nombre de
+           victoires de chaque identifiant de joueur suivie du nombre de
+           parties sans vainqueur, et eliminations la liste, indexée par face
+           de carte, du nombre de joueurs éliminés (cf joue_partie())
+    """
+    return([0, 0, 0, 0.0, [0] * (nombre_joueurs + 1), [0] * (carte.RONDIN + 1)])
+
+def ajoute_resultat(bilan, resultat):
+    """
+       Ajoute le résultat d'une partie à un bilan.
+       Entrées:
+         * bilan: liste
+           Le bilan à compléter (cf cree_bilan())
+         * resultat: liste
+           Le résultat d'une partie (cf joue_partie())
+    """
+    bilan[PARTIES] += 1
+    bilan[COUPS] += resultat[NOMBRE_COUPS]
+    bilan[PASSES] += resultat[NOMBRE_PASSES]
+    bilan[VICTOIRES][resultat[GAGNANT]] += 1
+    for face in range(len(bilan[ELIMINATIONS_CARTES])):
+        bilan[ELIMINATIONS_CARTES][face] += resultat[ELIMINATIONS][face]
+
+def fusionne_bilans(bilan, autre_bilan):
+    """
+       Ajoute à un bilan celui d'une autre série de parties.
+       Entrées:
+         * bilan: liste
+           Le bilan à compléter (cf cree_bilan())
+         * autre_bilan: liste
+           Le bilan à ajouter, pour le même nombre de joueurs
+
+       Notes:
+         Les durées sont additionnées: pour des séries jouées en parallèle,
+         la durée écoulée est à mesurer par l'appelant.
+    """
+    for indice in [PARTIES, COUPS, PASSES, DUREE]:
+        bilan[indice] += autre_bilan[indice]
+    for indice in [VICTOIRES, ELIMINATIONS_CARTES]:
+        for k in range(len(bilan[indice])):
+            bilan[indice][k] += autre_bilan[indice][k]
+
+def joue_lot(lot):
+    """
+       Joue un lot de parties consécutives et en renvoie le bilan.
+       Entrées:
+         * lot: liste
+           Une liste [nombre_joueurs, graine, nombre_parties], la partie
+           d'indice i du lot ayant pour graine graine + i
+       Sorties:
+         * bilan: liste
+           Le bilan du lot (cf cree_bilan())
+
+       Notes:
+         C'est la fonction exécutée par les processus de
+         simule_en_parallele(): seul le bilan, de taille fixe, est renvoyé au
+         processus principal.
+    """
+    nombre_joueurs, graine, nombre_parties = lot
+    bilan = cree_bilan(nombre_joueurs)
+    debut = time.perf_counter()
+    for i in range(nombre_parties):
+        ajoute_resultat(bilan, joue_partie(nombre_joueurs, graine + i))
+    bilan[DUREE] = time.perf_counter() - debut
+    return(bilan)
+
+def simule(nombre_parties, nombre_joueurs, graine=0, affiche=True):
+    """
+       Joue une série de parties entre stratégies aléatoires et en mesure le
+       débit.
+       Entrées:
+         * nombre_parties: entier
+           Le nombre de parties à jouer
+         * nombre_joueurs: entier
+           Le nombre de joueurs de chaque partie, 2, 3 ou 4
+         * graine: entier
+           La graine de la première partie, celle de la partie d'indice i
+           valant graine + i
+         * affiche: booléen
+           Si True, le bilan est affiché à la fin de la simulation
+       Sorties:
+         * bilan: liste
+           Le bilan de la série (cf cree_bilan())
+
+       Notes:
+         Seul le bilan est conservé: la mémoire occupée ne dépend pas du
+         nombre de parties.
+    """
+    bilan = joue_lot([nombre_joueurs, graine, nombre_parties])
+    if affiche:
+        affiche_bilan(bilan)
+    return(bilan)
+
+def simule_en_parallele(nombre_parties, nombre_joueurs, graine=0, nombre_processus=None, affiche=True):
+    """
+       Joue une série de parties entre stratégies aléatoires en les répartissant
+       entre plusieurs processus.
+       Entrées:
+         * nombre_parties: entier
+           Le nombre de parties à jouer
+         * nombre_joueurs: entier
+           Le nombre de joueurs de chaque partie, 2, 3 ou 4
+         * graine: entier
+           La graine de la première partie, celle de la partie d'indice i
+           valant graine + i
+         * nombre_processus: entier
+           Le nombre de processus, par défaut le nombre de coeurs de la
+           machine
+         * affiche: booléen
+           Si True, le bilan est affiché à la fin de la simulation
+       Sorties:
+         * bilan: liste
+           Le bilan de la série (cf cree_bilan()), dont la durée est la durée
+           écoulée
+
+       Notes:
+         Les parties sont découpées en lots de TAILLE_LOT parties de graines
+         consécutives (cf joue_lot()). Les bilans des lots sont fusionnés au
+         fur et à mesure de leur arrivée: le bilan final est le même que celui
+         de simule(), à la durée près, quels que soient le nombre de processus
+         et l'ordre d'arrivée des lots.
+    """
+    if nombre_processus is None:
+        nombre_processus = os.cpu_count()
+    lots = [[nombre_joueurs, graine + debut, min(TAILLE_LOT, nombre_parties - debut)]
+            for debut in range(0, nombre_parties, TAILLE_LOT)]
+    bilan = cree_bilan(nombre_joueurs)
+    debut = time.perf_counter()
+    with multiprocessing.Pool(nombre_processus) as processus:
+        for bilan_lot in processus.imap_unordered(joue_lot, lots):
+            fusionne_bilans(bilan, bilan_lot)
+    bilan[DUREE] = time.perf_counter() - debut
+    if affiche:
+        affiche_bilan(bilan)
+    return(bilan)
+
+def affiche_bilan(bilan):
+    """
+       Affiche le bilan d'une simulation dans la console.
+       Entrées:
+         * bilan: liste
+           Le bilan à afficher (cf cree_bilan())
+    """
+    nombre_parties = bilan[PARTIES]
+    nombre_coups = bilan[COUPS]
+    duree = max(bilan[DUREE], 1e-9)
+    victoires = bilan[VICTOIRES]
+    print(nombre_parties, "parties,", nombre_coups, "coups en", round(duree, 3), "s")
+    print(round(nombre_parties / duree, 1), "parties/s,", round(nombre_coups / duree, 1), "coups/s")
+    for identifiant in range(len(victoires) - 1):
+        print("Joueur", identifiant + 1, ":", victoires[identifiant], "victoires")
+    print("Sans vainqueur :", victoires[-1])
+    eliminations = bilan[ELIMINATIONS_CARTES]
+    print("Eliminations par carte:", ", ".join([str(face) + ": " + str(eliminations[face])
+                                                 for face in range(len(eliminations))
+                                                 if eliminations[face] > 0]))
+
+if __name__ == "__main__":
+    arguments = [int(a) for a in sys.argv[1:]]
+    # Valeurs par défaut: 100 parties à 2 joueurs, graine 0, un seul processus
+    arguments = arguments + [100, 2, 0, 1][len(arguments):]
+    if arguments[3] == 1:
+        simule(arguments[0], arguments[1], arguments[2])
+    else:
+        simule_en_parallele(arguments[0], arguments[1], arguments[2], arguments[3] or None)
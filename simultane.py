@@ -0,0 +1,607 @@
+"""
+    Ce fichier regroupe les structures et les services associés aux parties
+    simultanées: N parties entre joueurs aléatoires sont conservées sous la
+    forme d'un tableau numpy d'états compacts (cf etat.py) de dimensions
+    (N, etat.TAILLE), et toutes les parties avancent d'un tour à chaque pas,
+    par des opérations sur l'ensemble des parties à la fois.
+
+    Les règles sont celles de regles.py, appliquées dans le même ordre que
+    simule.joue_partie(): un joueur dont la priorité maximale est nulle
+    réveille ses grenouilles et passe son tour, sinon il joue un coup tiré au
+    hasard parmi ses coups autorisés (cf coups.renvoie_coups()) et les choix
+    demandés par les règles sont tirés à pile ou face.
+
+    Utilisation:
+        python simultane.py [nombre_parties] [nombre_joueurs] [graine]
+    Les parties ont les mêmes plateaux initiaux que celles de simule.py pour
+    la même graine, mais les coups sont tirés par un générateur commun: les
+    parties jouées diffèrent.
+"""
+# Modules externes
+import os
+import sys
+import time
+import numpy as np
+
+# Aucune fenêtre graphique n'est nécessaire (cf graphique.SANS_FENETRE)
+os.environ.setdefault("CROA_SANS_FENETRE", "1")
+
+# Modules internes
+import bitboard
+import carte
+import etat
+import joueur
+import plateau
+import simule
+
+NOMBRE_DALLES = etat.NOMBRE_DALLES
+NOMBRE_JOUEURS_MAX = etat.NOMBRE_JOUEURS_MAX
+# Nombre maximal de tours d'une partie (cf simule.NOMBRE_TOURS_MAX)
+NOMBRE_TOURS_MAX = 2000
+
+# Les parties simultanées sont une liste dont les éléments sont indexés par:
+#   * ETATS: le tableau (N, etat.TAILLE) des états compacts des parties
+#   * ACTIFS: le tableau des identifiants des joueurs actifs
+#   * TERMINEES: le tableau des drapeaux de fin de partie
+#   * GAGNANTS: le tableau des identifiants des vainqueurs, -1 tant qu'une
+#     partie n'est pas terminée ou si elle s'est terminée sans vainqueur
+#   * COUPS, PASSES: les tableaux des nombres de coups joués et de tours
+#     passés de chaque partie
+#   * ELIMINATIONS: le tableau (N, carte.RONDIN + 1) du nombre de joueurs
+#     éliminés par un coup arrivant sur chaque face de carte
+ETATS        = 0
+ACTIFS       = 1
+TERMINEES    = 2
+GAGNANTS     = 3
+COUPS        = 4
+PASSES       = 5
+ELIMINATIONS = 6
+
+def cree_table_voisins():
+    """
+       Construit la table des voisines des dalles du plateau.
+       Sorties:
+         * voisins: ndarray
+           Un tableau (NOMBRE_DALLES, 8) d'entiers, la ligne k donnant les
+           numéros des voisines de la dalle k dans l'ordre croissant,
+           complétés par 0
+         * voisins_valides: ndarray
+           Un tableau (NOMBRE_DALLES, 8) de booléens indiquant les cases de
+           voisins qui sont de vraies voisines
+    """
+    voisins = np.zeros((NOMBRE_DALLES, 8), int)
+    voisins_valides = np.zeros((NOMBRE_DALLES, 8), bool)
+    for numero in range(NOMBRE_DALLES):
+        numeros = bitboard.convertis_masque_vers_numeros(bitboard.VOISINS[numero])
+        voisins[numero, :len(numeros)] = numeros
+        voisins_valides[numero, :len(numeros)] = True
+    return(voisins, voisins_valides)
+
+# Tables des voisines, calculées une fois pour toutes au chargement du module
+VOISINS, VOISINS_VALIDES = cree_table_voisins()
+
+def cree(nombre_parties, nombre_joueurs, graine=0):
+    """
+       Crée N parties simultanées dans leur état initial.
+       Entrées:
+         * nombre_parties: entier
+           Le nombre N de parties
+         * nombre_joueurs: entier
+           Le nombre de joueurs de chaque partie, 2, 3 ou 4
+         * graine: entier
+           La graine de la première partie, celle de la partie d'indice i
+           valant graine + i (cf plateau.cree())
+       Sorties:
+         * parties: liste
+           Les parties (cf ETATS...ELIMINATIONS)
+
+       Notes:
+         Les plateaux initiaux sont ceux de simule.joue_partie() pour les
+         mêmes graines.
+    """
+    etats = np.zeros((nombre_parties, etat.TAILLE), np.int8)
+    for i in range(nombre_parties):
+        plateau_croa = plateau.cree(joueur.cree_joueurs(nombre_joueurs), graine + i)
+        etats[i] = etat.cree_depuis_plateau(plateau_croa)
+    return([etats,
+            np.zeros(nombre_parties, int),
+            np.zeros(nombre_parties, bool),
+            np.full(nombre_parties, -1),
+            np.zeros(nombre_parties, int),
+            np.zeros(nombre_parties, int),
+            np.zeros((nombre_parties, carte.RONDIN + 1), int)])
+
+def renvoie_dalles(etats):
+    """
+       Renvoie la vue des dalles d'un tableau d'états compacts.
+       Entrées:
+         * etats: ndarray
+           Le tableau (N, etat.TAILLE) des états
+       Sorties:
+         * dalles: ndarray
+           Un tableau (N, NOMBRE_DALLES, etat.CHAMPS_DALLE) partageant les
+           données des états (cf etat.renvoie_dalles())
+    """
+    return(etats[:, :etat.DEBUT_JOUEURS].reshape(len(etats), NOMBRE_DALLES, etat.CHAMPS_DALLE))
+
+def renvoie_joueurs(etats):
+    """
+       Renvoie la vue des joueurs d'un tableau d'états compacts.
+       Entrées:
+         * etats: ndarray
+           Le tableau (N, etat.TAILLE) des états
+       Sorties:
+         * joueurs: ndarray
+           Un tableau (N, NOMBRE_JOUEURS_MAX, etat.CHAMPS_JOUEUR) partageant
+           les données des états (cf etat.renvoie_joueurs())
+    """
+    return(etats[:, etat.DEBUT_JOUEURS:].reshape(len(etats), NOMBRE_JOUEURS_MAX, etat.CHAMPS_JOUEUR))
+
+def encode_grenouilles(identifiants, reines, priorites):
+    """
+       Renvoie les codes de grenouilles de l'état compact (cf
+       etat.encode_grenouille()).
+       Entrées:
+         * identifiants: ndarray
+           Les identifiants des joueurs propriétaires
+         * reines: ndarray ou booléen
+           Les statuts des grenouilles, True pour une reine
+         * priorites: ndarray ou entier
+           Les priorités des grenouilles
+       Sorties:
+         * codes: ndarray
+           Les codes des grenouilles
+    """
+    return(identifiants + 1 + etat.BIT_REINE * np.asarray(reines, int) +
+           (np.asarray(priorites, int) << etat.DECALAGE_PRIORITE))
+
+def renvoie_suivants(joueurs, identifiants):
+    """
+       Renvoie les joueurs suivants de plusieurs parties (cf
+       regles.renvoie_joueur_suivant()).
+       Entrées:
+         * joueurs: ndarray
+           La vue (k, NOMBRE_JOUEURS_MAX, etat.CHAMPS_JOUEUR) des joueurs des
+           parties concernées
+         * identifiants: ndarray
+           Les identifiants des joueurs cédant leur tour
+       Sorties:
+         * suivants: ndarray
+           Les identifiants des joueurs suivants: le premier joueur en jeu
+           après le joueur cédant son tour dans l'ordre circulaire des
+           identifiants, ou le joueur cédant son tour s'il reste moins de deux
+           joueurs en jeu
+    """
+    en_jeu = joueurs[:, :, etat.EN_JEU] != 0
+    lignes = np.arange(len(identifiants))
+    suivants = identifiants.copy()
+    trouve = np.zeros(len(identifiants), bool)
+    for decalage in range(1, NOMBRE_JOUEURS_MAX):
+        candidats = (identifiants + decalage) % NOMBRE_JOUEURS_MAX
+        nouveaux = ~trouve & en_jeu[lignes, candidats]
+        suivants[nouveaux] = candidats[nouveaux]
+        trouve |= nouveaux
+    suivants[en_jeu.sum(1) < 2] = identifiants[en_jeu.sum(1) < 2]
+    return(suivants)
+
+def reveille_grenouilles(grenouilles, identifiants):
+    """
+       Réveille les grenouilles des joueurs actifs de plusieurs parties (cf
+       plateau.reveille_grenouilles()).
+       Entrées:
+         * grenouilles: ndarray
+           Le tableau (k, NOMBRE_DALLES, etat.NOMBRE_GRENOUILLES_MAX) des
+           codes des grenouilles des parties concernées
+         * identifiants: ndarray
+           Les identifiants des joueurs actifs
+       Sorties:
+         * grenouilles: ndarray
+           Le tableau des codes après réveil: les grenouilles du joueur actif
+           de priorité nulle prennent pour priorité le nombre de grenouilles
+           de leur dalle
+    """
+    nombres = (grenouilles != 0).sum(2)
+    endormies = (grenouilles != 0) & ((grenouilles & etat.MASQUE_PROPRIETAIRE) == (identifiants + 1)[:, None, None]) & \
+                ((grenouilles >> etat.DECALAGE_PRIORITE) == 0)
+    return(np.where(endormies, (grenouilles & etat.MASQUE_SANS_PRIORITE) | (nombres[:, :, None] << etat.DECALAGE_PRIORITE), grenouilles))
+
+def retire_joueurs(grenouilles, identifiants):
+    """
+       Retire les grenouilles d'un joueur de chacune de plusieurs parties (cf
+       etat.retire_joueur()).
+       Entrées:
+         * grenouilles: ndarray
+           Le tableau (k, NOMBRE_DALLES, etat.NOMBRE_GRENOUILLES_MAX) des
+           codes des grenouilles des parties concernées
+         * identifiants: ndarray
+           Les identifiants des joueurs à retirer
+       Sorties:
+         * grenouilles: ndarray
+           Le tableau des codes sans les grenouilles des joueurs retirés, les
+           grenouilles restantes d'une dalle conservant leur ordre
+    """
+    conservees = (grenouilles != 0) & ((grenouilles & etat.MASQUE_PROPRIETAIRE) != (identifiants + 1)[:, None, None])
+    # Le tri stable place les grenouilles conservées en tête, dans le même
+    # ordre
+    ordre = np.argsort(~conservees, axis=2, kind='stable')
+    return(np.where(np.take_along_axis(conservees, ordre, 2), np.take_along_axis(grenouilles, ordre, 2), 0))
+
+def renvoie_coups(dalles, identifiants, priorites_maximales):
+    """
+       Renvoie les coups autorisés des joueurs actifs de plusieurs parties.
+       Entrées:
+         * dalles: ndarray
+           Le tableau (k, NOMBRE_DALLES, etat.CHAMPS_DALLE) des dalles des
+           parties concernées
+         * identifiants: ndarray
+           Les identifiants des joueurs actifs
+         * priorites_maximales: ndarray
+           Leurs priorités maximales, non nulles
+       Sorties:
+         * parties_departs: ndarray
+           Les indices (entre 0 et k - 1) des parties des dalles de départ
+           valides, dans l'ordre croissant
+         * departs: ndarray
+           Les numéros des dalles de départ valides, dans l'ordre croissant
+           pour une même partie
+         * coups_autorises: ndarray
+           Un tableau (nombre de dalles de départ, 2, 8) de booléens:
+           l'élément [i, c, v] vaut True si le joueur actif peut jouer depuis
+           la dalle departs[i] sa reine (c = 0) ou une servante (c = 1) vers
+           la v-ième voisine de cette dalle (cf VOISINS)
+
+       Notes:
+         Reprend coups.renvoie_coups() et bitboard.renvoie_arrivees(): parcourus
+         dans l'ordre de leurs indices, les coups d'une partie sont dans
+         l'ordre de coups.renvoie_coups(). Les arrivées ne sont calculées que
+         pour les dalles de départ valides, peu nombreuses.
+    """
+    premieres = dalles[:, :, etat.GRENOUILLE_1]
+    secondes = dalles[:, :, etat.GRENOUILLE_2]
+    codes_joueurs = (identifiants + 1)[:, None]
+    occupees = premieres != 0
+    deux_grenouilles = secondes != 0
+    a_moi_premiere = (premieres & etat.MASQUE_PROPRIETAIRE) == codes_joueurs
+    a_moi_seconde = (secondes & etat.MASQUE_PROPRIETAIRE) == codes_joueurs
+    reine_premiere = (premieres & etat.BIT_REINE) != 0
+    # Dalles de départ (cf dalle.est_valide_depart())
+    priorites = priorites_maximales[:, None]
+    grenouilles = dalles[:, :, etat.GRENOUILLE_1:etat.GRENOUILLE_3 + 1]
+    jouables = ((grenouilles & etat.MASQUE_PROPRIETAIRE) == codes_joueurs[:, :, None]) & \
+               ((grenouilles >> etat.DECALAGE_PRIORITE) == priorites[:, :, None])
+    parties_departs, departs = np.nonzero(jouables.any(2))
+    # Grenouilles jouables depuis chaque dalle de départ (cf
+    # coups.renvoie_choix_grenouilles())
+    premiere = premieres[parties_departs, departs]
+    seconde = secondes[parties_departs, departs]
+    seule = seconde == 0
+    choix_reine = np.where(seule, (premiere & etat.BIT_REINE) != 0,
+                           a_moi_premiere[parties_departs, departs] &
+                           a_moi_seconde[parties_departs, departs] & (((premiere | seconde) & etat.BIT_REINE) != 0))
+    choix_servante = ~seule | ((premiere & etat.BIT_REINE) == 0)
+    # Dalles d'arrivée valides (cf bitboard.renvoie_arrivees_valides())
+    rondins = (dalles[:, :, etat.FACE] == carte.RONDIN) & (dalles[:, :, etat.FACE_VISIBLE] != 0)
+    interdites = occupees & a_moi_premiere & ~rondins
+    rondins_occupes = occupees & rondins
+    valides_reine = ~(interdites | (rondins_occupes & (a_moi_premiere | a_moi_seconde)))
+    valides_servante = ~(interdites | (rondins_occupes & ((a_moi_premiere & a_moi_seconde) |
+                                                          (a_moi_premiere & reine_premiere & ~deux_grenouilles))))
+    lignes = parties_departs[:, None]
+    voisins = VOISINS[departs]
+    voisins_valides = VOISINS_VALIDES[departs]
+    derniers = (dalles[:, :, etat.DERNIER_OCCUPANT] == identifiants[:, None])[lignes, voisins] & voisins_valides
+    arrivees = []
+    for valides in [valides_reine, valides_servante]:
+        candidates = valides[lignes, voisins] & voisins_valides
+        retenues = candidates & ~derniers
+        # Seules des dalles dont le joueur est le dernier occupant: on ne
+        # conserve que celle de plus grand numéro
+        repli = np.nonzero(~retenues.any(1) & candidates.any(1))[0]
+        retenues[repli, 7 - np.argmax(candidates[repli, ::-1], 1)] = True
+        arrivees.append(retenues)
+    choix = np.stack([choix_reine, choix_servante], 1)
+    return(parties_departs, departs, choix[:, :, None] & np.stack(arrivees, 1))
+
+def tire_coups(nombre_parties, parties_departs, departs, coups_autorises, generateur):
+    """
+       Tire au hasard un coup autorisé dans chacune de plusieurs parties.
+       Entrées:
+         * nombre_parties: entier
+           Le nombre k de parties concernées
+         * parties_departs, departs, coups_autorises: ndarray
+           Les coups autorisés (cf renvoie_coups())
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire
+       Sorties:
+         * departs, choix_reine, arrivees: ndarray
+           Les dalles de départ, statuts et dalles d'arrivée des coups tirés,
+           sans signification pour les parties sans coup autorisé
+         * bloquees: ndarray
+           Les drapeaux des parties sans coup autorisé
+
+       Notes:
+         Chaque coup autorisé d'une partie a la même probabilité d'être tiré,
+         comme avec strategie.cree_aleatoire(). Les coups de toutes les
+         parties sont numérotés à la suite les uns des autres: le coup tiré
+         est retrouvé par une recherche dichotomique dans leur cumul.
+    """
+    autorises = coups_autorises.reshape(len(coups_autorises), 16)
+    nombres = np.bincount(parties_departs, autorises.sum(1), nombre_parties).astype(int)
+    rangs = (generateur.random_sample(nombre_parties) * nombres).astype(int)
+    # Rang du coup tiré parmi les coups de toutes les parties
+    rangs += np.cumsum(nombres) - nombres
+    cumuls = np.cumsum(autorises.ravel())
+    indices = np.minimum(np.searchsorted(cumuls, rangs, 'right'), len(cumuls) - 1)
+    indices_departs = indices // 16
+    departs_tires = departs[indices_departs] if len(departs) > 0 else np.zeros(nombre_parties, int)
+    arrivees = VOISINS[departs_tires, indices % 8]
+    return(departs_tires, (indices // 8) % 2 == 0, arrivees, nombres == 0)
+
+def joue_pas(parties, generateur):
+    """
+       Fait avancer d'un tour toutes les parties non terminées.
+       Entrées:
+         * parties: liste
+           Les parties simultanées (cf cree())
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire des coups et des choix
+       Sorties:
+         * coups_joues: liste
+           Une liste [indices, departs, choix_reine, arrivees, choix] décrivant
+           les coups joués à ce pas: indices des parties concernées, coups
+           tirés et réponses (booléens) aux éventuelles questions des règles
+
+       Notes:
+         Les parties sont modifiées à la sortie de la fonction.
+    """
+    etats = parties[ETATS]
+    dalles = renvoie_dalles(etats)
+    joueurs = renvoie_joueurs(etats)
+    actifs = parties[ACTIFS]
+    en_cours = np.nonzero(~parties[TERMINEES])[0]
+    priorites_maximales = joueurs[en_cours, actifs[en_cours], etat.PRIORITE_MAXIMALE]
+    # Les joueurs de priorité maximale nulle réveillent leurs grenouilles et
+    # passent leur tour
+    passent = en_cours[priorites_maximales == 0]
+    grenouilles = dalles[passent, :, etat.GRENOUILLE_1:etat.GRENOUILLE_3 + 1].astype(int)
+    dalles[passent, :, etat.GRENOUILLE_1:etat.GRENOUILLE_3 + 1] = reveille_grenouilles(grenouilles, actifs[passent])
+    actifs[passent] = renvoie_suivants(joueurs[passent], actifs[passent])
+    parties[PASSES][passent] += 1
+    # Les autres jouent un coup tiré au hasard
+    jouent = en_cours[priorites_maximales != 0]
+    parties_departs, departs, coups_autorises = renvoie_coups(dalles[jouent], actifs[jouent],
+                                                              priorites_maximales[priorites_maximales != 0])
+    departs, choix_reine, arrivees, bloquees = tire_coups(len(jouent), parties_departs, departs,
+                                                          coups_autorises, generateur)
+    choix = generateur.random_sample(len(jouent)) < 0.5
+    # Une partie bloquée est terminée sans vainqueur
+    parties[TERMINEES][jouent[bloquees]] = True
+    jouent, departs, choix_reine, arrivees, choix = \
+        jouent[~bloquees], departs[~bloquees], choix_reine[~bloquees], arrivees[~bloquees], choix[~bloquees]
+    applique(parties, jouent, departs, choix_reine, arrivees, choix)
+    parties[COUPS][jouent] += 1
+    # Fin des parties
+    en_jeu = joueurs[:, :, etat.EN_JEU] != 0
+    finies = ~parties[TERMINEES] & (en_jeu.sum(1) < 2)
+    parties[GAGNANTS][finies & (en_jeu.sum(1) == 1)] = np.argmax(en_jeu[finies & (en_jeu.sum(1) == 1)], 1)
+    parties[TERMINEES] |= finies | (parties[COUPS] + parties[PASSES] >= NOMBRE_TOURS_MAX)
+    return([jouent, departs, choix_reine, arrivees, choix])
+
+def applique(parties, indices, departs, choix_reine, arrivees, choix):
+    """
+       Joue un coup dans chacune de plusieurs parties (cf regles.joue()).
+       Entrées:
+         * parties: liste
+           Les parties simultanées (cf cree())
+         * indices: ndarray
+           Les indices des parties concernées
+         * departs, choix_reine, arrivees: ndarray
+           Les coups joués, autorisés pour les joueurs actifs
+         * choix: ndarray
+           Les réponses aux éventuelles questions des règles (moustique,
+           rondin), cf decideur.choisis()
+
+       Notes:
+         Chaque étape de regles.joue() est appliquée à toutes les parties
+         concernées à la fois: les parties sont regroupées selon la carte de
+         leur dalle d'arrivée. Les parties sont modifiées à la sortie de la
+         fonction.
+    """
+    etats = parties[ETATS]
+    dalles = renvoie_dalles(etats)
+    joueurs = renvoie_joueurs(etats)
+    actifs = parties[ACTIFS][indices]
+    lignes = np.arange(len(indices))
+    # Le travail se fait sur une copie des grenouilles et des joueurs des
+    # parties concernées, recopiée à la fin
+    grenouilles = dalles[indices, :, etat.GRENOUILLE_1:etat.GRENOUILLE_3 + 1].astype(int)
+    joueurs_parties = joueurs[indices].astype(int)
+    reserves = joueurs_parties[:, :, etat.RESERVE]
+    # Retrait de la grenouille jouée (cf plateau.retire_grenouille_jouee())
+    depart = grenouilles[lignes, departs]
+    premiere, seconde = depart[:, 0], depart[:, 1]
+    a_moi_premiere = (premiere & etat.MASQUE_PROPRIETAIRE) == actifs + 1
+    a_moi_seconde = (seconde & etat.MASQUE_PROPRIETAIRE) == actifs + 1
+    # Une grenouille restée sur la dalle de départ prend la priorité 1
+    premiere_reveillee = (premiere & etat.MASQUE_SANS_PRIORITE) | (1 << etat.DECALAGE_PRIORITE)
+    seconde_reveillee = (seconde & etat.MASQUE_SANS_PRIORITE) | (1 << etat.DECALAGE_PRIORITE)
+    seconde_jouee = ((seconde & etat.BIT_REINE) != 0) == choix_reine
+    restante = np.where(seconde == 0, 0,
+               np.where(~a_moi_seconde, seconde,
+               np.where(~a_moi_premiere, premiere,
+               np.where(seconde_jouee, premiere_reveillee, seconde_reveillee))))
+    grenouilles[lignes, departs, 0] = restante
+    grenouilles[lignes, departs, 1:] = 0
+    # Réveil des grenouilles du joueur actif
+    grenouilles = reveille_grenouilles(grenouilles, actifs)
+    # Réinitialisation des derniers occupants
+    dalles[indices, :, etat.DERNIER_OCCUPANT] = -1
+    # Elimination d'un joueur dont la reine est sur la dalle d'arrivée
+    arrivee = grenouilles[lignes, arrivees]
+    autres_reines = (arrivee != 0) & ((arrivee & etat.BIT_REINE) != 0) & ((arrivee & etat.MASQUE_PROPRIETAIRE) != (actifs + 1)[:, None])
+    eliminations = autres_reines.any(1)
+    # La première reine adverse de la dalle (cf dalle.renvoie_identifiant_autre_reine())
+    elimines = (arrivee[lignes, np.argmax(autres_reines, 1)] & etat.MASQUE_PROPRIETAIRE) - 1
+    faces = dalles[indices, arrivees, etat.FACE].astype(int)
+    suivants = actifs.copy()
+    priorites_a_actualiser = ~eliminations
+    if eliminations.any():
+        e = np.nonzero(eliminations)[0]
+        actifs_e = actifs[e]
+        reserves_e = reserves[e, actifs_e]
+        priorite_2 = choix_reine[e] & (reserves_e > 0)
+        grenouilles[e, arrivees[e], 0] = encode_grenouilles(actifs_e, choix_reine[e], 2)
+        grenouilles[e, arrivees[e], 1:] = 0
+        grenouilles[e] = retire_joueurs(grenouilles[e], elimines[e])
+        joueurs_parties[e, elimines[e]] = 0
+        # Servante accompagnant la reine sur la dalle d'arrivée
+        p = e[priorite_2]
+        grenouilles[p, arrivees[p], 1] = encode_grenouilles(actifs[p], False, 2)
+        reserves[p, actifs[p]] -= 1
+        # Servante créée à côté de la reine, à la suite des grenouilles de
+        # sa dalle (cf plateau.trouve_reine())
+        s = e[~priorite_2 & (reserves_e > 0)]
+        reines = (grenouilles[s] & etat.MASQUE_SANS_PRIORITE) == \
+                 encode_grenouilles(actifs[s], True, 0)[:, None, None]
+        trouvees = reines.any((1, 2))
+        s = s[trouvees]
+        dalles_reines = np.argmax(reines[trouvees].any(2), 1)
+        nombres = (grenouilles[s, dalles_reines] != 0).sum(1)
+        if (nombres == etat.NOMBRE_GRENOUILLES_MAX).any():
+            raise ValueError("simultane: trop de grenouilles sur la dalle de la reine")
+        grenouilles[s, dalles_reines, nombres] = encode_grenouilles(actifs[s], False, 2)
+        reserves[s, actifs[s]] -= 1
+        parties[ELIMINATIONS][indices[e], faces[e]] += 1
+        suivants[e] = renvoie_suivants(joueurs_parties[e], actifs_e)
+    # Application de la règle de la carte de la dalle d'arrivée
+    r = np.nonzero(~eliminations)[0]
+    dalles[indices[r], arrivees[r], etat.FACE_VISIBLE] = 1
+    # Les grenouilles d'une dalle autre qu'un rondin retournent dans la réserve
+    v = r[faces[r] != carte.RONDIN]
+    for position in range(etat.NOMBRE_GRENOUILLES_MAX):
+        presentes = v[grenouilles[v, arrivees[v], position] != 0]
+        proprietaires = (grenouilles[presentes, arrivees[presentes], position] & etat.MASQUE_PROPRIETAIRE) - 1
+        np.add.at(reserves, (presentes, proprietaires), 1)
+    grenouilles[v, arrivees[v]] = 0
+    faces_r = faces[r]
+    # Nénuphar: le joueur actif rejoue et ne peut pas revenir sur ses pas
+    c = r[faces_r == carte.NENUPHAR]
+    dalles[indices[c], departs[c], etat.DERNIER_OCCUPANT] = actifs[c]
+    grenouilles[c, arrivees[c], 0] = encode_grenouilles(actifs[c], choix_reine[c], 2)
+    # Roseaux
+    c = r[faces_r == carte.ROSEAUX]
+    grenouilles[c, arrivees[c], 0] = encode_grenouilles(actifs[c], choix_reine[c], 1)
+    suivants[c] = renvoie_suivants(joueurs_parties[c], actifs[c])
+    # Moustique: le joueur peut rejouer une autre grenouille disponible
+    c = r[faces_r == carte.MOUSTIQUE]
+    grenouilles[c, arrivees[c], 0] = encode_grenouilles(actifs[c], choix_reine[c], 1)
+    disponibles = ((grenouilles[c] & etat.MASQUE_PROPRIETAIRE) == (actifs[c] + 1)[:, None, None]) & ((grenouilles[c] >> etat.DECALAGE_PRIORITE) > 0)
+    rejoue = (disponibles.sum((1, 2)) > 1) & choix[c]
+    grenouilles[c[rejoue], arrivees[c[rejoue]], 0] = encode_grenouilles(actifs[c[rejoue]], choix_reine[c[rejoue]], 0)
+    suivants[c[~rejoue]] = renvoie_suivants(joueurs_parties[c[~rejoue]], actifs[c[~rejoue]])
+    # Mâles: une reine se reproduit si le joueur possède le jeton de la couleur
+    c = r[(faces_r >= carte.MALE_BLEU) & (faces_r <= carte.MALE_VIOLET)]
+    bits = 1 << (faces[c] - carte.MALE_BLEU)
+    jetons = joueurs_parties[c, actifs[c], etat.JETONS]
+    reproduction = choix_reine[c] & (reserves[c, actifs[c]] > 0) & ((jetons & bits) != 0)
+    grenouilles[c, arrivees[c], 0] = encode_grenouilles(actifs[c], choix_reine[c], np.where(reproduction, 2, 1))
+    p = c[reproduction]
+    grenouilles[p, arrivees[p], 1] = encode_grenouilles(actifs[p], False, 2)
+    joueurs_parties[p, actifs[p], etat.JETONS] = jetons[reproduction] & ~bits[reproduction]
+    reserves[p, actifs[p]] -= 1
+    suivants[c] = renvoie_suivants(joueurs_parties[c], actifs[c])
+    # Vase: la grenouille est endormie
+    c = r[faces_r == carte.VASE]
+    grenouilles[c, arrivees[c], 0] = encode_grenouilles(actifs[c], choix_reine[c], 0)
+    suivants[c] = renvoie_suivants(joueurs_parties[c], actifs[c])
+    # Brochet: une reine fait sortir son joueur du jeu, une servante disparaît
+    c = r[faces_r == carte.BROCHET]
+    suivants[c] = renvoie_suivants(joueurs_parties[c], actifs[c])
+    p = c[choix_reine[c]]
+    grenouilles[p, arrivees[p], 0] = encode_grenouilles(actifs[p], True, 1)
+    grenouilles[p] = retire_joueurs(grenouilles[p], actifs[p])
+    joueurs_parties[p, actifs[p]] = 0
+    parties[ELIMINATIONS][indices[p], carte.BROCHET] += 1
+    # Rondin: une reine chasse les grenouilles présentes, une servante en
+    # chasse une s'il y en a déjà deux
+    c = r[faces_r == carte.RONDIN]
+    p = c[choix_reine[c]]
+    grenouilles[p, arrivees[p], 0] = encode_grenouilles(actifs[p], True, 1)
+    grenouilles[p, arrivees[p], 1:] = 0
+    s = c[~choix_reine[c]]
+    presentes = grenouilles[s, arrivees[s]]
+    if (presentes[:, -1] != 0).any():
+        raise ValueError("simultane: trop de grenouilles sur le rondin")
+    gauche, droite = presentes[:, 0], presentes[:, 1]
+    codes_actifs = actifs[s] + 1
+    garde_droite = (droite != 0) & ((gauche & etat.MASQUE_PROPRIETAIRE) != (droite & etat.MASQUE_PROPRIETAIRE)) & ((gauche & etat.MASQUE_PROPRIETAIRE) != codes_actifs) & \
+                   (((droite & etat.MASQUE_PROPRIETAIRE) == codes_actifs) | choix[s])
+    conservee = np.where(garde_droite, droite, gauche)
+    nouvelle = encode_grenouilles(actifs[s], False, 1)
+    grenouilles[s, arrivees[s], 0] = np.where(conservee != 0, conservee, nouvelle)
+    grenouilles[s, arrivees[s], 1] = np.where(conservee != 0, nouvelle, 0)
+    suivants[c] = renvoie_suivants(joueurs_parties[c], actifs[c])
+    # Priorités maximales des joueurs en jeu, sauf après une élimination par
+    # capture de reine (cf regles.applique())
+    a = np.nonzero(priorites_a_actualiser)[0]
+    identifiants = np.arange(NOMBRE_JOUEURS_MAX)[None, :, None, None]
+    a_joueur = (grenouilles[a][:, None] & etat.MASQUE_PROPRIETAIRE) == identifiants + 1
+    priorites = np.where(a_joueur, grenouilles[a][:, None] >> etat.DECALAGE_PRIORITE, 0).max((2, 3))
+    en_jeu = joueurs_parties[a, :, etat.EN_JEU] != 0
+    joueurs_parties[a, :, etat.PRIORITE_MAXIMALE] = np.where(en_jeu, priorites, 0)
+    # Recopie dans les états
+    dalles[indices, :, etat.GRENOUILLE_1:etat.GRENOUILLE_3 + 1] = grenouilles
+    joueurs[indices] = joueurs_parties
+    parties[ACTIFS][indices] = suivants
+
+def joue(parties, generateur):
+    """
+       Fait avancer toutes les parties jusqu'à leur fin.
+       Entrées:
+         * parties: liste
+           Les parties simultanées (cf cree())
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire des coups et des choix
+       Sorties:
+         * nombre_pas: entier
+           Le nombre de pas effectués
+    """
+    nombre_pas = 0
+    while not parties[TERMINEES].all():
+        joue_pas(parties, generateur)
+        nombre_pas += 1
+    return(nombre_pas)
+
+def renvoie_bilan(parties, nombre_joueurs, duree):
+    """
+       Renvoie le bilan de parties simultanées terminées.
+       Entrées:
+         * parties: liste
+           Les parties simultanées (cf cree())
+         * nombre_joueurs: entier
+           Le nombre de joueurs des parties
+         * duree: flottant
+           La durée de la simulation en secondes
+       Sorties:
+         * bilan: liste
+           Le bilan des parties, au format de simule.cree_bilan()
+    """
+    bilan = simule.cree_bilan(nombre_joueurs)
+    bilan[simule.PARTIES] = len(parties[ETATS])
+    bilan[simule.COUPS] = int(parties[COUPS].sum())
+    bilan[simule.PASSES] = int(parties[PASSES].sum())
+    bilan[simule.DUREE] = duree
+    # Les parties sans vainqueur (-1) sont comptées en dernière position
+    bilan[simule.VICTOIRES] = np.bincount(parties[GAGNANTS] % (nombre_joueurs + 1),
+                                          minlength=nombre_joueurs + 1).tolist()
+    bilan[simule.ELIMINATIONS_CARTES] = parties[ELIMINATIONS].sum(0).tolist()
+    return(bilan)
+
+if __name__ == "__main__":
+    arguments = [int(a) for a in sys.argv[1:]]
+    # Valeurs par défaut: 10000 parties à 2 joueurs, graine 0
+    arguments = arguments + [10000, 2, 0][len(arguments):]
+    parties = cree(arguments[0], arguments[1], arguments[2])
+    debut = time.perf_counter()
+    joue(parties, np.random.RandomState(arguments[2]))
+    simule.affiche_bilan(renvoie_bilan(parties, arguments[1], time.perf_counter() - debut))
@@ -0,0 +1,64 @@
+"""
+    Ce fichier regroupe les structures et les services associés aux
+    stratégies: une stratégie choisit le coup joué par un joueur parmi ses
+    coups autorisés (cf coups.renvoie_coups()), sans interface graphique.
+    Une stratégie est une fonction de signature
+        strategie(plateau_croa, joueur_actif, liste_coups) -> coup
+    qui ne doit pas modifier le plateau.
+"""
+# Modules externes
+import numpy as np
+
+def cree_aleatoire(graine=None):
+    """
+       Crée une stratégie jouant un coup autorisé au hasard.
+       Entrées:
+         * graine: entier
+           La graine du générateur pseudo-aléatoire propre à la stratégie,
+           tirée au hasard si elle n'est pas fournie
+       Sorties:
+         * strategie: fonction
+           La stratégie
+    """
+    generateur = np.random.RandomState(graine)
+
+    def strategie_aleatoire(plateau_croa, joueur_actif, liste_coups):
+        return(liste_coups[generateur.randint(len(liste_coups))])
+
+    return(strategie_aleatoire)
+
+def cree_scriptee(liste_coups_joues):
+    """
+       Crée une stratégie rejouant une liste de coups fixée à l'avance.
+       Entrées:
+         * liste_coups_joues: liste
+           Les coups (cf coups.cree()) à jouer successivement
+       Sorties:
+         * strategie: fonction
+           La stratégie
+
+       Notes:
+         La liste des coups est consommée au fur et à mesure. Une erreur
+         ValueError est levée si le coup suivant n'est pas autorisé, une erreur
+         IndexError si la liste est vide.
+    """
+    def strategie_scriptee(plateau_croa, joueur_actif, liste_coups):
+        coup = liste_coups_joues.pop(0)
+        if coup not in liste_coups:
+            raise ValueError("strategie: coup non autorisé " + str(coup))
+        return(coup)
+
+    return(strategie_scriptee)
+
+def cree_premier_coup():
+    """
+       Crée une stratégie déterministe jouant toujours le premier coup
+       autorisé (cf coups.renvoie_coups() pour l'ordre des coups).
+       Sorties:
+         * strategie: fonction
+           La stratégie
+    """
+    def strategie_premier_coup(plateau_croa, joueur_actif, liste_coups):
+        return(liste_coups[0])
+
+    return(strategie_premier_coup)
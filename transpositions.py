@@ -0,0 +1,122 @@
+"""
+    Ce fichier regroupe les structures et les services associés à la table
+    de transpositions: une table de taille fixe mémorisant, pour les états du
+    jeu déjà évalués par une recherche, la profondeur de l'évaluation, sa
+    valeur et le meilleur coup trouvé. Les états sont repérés par leur
+    empreinte de Zobrist (cf plateau.renvoie_empreinte()).
+
+    La recherche ISMCTS y range les noeuds de son arbre (cf
+    ismcts.cree_recherche()): la mémoire qu'elle occupe reste bornée d'un coup
+    à l'autre.
+"""
+
+# Indices des champs d'une entrée de la table
+EMPREINTE  = 0
+PROFONDEUR = 1
+VALEUR     = 2
+COUP       = 3
+AGE        = 4
+
+def cree(taille_log2=16):
+    """
+       Crée une table de transpositions vide.
+       Entrées:
+         * taille_log2: entier
+           Le logarithme en base 2 du nombre d'entrées de la table
+       Sorties:
+         * table: liste
+           Une liste [entrees, age], entrees étant une liste de 2**taille_log2
+           éléments valant None (case vide) ou une entrée
+           [empreinte, profondeur, valeur, coup, age], et age le numéro de la
+           recherche en cours (cf nouvelle_recherche())
+
+       Notes:
+         La taille de la table est bornée: chaque empreinte n'a qu'une case
+         possible, celle d'indice empreinte modulo la taille de la table.
+    """
+    return([[None] * (1 << taille_log2), 0])
+
+def renvoie_case(table, empreinte):
+    """
+       Renvoie l'indice de la case associée à une empreinte
+       Entrées:
+         * table: liste
+           La table de transpositions
+         * empreinte: entier
+           L'empreinte de l'état du jeu
+       Sorties:
+         * indice: entier
+           L'indice de la case dans la liste des entrées
+    """
+    return(empreinte & (len(table[0]) - 1))
+
+def consulte(table, empreinte):
+    """
+       Recherche un état du jeu dans la table de transpositions
+       Entrées:
+         * table: liste
+           La table de transpositions
+         * empreinte: entier
+           L'empreinte de l'état du jeu
+       Sorties:
+         * entree: liste
+           L'entrée [empreinte, profondeur, valeur, coup, age] de l'état, ou
+           None si l'état n'est pas dans la table
+    """
+    entree = table[0][renvoie_case(table, empreinte)]
+    if entree is None or entree[EMPREINTE] != empreinte:
+        return(None)
+    return(entree)
+
+def enregistre(table, empreinte, profondeur, valeur, coup):
+    """
+       Enregistre l'évaluation d'un état du jeu dans la table de transpositions
+       Entrées:
+         * table: liste
+           La table de transpositions
+         * empreinte: entier
+           L'empreinte de l'état du jeu
+         * profondeur: entier
+           La profondeur de la recherche ayant produit l'évaluation
+         * valeur: nombre
+           La valeur de l'état
+         * coup: liste
+           Le meilleur coup trouvé (cf coups.cree()), ou None
+       Sorties:
+         * statut: booléen
+           Egal à True si l'entrée a été enregistrée
+
+       Notes:
+         Politique de remplacement: l'entrée occupant la case est remplacée si
+         elle concerne le même état, si elle provient d'une recherche
+         précédente ou si sa profondeur ne dépasse pas la nouvelle. Une
+         évaluation profonde de la recherche en cours est ainsi conservée.
+    """
+    entrees = table[0]
+    indice = renvoie_case(table, empreinte)
+    ancienne = entrees[indice]
+    if ancienne is not None and ancienne[EMPREINTE] != empreinte and \
+       ancienne[AGE] == table[1] and ancienne[PROFONDEUR] > profondeur:
+        return(False)
+    entrees[indice] = [empreinte, profondeur, valeur, coup, table[1]]
+    return(True)
+
+def nouvelle_recherche(table):
+    """
+       Signale le début d'une nouvelle recherche: les entrées déjà présentes
+       sont conservées mais deviennent remplaçables en priorité.
+       Entrées:
+         * table: liste
+           La table de transpositions
+    """
+    table[1] += 1
+
+def vide(table):
+    """
+       Vide la table de transpositions
+       Entrées:
+         * table: liste
+           La table de transpositions
+    """
+    table[0] = [None] * len(table[0])
+    table[1] = 0
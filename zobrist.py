@@ -0,0 +1,114 @@
+"""
+    Ce fichier regroupe les services associés aux empreintes de Zobrist des
+    états du jeu: chaque élément de l'état (carte, grenouille, dernier
+    occupant d'une dalle, réserve et jetons d'un joueur, joueur actif) est
+    associé à un entier aléatoire de 64 bits, et l'empreinte d'un état est le
+    ou exclusif des entiers de ses éléments. Deux états identiques ont la même
+    empreinte, deux états différents ont une empreinte différente sauf
+    collision, très improbable.
+"""
+# Modules externes
+import numpy as np
+
+# Modules internes
+import carte
+import dalle
+import grenouille
+import joueur
+
+# Dimensions des tables, définies par les modules des structures du jeu
+NOMBRE_DALLES = dalle.NOMBRE_DALLES
+NOMBRE_JOUEURS_MAX = joueur.NOMBRE_JOUEURS_MAX
+NOMBRE_FACES = carte.NOMBRE_FACES
+NOMBRE_DOS = carte.NOMBRE_DOS
+NOMBRE_PRIORITES = grenouille.NOMBRE_PRIORITES
+# Nombre de rangs d'une grenouille dans la liste des grenouilles d'une dalle
+NOMBRE_RANGS = dalle.NOMBRE_GRENOUILLES_MAX
+# Nombre maximal de grenouilles en réserve d'un joueur
+RESERVE_MAX = 16
+# Graine fixe: les empreintes sont identiques d'une exécution à l'autre
+GRAINE = 20191122
+
+def cree_table(generateur, *dimensions):
+    """
+       Crée une table d'entiers aléatoires de 64 bits
+       Entrées:
+         * generateur: RandomState
+           Le générateur pseudo-aléatoire à utiliser
+         * dimensions: entiers
+           Les dimensions de la table
+       Sorties:
+         * table: liste
+           Une liste (éventuellement imbriquée) d'entiers Python positifs de
+           64 bits
+    """
+    nombre = int(np.prod(dimensions))
+    valeurs = np.frombuffer(generateur.bytes(8 * nombre), dtype='<u8')
+    return(valeurs.reshape(dimensions).tolist())
+
+GENERATEUR = np.random.RandomState(GRAINE)
+# Tables des dalles, indexées par numéro de dalle
+FACES = cree_table(GENERATEUR, NOMBRE_DALLES, NOMBRE_FACES)
+DOS = cree_table(GENERATEUR, NOMBRE_DALLES, NOMBRE_DOS)
+FACES_VISIBLES = cree_table(GENERATEUR, NOMBRE_DALLES)
+DERNIERS_OCCUPANTS = cree_table(GENERATEUR, NOMBRE_DALLES, NOMBRE_JOUEURS_MAX)
+# GRENOUILLES[numero][rang][identifiant][statut][priorite]: grenouille de
+# rang 0 à NOMBRE_RANGS - 1 dans la liste des grenouilles de la dalle
+GRENOUILLES = cree_table(GENERATEUR, NOMBRE_DALLES, NOMBRE_RANGS, NOMBRE_JOUEURS_MAX, 2,
+                         NOMBRE_PRIORITES)
+# Tables des joueurs, indexées par identifiant de joueur
+EN_JEU = cree_table(GENERATEUR, NOMBRE_JOUEURS_MAX)
+RESERVES = cree_table(GENERATEUR, NOMBRE_JOUEURS_MAX, RESERVE_MAX)
+# JETONS[identifiant][masque], le bit k du masque valant 1 si le joueur
+# possède le jeton joueur.JETONS_MALES[k]
+JETONS = cree_table(GENERATEUR, NOMBRE_JOUEURS_MAX, 2 ** len(joueur.JETONS_MALES))
+PRIORITES_MAXIMALES = cree_table(GENERATEUR, NOMBRE_JOUEURS_MAX, NOMBRE_PRIORITES)
+JOUEURS_ACTIFS = cree_table(GENERATEUR, NOMBRE_JOUEURS_MAX)
+
+def renvoie_empreinte_dalle(numero_dalle, d):
+    """
+       Renvoie l'empreinte d'une dalle du plateau
+       Entrées:
+         * numero_dalle: entier
+           Le numéro de la dalle
+         * d: liste
+           La dalle (cf dalle.cree())
+       Sorties:
+         * empreinte: entier
+           Le ou exclusif des entiers associés à la carte, à sa visibilité, aux
+           grenouilles et au dernier occupant de la dalle
+    """
+    c = dalle.renvoie_carte(d)
+    empreinte = FACES[numero_dalle][carte.renvoie_face(c)] ^ DOS[numero_dalle][carte.renvoie_dos(c)]
+    if carte.renvoie_face_visible(c):
+        empreinte ^= FACES_VISIBLES[numero_dalle]
+    dernier_occupant = dalle.renvoie_dernier_occupant(d)
+    if dernier_occupant >= 0:
+        empreinte ^= DERNIERS_OCCUPANTS[numero_dalle][dernier_occupant]
+    rang = 0
+    for g in dalle.renvoie_liste_grenouilles(d):
+        empreinte ^= GRENOUILLES[numero_dalle][rang][grenouille.renvoie_identifiant(g)] \
+                                [int(grenouille.est_reine(g))][grenouille.renvoie_priorite(g)]
+        rang += 1
+    return(empreinte)
+
+def renvoie_empreinte_joueur(j):
+    """
+       Renvoie l'empreinte d'un joueur en jeu
+       Entrées:
+         * j: liste
+           Le joueur (cf joueur.cree())
+       Sorties:
+         * empreinte: entier
+           Le ou exclusif des entiers associés à la présence en jeu, à la
+           réserve, aux jetons et à la priorité maximale du joueur
+    """
+    identifiant = joueur.renvoie_identifiant(j)
+    masque = 0
+    for k in range(len(joueur.JETONS_MALES)):
+        if joueur.possede_jeton(j, joueur.JETONS_MALES[k]):
+            masque |= 1 << k
+    return(EN_JEU[identifiant] ^ \
+           RESERVES[identifiant][joueur.renvoie_nombre_grenouilles_reserve(j)] ^ \
+           JETONS[identifiant][masque] ^ \
+           PRIORITES_MAXIMALES[identifiant][joueur.renvoie_priorite_maximale(j)])